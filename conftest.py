@@ -12,7 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 
 from apps.user.utils.types import UserRole
 from core.db import create_all_tables, delete_all_tables
-from core.db.dependencies.session import get_engine
+from core.db.dependencies.session import dispose_engine, get_engine
 from core.db.utils import (
     create_database_if_not_exists,
     drop_database_if_exists,
@@ -25,6 +25,19 @@ def update_settings(database: str, settings):
     if getattr(settings, "_admin_uri", None) is None:
         settings._admin_uri = uri
     settings.postgres_db = database
+    # the ids restart with each test database: keep their cache entries apart
+    settings.cache_key_prefix = f"{database}:"
+    clear_local_caches()
+
+
+def clear_local_caches():
+    """Drop the in-process tier of the caches, filled by the previous tests."""
+    from apps.authentication.services.token_cache import token_cache, user_cache
+    from apps.authorization.services.permissions import permission_cache
+    from apps.chat.services.rooms import room_cache
+
+    for cache in (token_cache, user_cache, permission_cache, room_cache):
+        cache.clear_local()
 
 
 @pytest.fixture
@@ -94,8 +107,8 @@ async def db(db_name, settings):
     await create_all_tables(_engine)
     yield _engine
     await delete_all_tables(_engine)
+    await dispose_engine(_engine)
     await drop_database_if_exists(db_name, settings._admin_uri)
-    await _engine.dispose()
 
 
 @pytest.fixture
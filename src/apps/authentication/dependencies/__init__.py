@@ -1,5 +1,7 @@
 from .oauth2 import oauth2_scheme
+from .rate_limit import login_rate_limit
 
 __all__ = [
+    "login_rate_limit",
     "oauth2_scheme",
 ]
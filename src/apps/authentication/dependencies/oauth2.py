@@ -3,26 +3,24 @@ from http import HTTPStatus
 from fastapi import HTTPException, Request
 from fastapi.params import Depends
 from fastapi.security import OAuth2PasswordBearer
+from starlette.requests import HTTPConnection
 
 from apps.authentication.models import JWTToken
 from apps.user.models import User
+from core.auth.identity import get_identity
 from settings import settings
 
 
-async def current_session_user(request: Request):
-    session_data = request.session.get(settings.session_user_key, None)
-    if session_data is None:
-        return None
-
-    user = await User.get(username=session_data["username"])
-    return user
+async def current_session_user(request: HTTPConnection):
+    return await get_identity(request).session_user(request)
 
 
 def oauth2_scheme():
     async def wrapper(
+        request: Request,
         token: str | None = Depends(OAuth2PasswordBearer(tokenUrl=settings.AUTH_URL)),
     ) -> JWTToken:
-        stored_token = await JWTToken.get(access_token=token)
+        stored_token = await get_identity(request).token(token)
 
         if stored_token is None:
             raise HTTPException(
@@ -60,6 +58,6 @@ async def current_user(
     token_check_callback = oauth2_scheme()
     oauth2 = OAuth2PasswordBearer(tokenUrl=settings.AUTH_URL)
     token_str = await oauth2(request=request)
-    token: JWTToken = await token_check_callback(token_str)
+    token: JWTToken = await token_check_callback(request, token_str)
 
     return token.user
@@ -0,0 +1,53 @@
+from functools import lru_cache
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Request
+from fastapi.security import OAuth2PasswordRequestForm
+
+from core.auth.forms import SessionAuthRequestForm
+from core.monitoring.metrics import LOGIN_ATTEMPTS, LOGIN_RATE_LIMITED
+from core.security.ratelimit import RateLimit, SlidingWindowLimiter
+from settings import settings
+
+
+@lru_cache
+def get_login_limiter() -> SlidingWindowLimiter:
+    return SlidingWindowLimiter("login", settings.login_rate_limit_window)
+
+
+def login_rate_limit(
+    form_class: type[OAuth2PasswordRequestForm | SessionAuthRequestForm],
+):
+    """Reject the login attempts beyond the login rate limits (see settings).
+
+    Checked before the credentials, the form is parsed once for the route.
+    """
+
+    async def wrapper(request: Request, form_data: Annotated[form_class, Depends()]):
+        if not settings.login_rate_limit_enabled:
+            return
+
+        client_ip = request.client.host if request.client else ""
+        exceeded = await get_login_limiter().hit(
+            RateLimit("ip", client_ip, settings.login_rate_limit_per_ip),
+            RateLimit(
+                "username",
+                form_data.username.lower(),
+                settings.login_rate_limit_per_username,
+            ),
+            RateLimit("global", "", settings.login_rate_limit_global),
+        )
+        if exceeded is None:
+            LOGIN_ATTEMPTS.labels(outcome="allowed").inc()
+            return
+
+        LOGIN_ATTEMPTS.labels(outcome="limited").inc()
+        LOGIN_RATE_LIMITED.labels(scope=exceeded.scope).inc()
+        raise HTTPException(
+            status_code=HTTPStatus.TOO_MANY_REQUESTS,
+            detail="Too many login attempts, retry later.",
+            headers={"Retry-After": str(settings.login_rate_limit_window)},
+        )
+
+    return wrapper
@@ -1,7 +1,9 @@
 import datetime
 from typing import Self
 
-from sqlmodel import Field, Relationship
+from sqlalchemy import Index
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import Field, Relationship, col
 
 from apps.user.models import User
 from core.auth import utils as auth_utils
@@ -11,7 +13,19 @@ from settings import settings
 from ._base import JWTTokenModel
 
 
+def _utcnow() -> datetime.datetime:
+    # created_at is a naive UTC datetime
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
 class JWTToken(JWTTokenModel, table=True):
+    # a single token per user (issued by upsert), the tokens are looked up by value
+    __table_args__ = (
+        Index("ix_jwttoken_user_id", "user_id", unique=True),
+        Index("ix_jwttoken_access_token", "access_token"),
+    )
+    __upsert_conflict_target__ = ("user_id",)
+
     id: int = Field(default=None, primary_key=True, allow_mutation=False)
     user_id: int | None = Field(
         default=None, foreign_key="users.id", ondelete="SET NULL"
@@ -39,21 +53,61 @@ class JWTToken(JWTTokenModel, table=True):
         return (delta.seconds / 60) <= settings.TOKEN_REFRESH_DELAY_MINUTES
 
     @classmethod
-    async def _create(cls, user: User):
-        dt = auth_utils.get_token_expire_datetime()
-        return await cls(
-            access_token=cls._generate_jwt_token(user, dt), user=user
-        ).save()
+    async def get_or_create(cls, user: User) -> Self:
+        """The valid token of the user, or a new one replacing the expired one.
+
+        A single INSERT ... ON CONFLICT (user_id) DO UPDATE statement.
+        """
+        now = _utcnow()
+        data = {
+            "user_id": user.id,
+            "access_token": cls._generate_jwt_token(
+                user, auth_utils.get_token_expire_datetime()
+            ),
+            "token_type": "Bearer",
+            "created_at": now,
+        }
+        expired_at = now - datetime.timedelta(
+            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
+        )
+        (token,) = await cls.bulk_upsert(
+            [data], update_when=col(cls.created_at) < expired_at, returning=True
+        )
+        set_committed_value(token, "user", user)
+        return token
 
     @classmethod
-    async def get_or_create(cls, user: User) -> Self:
-        token = await cls.get(user_id=user.id)
-        if token is not None and not token.is_expired:
-            return token
+    async def purge_expired(cls, *, batch_size: int = 1000) -> int:
+        """Delete the tokens which can no longer be refreshed, by batches."""
+        expired_at = _utcnow() - datetime.timedelta(
+            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
+            + settings.TOKEN_REFRESH_DELAY_MINUTES
+        )
+        count = 0
+        while True:
+            ids = await cls.filter_delete(created_at__lt=expired_at, limit=batch_size)
+            count += len(ids)
+            if len(ids) < batch_size:
+                return count
+
+    async def save(self) -> Self:
+        from apps.authentication.services import invalidate_token
 
-        return await cls._create(user)
+        token = await super().save()
+        await invalidate_token(token.access_token)
+        return token
+
+    async def delete(self) -> None:
+        from apps.authentication.services import invalidate_token, revoke_token
+
+        await super().delete()
+        await invalidate_token(self.access_token)
+        await revoke_token(self.access_token)
 
     async def refresh(self):
+        from apps.authentication.services import invalidate_token, revoke_token
+
+        previous_token = self.access_token
         refresh_delta = datetime.datetime.now(
             datetime.timezone.utc
         ) + datetime.timedelta(seconds=1)
@@ -62,8 +116,12 @@ class JWTToken(JWTTokenModel, table=True):
             "access_token": JWTToken._generate_jwt_token(self.user, dt),
             "created_at": dt.replace(tzinfo=None),
         }
-        self.update_from_dict(data)
-        await self.save()
+        # a single UPDATE, the instance is not reloaded
+        await self.filter_update(data, id=self.id)
+        for key, value in data.items():
+            set_committed_value(self, key, value)
+        await invalidate_token(previous_token)
+        await revoke_token(previous_token)
 
     @classmethod
     def _generate_jwt_token(cls, user: User, exp: datetime.datetime):
@@ -1,9 +1,10 @@
+from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 
-from apps.authentication.dependencies import oauth2_scheme
+from apps.authentication.dependencies import login_rate_limit, oauth2_scheme
 from apps.authentication.models import JWTToken
 from apps.authentication.models.schema import JWTTokenRead
 from apps.authentication.utils import verify_user
@@ -12,7 +13,11 @@ from settings import settings
 routers = APIRouter(tags=["Authentication"], prefix=settings.AUTH_PREFIX_URL)
 
 
-@routers.post("/token/", name="jwt-auth")
+@routers.post(
+    "/token/",
+    name="jwt-auth",
+    dependencies=[Depends(login_rate_limit(OAuth2PasswordRequestForm))],
+)
 async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
 ) -> JWTTokenRead:
@@ -25,5 +30,14 @@ async def login(
     "/token/refresh/", name="jwt-auth-refresh", dependencies=[Depends(oauth2_scheme())]
 )
 async def refresh(token: JWTToken = Depends(oauth2_scheme())):
+    if token.id is None:
+        # verified without the tokens table (settings.jwt_stateless)
+        token = await JWTToken.get(access_token=token.access_token)
+        if token is None:
+            raise HTTPException(
+                status_code=HTTPStatus.UNAUTHORIZED,
+                detail="Invalid authentication token.",
+            )
+
     await token.refresh()
     return JWTTokenRead.model_validate(token)
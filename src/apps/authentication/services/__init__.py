@@ -0,0 +1,4 @@
+from .denylist import is_revoked, revoke_token
+from .token_cache import get_token, get_user, invalidate_token
+
+__all__ = ["get_token", "get_user", "invalidate_token", "is_revoked", "revoke_token"]
@@ -0,0 +1,63 @@
+import datetime
+import hashlib
+
+import jwt
+from redis.exceptions import RedisError
+
+from core.auth import utils as auth_utils
+from core.cache import TTLCache, get_redis, redis_key
+from core.monitoring.logger import get_logger
+from settings import settings
+
+logger = get_logger(__name__)
+
+# Revoked tokens seen by this worker, a revoked token is never valid again.
+_revoked = TTLCache(maxsize=settings.token_cache_size)
+
+
+def _key(access_token: str) -> str:
+    digest = hashlib.sha256(access_token.encode()).hexdigest()
+    return redis_key(f"auth:revoked:{digest}")
+
+
+async def revoke_token(access_token: str):
+    """Deny the (still signed and valid) token until it expires.
+
+    Used by the stateless verification (settings.jwt_stateless) which does not read
+    the tokens table. Entries expire with the tokens, the denylist stays small.
+    """
+    try:
+        payload = auth_utils.decode_jwt_token(access_token, verify_exp=False)
+    except jwt.InvalidTokenError:
+        return
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    ttl = int((payload.exp - now).total_seconds()) + 1
+    if ttl <= 0:
+        return
+
+    key = _key(access_token)
+    _revoked.set(key, True, ttl)
+    if (redis := get_redis()) is None:
+        return
+
+    try:
+        await redis.set(key, 1, ex=ttl)
+    except (RedisError, OSError) as e:
+        logger.warning("Token denylist: redis set failed: %s", e)
+
+
+async def is_revoked(access_token: str) -> bool | None:
+    """Whether the token is revoked, None when the denylist can not be checked."""
+    key = _key(access_token)
+    if _revoked.get(key):
+        return True
+
+    if (redis := get_redis()) is None:
+        return None
+
+    try:
+        return bool(await redis.exists(key))
+    except (RedisError, OSError) as e:
+        logger.warning("Token denylist: redis check failed: %s", e)
+        return None
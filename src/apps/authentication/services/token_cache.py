@@ -0,0 +1,192 @@
+import datetime
+import hashlib
+from typing import Any, TypeVar
+
+import jwt
+from pydantic import ValidationError
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import SQLModel
+
+from apps.authentication.models import JWTToken
+from apps.authentication.services.denylist import is_revoked
+from apps.authorization.models import Group, Permission
+from apps.user.models import User
+from core.auth import utils as auth_utils
+from core.cache import TieredCache
+from core.db.dependencies.session import current_session
+from settings import settings
+
+T = TypeVar("T", bound=SQLModel)
+
+# Valid tokens with the username of their user, keyed by token hash.
+token_cache = TieredCache(
+    "auth:token:v2",
+    maxsize=settings.token_cache_size,
+    local_ttl=settings.token_cache_local_ttl,
+    broadcast_deletions=True,
+)
+# Users (with permissions and groups, without password) of the tokens and of the
+# sessions, keyed by username (sub of the stateless tokens).
+user_cache = TieredCache(
+    "auth:user:v2",
+    maxsize=settings.token_cache_size,
+    local_ttl=settings.token_cache_local_ttl,
+    broadcast_deletions=True,
+)
+
+
+def token_key(access_token: str) -> str:
+    return hashlib.sha256(access_token.encode()).hexdigest()
+
+
+def dump_user(user: User) -> dict[str, Any]:
+    return {
+        # the password hash is never cached, the logins read the database row
+        "user": user.model_dump(mode="json", exclude={"password"}),
+        "permissions": [perm.model_dump(mode="json") for perm in user.permissions],
+        "groups": [
+            {
+                "group": group.model_dump(mode="json"),
+                "permissions": [
+                    perm.model_dump(mode="json") for perm in group.permissions
+                ],
+            }
+            for group in user.groups
+        ],
+    }
+
+
+def load_user(data: dict[str, Any]) -> User:
+    """Rebuild the cached user as if it was loaded (detached) from the database."""
+    groups = [
+        _detached(
+            Group,
+            item["group"],
+            permissions=[_detached(Permission, p) for p in item["permissions"]],
+        )
+        for item in data["groups"]
+    ]
+    user = _detached(
+        User,
+        {**data["user"], "password": ""},
+        permissions=[_detached(Permission, p) for p in data["permissions"]],
+        groups=groups,
+    )
+    # not loaded: never read from the cached user
+    del user.__dict__["password"]
+    return user
+
+
+def dump_token(token: JWTToken) -> dict[str, Any]:
+    """The token and the username of its user, resolved through the users cache
+    (invalidated when the user changes, see apps/authentication/signals.py).
+    """
+    return {"token": token.model_dump(mode="json"), "username": token.user.username}
+
+
+def _detached(model: type[T], data: dict[str, Any], **relationships) -> T:
+    instance = model.model_validate(data)
+    make_transient_to_detached(instance)
+    for name, value in relationships.items():
+        set_committed_value(instance, name, value)
+    return instance
+
+
+async def _attach(instance: T) -> T:
+    """Merge a cached instance into the unit of work session of the request, if any."""
+    if (session := current_session()) is not None:
+        return await session.merge(instance, load=False)
+    return instance
+
+
+def _ttl(expire_at: datetime.datetime) -> float:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return min(settings.token_cache_ttl, (expire_at - now).total_seconds())
+
+
+async def get_token(access_token: str) -> JWTToken | None:
+    """Same as `JWTToken.get(access_token=...)`, valid tokens are served from the cache.
+
+    A cached token is merged into the unit of work session of the request, if any,
+    like a token loaded by the query would be.
+    In stateless mode (settings.jwt_stateless), see `get_stateless_token`.
+    """
+    if settings.jwt_stateless:
+        try:
+            if (token := await get_stateless_token(access_token)) is not None:
+                return token
+        except (jwt.InvalidTokenError, ValidationError):
+            return None
+
+    if not settings.token_cache_enabled:
+        return await JWTToken.get(access_token=access_token)
+
+    key = token_key(access_token)
+    if (data := await token_cache.get(key)) is not None:
+        token = _detached(JWTToken, data["token"])
+        user = await get_user(data["username"], ttl=_token_ttl(token))
+        if user is not None and user.id == token.user_id:
+            set_committed_value(token, "user", user)
+            return await _attach(token)
+        # the user was renamed or deleted
+        await token_cache.delete(key)
+
+    token = await JWTToken.get(access_token=access_token)
+    if token is not None and token.user is not None and token.is_valid:
+        ttl = _token_ttl(token)
+        await token_cache.set(key, dump_token(token), ttl)
+        await user_cache.set(token.user.username, dump_user(token.user), ttl)
+    return token
+
+
+def _token_ttl(token: JWTToken) -> float:
+    return _ttl(auth_utils.get_token_expire_datetime(token.created_at))
+
+
+async def get_stateless_token(access_token: str) -> JWTToken | None:
+    """Verify the token signature and expiration without reading the tokens table.
+
+    The returned token is not persisted (no id), its user is resolved from the
+    token subject through the users cache. Raise jwt.InvalidTokenError for an invalid
+    or revoked token, return None when the denylist can not be checked: the tokens
+    table is used instead.
+    """
+    payload = auth_utils.decode_jwt_token(access_token, verify_exp=False)
+    revoked = await is_revoked(access_token)
+    if revoked is None:
+        return None
+    if revoked:
+        raise jwt.InvalidTokenError("Revoked token.")
+
+    user = await get_user(payload.sub, ttl=_ttl(payload.exp))
+    if user is None:
+        raise jwt.InvalidTokenError("Unknown token subject.")
+
+    created_at = payload.exp - datetime.timedelta(
+        minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
+    )
+    return JWTToken(
+        access_token=access_token,
+        user_id=user.id,
+        user=user,
+        created_at=created_at.astimezone(datetime.timezone.utc).replace(tzinfo=None),
+    )
+
+
+async def get_user(username: str, *, ttl: float) -> User | None:
+    """Same as `User.get(username=...)`, served from the users cache."""
+    if (data := await user_cache.get(username)) is not None:
+        return await _attach(load_user(data))
+
+    user = await User.get(username=username)
+    if user is not None:
+        await user_cache.set(username, dump_user(user), ttl)
+    return user
+
+
+async def invalidate_token(*access_tokens: str):
+    if not settings.token_cache_enabled:
+        return
+
+    await token_cache.delete(*[token_key(token) for token in access_tokens if token])
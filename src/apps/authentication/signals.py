@@ -0,0 +1,30 @@
+"""Invalidation of the users cache (users of the tokens and of the sessions), and of
+the sessions of the deleted users. The cached tokens only hold the username of their
+user: a deleted, deactivated or demoted user is not authenticated by them anymore.
+The entries are deleted once the changes are committed (see signal_manager.on_commit).
+"""
+
+from sqlalchemy import inspect
+from sqlalchemy.engine.base import Connection
+
+from apps.authentication.services.token_cache import user_cache
+from apps.user.models import User
+from core.auth.sessions import revoke_user_sessions_soon
+from core.db.signals.managers import signal_manager
+from settings import settings
+
+
+def user_changed(mapper, connection: Connection, target: User):
+    usernames = [target.username, *inspect(target).attrs.username.history.deleted]
+    signal_manager.on_commit(connection, lambda: user_cache.delete_soon(*usernames))
+
+
+def user_deleted(mapper, connection: Connection, target: User):
+    user_changed(mapper, connection, target)
+    if settings.session_backend == "redis":
+        user_id = target.id
+        signal_manager.on_commit(connection, lambda: revoke_user_sessions_soon(user_id))
+
+
+signal_manager.after_update(User)(user_changed)
+signal_manager.after_delete(User)(user_deleted)
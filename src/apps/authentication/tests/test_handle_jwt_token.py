@@ -44,3 +44,39 @@ class TestHandleJWTToken(AsyncTestCase):
 
         assert token.is_valid is False
         assert token.can_be_refreshed is False
+
+    async def test_valid_token_reused(self):
+        token = await JWTToken.get_or_create(self.user)
+        same_token = await JWTToken.get_or_create(self.user)
+
+        assert same_token.id == token.id
+        assert same_token.access_token == token.access_token
+        assert same_token.user.username == self.user.username
+
+    async def test_expired_token_replaced(self, settings):
+        token = await JWTToken.get_or_create(self.user)
+        token.created_at = token.created_at - datetime.timedelta(
+            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES + 1
+        )
+        await token.save()
+
+        new_token = await JWTToken.get_or_create(self.user)
+        assert new_token.id == token.id
+        assert new_token.access_token != token.access_token
+        assert new_token.is_valid
+        assert await JWTToken.count(user_id=self.user.id) == 1
+
+    async def test_purge_expired_tokens(self, settings):
+        other_user = await User.get(username="active")
+        token = await JWTToken.get_or_create(self.user)
+        expired_token = await JWTToken.get_or_create(other_user)
+        expired_token.created_at = expired_token.created_at - datetime.timedelta(
+            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
+            + settings.TOKEN_REFRESH_DELAY_MINUTES
+            + 1
+        )
+        await expired_token.save()
+
+        assert await JWTToken.purge_expired(batch_size=1) == 1
+        assert await JWTToken.get(id=expired_token.id) is None
+        assert await JWTToken.get(id=token.id) is not None
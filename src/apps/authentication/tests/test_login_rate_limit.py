@@ -0,0 +1,57 @@
+import uuid
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+from prometheus_client import REGISTRY
+
+from apps.user.models import User
+from core.unittest.async_case import AsyncTestCase
+
+
+class TestLoginRateLimit(AsyncTestCase):
+    fixtures = ["users"]
+
+    @pytest.fixture(autouse=True)
+    def enable_rate_limit(self, settings):
+        if not settings.cache_url and not settings.celery_broker:
+            pytest.skip("redis is not configured")
+
+        with (
+            patch.object(settings, "login_rate_limit_enabled", True),
+            patch.object(settings, "login_rate_limit_per_ip", 1000),
+            patch.object(settings, "login_rate_limit_per_username", 2),
+            patch.object(settings, "login_rate_limit_global", 1000),
+        ):
+            yield
+
+    async def test_username_limit(self, app):
+        # counters live in redis across the test runs: a new username each time
+        data = {"username": f"unknown-{uuid.uuid4().hex}", "password": "password"}
+        limited = REGISTRY.get_sample_value(
+            "auth_login_rate_limited_total", {"scope": "username"}
+        )
+
+        for _ in range(2):
+            response = await self.client.post(app.url_path_for("jwt-auth"), data=data)
+            assert response.status_code == HTTPStatus.NOT_FOUND
+
+        with patch.object(User, "get", side_effect=AssertionError("db lookup")):
+            response = await self.client.post(app.url_path_for("jwt-auth"), data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+        assert "Retry-After" in response.headers
+        assert (
+            REGISTRY.get_sample_value(
+                "auth_login_rate_limited_total", {"scope": "username"}
+            )
+            == (limited or 0) + 1
+        )
+
+    async def test_other_usernames_not_limited(self, app):
+        data = {"username": f"unknown-{uuid.uuid4().hex}", "password": "password"}
+        for _ in range(3):
+            await self.client.post(app.url_path_for("jwt-auth"), data=data)
+
+        data["username"] = f"unknown-{uuid.uuid4().hex}"
+        response = await self.client.post(app.url_path_for("jwt-auth"), data=data)
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,161 @@
+import asyncio
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+
+from apps.authentication.models import JWTToken
+from apps.authentication.services import get_token, is_revoked
+from apps.authentication.services.token_cache import (
+    token_cache,
+    token_key,
+    user_cache,
+)
+from apps.authorization.models import Permission
+from apps.user.models import User
+from apps.user.utils.types import UserRole
+from core.cache import TieredCache, stop_listeners, tiered
+from core.unittest.async_case import AsyncTestCase
+
+
+async def invalidated():
+    """Wait for the redis invalidations scheduled by the signals."""
+    await asyncio.gather(*tiered._deletions)
+
+
+class TestTokenCache(AsyncTestCase):
+    fixtures = ["users"]
+
+    @pytest.fixture(autouse=True)
+    def enable_token_cache(self, settings):
+        token_cache.clear_local()
+        user_cache.clear_local()
+        with patch.object(settings, "token_cache_enabled", True):
+            yield
+        token_cache.clear_local()
+        user_cache.clear_local()
+
+    async def async_set_up(self):
+        await super().async_set_up()
+        self.user = await User.get(username="test")
+        permission = await Permission(
+            name="token_cache_read",
+            target_table=User.table_name(),
+            display_name="Read",
+        ).save()
+        await self.user.add_permission(permission)
+        self.token = await JWTToken.get_or_create(self.user)
+
+    async def test_warm_path_without_database(self):
+        assert (await get_token(self.token.access_token)).id == self.token.id
+
+        with patch.object(JWTToken, "get", side_effect=AssertionError("db lookup")):
+            token = await get_token(self.token.access_token)
+
+        assert token.id == self.token.id
+        assert token.user.username == self.user.username
+        assert "token_cache_read" in {perm.name for perm in token.user.permissions}
+
+    async def test_shared_tier(self):
+        await get_token(self.token.access_token)
+        # another worker: empty in-process tier
+        token_cache.clear_local()
+        with patch.object(JWTToken, "get", side_effect=AssertionError("db lookup")):
+            assert (await get_token(self.token.access_token)).id == self.token.id
+
+    async def test_invalidation(self):
+        await get_token(self.token.access_token)
+        previous_token = self.token.access_token
+        await self.token.refresh()
+        assert await get_token(previous_token) is None
+        assert (await get_token(self.token.access_token)).id == self.token.id
+
+        await self.token.delete()
+        assert await get_token(self.token.access_token) is None
+
+    async def test_invalidation_reaches_other_workers(self):
+        key = token_key(self.token.access_token)
+        other_worker_cache = TieredCache(
+            token_cache.namespace, local_ttl=30, broadcast_deletions=True
+        )
+        await other_worker_cache.get(key)
+        # the other worker subscribes in the background
+        await asyncio.sleep(0.5)
+        await get_token(self.token.access_token)
+        assert await other_worker_cache.get(key) is not None
+        assert other_worker_cache.local.get(key) is not None
+
+        await self.token.delete()
+        await invalidated()
+        for _ in range(50):
+            if other_worker_cache.local.get(key) is None:
+                break
+            await asyncio.sleep(0.01)
+        assert other_worker_cache.local.get(key) is None
+        await stop_listeners()
+
+    async def test_password_is_not_cached(self):
+        await get_token(self.token.access_token)
+        assert "password" not in (await user_cache.get(self.user.username))["user"]
+
+        token = await get_token(self.token.access_token)
+        assert token.user.id == self.user.id
+        assert "password" not in token.user.model_dump()
+
+    async def test_user_changes(self):
+        await get_token(self.token.access_token)
+
+        self.user.role = UserRole.admin
+        await self.user.save()
+        await invalidated()
+        assert (await get_token(self.token.access_token)).user.is_admin
+
+        await self.user.delete()
+        await invalidated()
+        assert await get_token(self.token.access_token) is None
+
+    async def test_invalid_tokens_are_not_cached(self):
+        assert await get_token("unknown") is None
+        assert await token_cache.get(token_key("unknown")) is None
+
+
+class TestStatelessToken(AsyncTestCase):
+    fixtures = ["users"]
+
+    @pytest.fixture(autouse=True)
+    def enable_stateless_mode(self, settings):
+        user_cache.clear_local()
+        with patch.object(settings, "jwt_stateless", True):
+            yield
+        user_cache.clear_local()
+
+    async def async_set_up(self):
+        await super().async_set_up()
+        self.user = await User.get(username="test")
+        self.token = await JWTToken.get_or_create(self.user)
+
+    async def test_verified_without_tokens_table(self):
+        with patch.object(JWTToken, "get", side_effect=AssertionError("db lookup")):
+            token = await get_token(self.token.access_token)
+
+        assert token.id is None
+        assert token.is_valid
+        assert token.user.id == self.user.id
+
+    async def test_invalid_and_revoked_tokens(self):
+        assert await get_token("not.a.token") is None
+
+        previous_token = self.token.access_token
+        await self.token.refresh()
+        assert await is_revoked(previous_token)
+        assert await get_token(previous_token) is None
+        assert (await get_token(self.token.access_token)).user.id == self.user.id
+
+        await self.token.delete()
+        assert await get_token(self.token.access_token) is None
+
+    async def test_refresh_endpoint(self, app):
+        await self.client.user_login(self.user)
+        response = await self.client.post(app.url_path_for("jwt-auth-refresh"))
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["access_token"] != self.token.access_token
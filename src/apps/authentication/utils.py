@@ -16,8 +16,13 @@ async def verify_user(
         detail = "Authentication error: user not found."
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail=detail)
 
-    valid_password = user.check_password(form_data.password)
+    valid_password = await user.acheck_password(form_data.password)
     if not valid_password:
         detail = "Authentication error: credentials are invalid."
         raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=detail)
+
+    if user.password_needs_rehash:
+        # upgrade to the current hasher (or cost), the plain password is known here
+        await user.aset_password(form_data.password)
+        await user.save()
     return user
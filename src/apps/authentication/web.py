@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, Request, status
 from starlette.responses import RedirectResponse
 
 from apps.authentication.dependencies.oauth2 import current_user
+from apps.authentication.dependencies.rate_limit import login_rate_limit
 from apps.authentication.models import JWTToken
 from apps.authentication.utils import verify_user
 from apps.user.dependencies.access import AnonymousUserAccess
@@ -34,6 +35,7 @@ async def session_login_view(request: Request) -> RedirectResponse:
     dependencies=[
         Depends(csrf_required),
         Depends(AnonymousUserAccess()),
+        Depends(login_rate_limit(SessionAuthRequestForm)),
     ],
 )
 async def session_login(
@@ -82,7 +84,8 @@ async def session_register(
     request: Request, user_data: Annotated[SessionRegisterRequestForm, Depends()]
 ):
     valid_user_data = UserCreate.model_validate(user_data.to_dict())
-    user = await User(**valid_user_data.model_dump()).save()
+    data = await User.with_hashed_password(valid_user_data.model_dump())
+    user = await User(**data).save()
     auth_utils.session_save_user(request, user)
     return RedirectResponse(
         settings.session_auth_redirect_success, status.HTTP_302_FOUND
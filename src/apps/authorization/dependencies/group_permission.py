@@ -5,7 +5,7 @@ from typing import Any, Callable
 from fastapi import HTTPException
 
 from apps.authentication.models import JWTToken
-from apps.authorization.models import Group, Permission
+from apps.authorization.services import get_effective_permissions
 from core.monitoring.logger import get_logger
 
 Fn = Callable[..., Any]
@@ -28,15 +28,9 @@ def group_permission_required(
         if user.is_admin:
             return user
 
-        group_list = await Group.filter(name__in=groups)
+        effective = await get_effective_permissions(user.id)
+        group_list = effective.belonging_groups(groups, any_match=any_match)
         if not group_list:
-            log.debug(f"Permission denied: groups not found: {group_list}.")
-            raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail=detail)
-
-        user_belongs_groups, group_list = user.belongs_to_groups(
-            group_list, any_match=any_match
-        )
-        if not user_belongs_groups:
             log.debug(
                 f"Permission denied: user({user.username}) does not belong to groups: {groups}"
             )
@@ -46,14 +40,12 @@ def group_permission_required(
         if not permissions:
             return user
 
-        permission_list = await Permission.filter(name__in=permissions)
-        at_least_one_group_has_permission = any(
-            grp.has_permissions(permission_list, any_match=any_match)
-            for grp in group_list
+        at_least_one_group_has_permission = effective.group_has_permissions(
+            group_list, permissions, any_match=any_match
         )
         if not at_least_one_group_has_permission:
             any_all = {"Any" if any_match else "All"}
-            msg = f"{any_all} of Permission(s)({permission_list}) denied on groups: {group_list}"
+            msg = f"{any_all} of Permission(s)({permissions}) denied on groups: {group_list}"
             log.debug(msg)
             raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail=detail)
 
@@ -5,7 +5,7 @@ from typing import Any, Callable
 from fastapi import HTTPException
 
 from apps.authentication.models import JWTToken
-from apps.authorization.models import Permission
+from apps.authorization.services import get_effective_permissions
 from core.monitoring.logger import get_logger
 
 Fn = Callable[..., Any]
@@ -27,14 +27,9 @@ def user_permission_required(
             return token.user
 
         detail = "You do not have sufficient rights to this resource."
-        permission_list = await Permission.filter(name__in=permissions)
-
-        if not permission_list:
-            log.debug(f"Permission denied: permissions not found: {permissions}.")
-            raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail=detail)
-
-        user_has_permission = token.user.has_permissions(
-            permission_list, any_match=any_match
+        effective = await get_effective_permissions(token.user.id)
+        user_has_permission = effective.has_permissions(
+            permissions, any_match=any_match
         )
 
         if not user_has_permission:
@@ -4,6 +4,8 @@ from core.db import SQLTable
 
 
 class PermissionBase(SQLTable):
+    __upsert_conflict_target__ = ("name",)
+
     name: str = Field(unique=True)
     target_table: str = Field(index=True)
     display_name: str | None = Field(default=None)
@@ -11,6 +13,8 @@ class PermissionBase(SQLTable):
 
 
 class GroupBase(SQLTable):
+    __upsert_conflict_target__ = ("name",)
+
     name: str = Field(unique=True)
     target_table: str = Field(index=True)
     display_name: str | None = Field(default=None)
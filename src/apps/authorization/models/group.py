@@ -17,11 +17,11 @@ class Group(CRUDModelMixin, BaseTable, PermissionMixin, GroupBase, table=True):
     __tablename__ = "permission_group"
 
     permissions: list[Permission] = Relationship(
-        sa_relationship_kwargs={"lazy": "joined"}, link_model=PermissionGroupLink
+        sa_relationship_kwargs={"lazy": "selectin"}, link_model=PermissionGroupLink
     )
     users: list["User"] = Relationship(
         back_populates="groups",
-        sa_relationship_kwargs={"lazy": "joined"},
+        sa_relationship_kwargs={"lazy": "selectin"},
         link_model=GroupUserLink,
     )
 
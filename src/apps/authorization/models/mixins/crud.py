@@ -46,7 +46,7 @@ class CRUDModelMixin:
     def _crud_items_sql(cls, data_list: list[dict[str, Any]]) -> str:
         sql = ""
         for i, data in enumerate(data_list):
-            cols = f'{", ".join(data.keys())}'
+            cols = f"{', '.join(data.keys())}"
             vals = tuple(data.values())
             if i > 0:
                 sql += f""",\n {vals}"""
@@ -63,5 +63,4 @@ class CRUDModelMixin:
             return
 
         data_list = cls.get_crud_data_list(table)
-        model_list = [cls(**kw) for kw in data_list]
-        return await cls.bulk_create_or_update(model_list)
+        return await cls.bulk_upsert(data_list)
@@ -7,6 +7,8 @@ from apps.authorization.models.schema.group import GroupCreate, GroupUpdate
 from apps.authorization.models.schema.permission import PermissionList
 from apps.user.dependencies.roles import AdminAccess
 from apps.user.models.schema.create import UserList
+from core.db.dependencies import KeysetParamsDep
+from core.db.query.pagination import KeysetPage
 
 routers = APIRouter()
 
@@ -37,6 +39,27 @@ async def get_groups(
     )
 
 
+@routers.get(
+    "/cursor/",
+    name="group-list-cursor",
+    description="Get groups page by page (keyset pagination)",
+    dependencies=[Depends(AdminAccess())],
+)
+async def get_groups_page(
+    pagination: KeysetParamsDep,
+    name: str | None = None,
+    target_table: str | None = None,
+) -> KeysetPage[Group]:
+    filters = {}
+    if name is not None:
+        filters["name__startswith"] = name
+
+    if target_table is not None:
+        filters["target_table"] = target_table
+
+    return await pagination.paginate(Group, **filters)
+
+
 @routers.post(
     "/",
     name="group-create",
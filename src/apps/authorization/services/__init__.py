@@ -0,0 +1,11 @@
+from .permissions import (
+    EffectivePermissions,
+    get_effective_permissions,
+    schedule_invalidation,
+)
+
+__all__ = [
+    "EffectivePermissions",
+    "get_effective_permissions",
+    "schedule_invalidation",
+]
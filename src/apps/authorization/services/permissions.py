@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from apps.authorization.models import (
+    GroupUserLink,
+    PermissionGroupLink,
+    PermissionUserLink,
+)
+from core.cache import TieredCache
+from settings import settings
+
+# Effective permissions of the users, keyed by user id.
+permission_cache = TieredCache(
+    "auth:permissions",
+    maxsize=settings.permission_cache_size,
+    local_ttl=settings.permission_cache_local_ttl,
+    broadcast_deletions=True,
+)
+
+
+def _match(granted: frozenset[str], required: frozenset[str], any_match: bool) -> bool:
+    if not required:
+        return False
+    if any_match:
+        return not granted.isdisjoint(required)
+    return required <= granted
+
+
+@dataclass(frozen=True, slots=True)
+class EffectivePermissions:
+    """Permission names of a user, given directly or through its groups.
+
+    - permissions: direct and group permissions, flattened.
+    - groups: permissions of each group of the user.
+    """
+
+    permissions: frozenset[str]
+    groups: dict[str, frozenset[str]]
+
+    def has_permissions(self, permissions: Iterable[str], *, any_match=False) -> bool:
+        return _match(self.permissions, frozenset(permissions), any_match)
+
+    def belonging_groups(
+        self, groups: Iterable[str], *, any_match=False
+    ) -> frozenset[str]:
+        """Groups of the user among the given ones, empty if it does not belong to them."""
+        required = frozenset(groups)
+        if not _match(frozenset(self.groups), required, any_match):
+            return frozenset()
+        return required & self.groups.keys()
+
+    def group_has_permissions(
+        self, groups: Iterable[str], permissions: Iterable[str], *, any_match=False
+    ) -> bool:
+        """Whether at least one of the groups (of the user) has the permissions."""
+        required = frozenset(permissions)
+        return any(
+            _match(self.groups.get(group, frozenset()), required, any_match)
+            for group in groups
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "permissions": sorted(self.permissions),
+            "groups": {name: sorted(perms) for name, perms in self.groups.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "EffectivePermissions":
+        return cls(
+            permissions=frozenset(data["permissions"]),
+            groups={name: frozenset(perms) for name, perms in data["groups"].items()},
+        )
+
+
+async def load_effective_permissions(user_id: int) -> EffectivePermissions:
+    """Read the effective permissions of the user from the link tables."""
+    user_filters = {"user_id": user_id}
+    direct = await PermissionUserLink.values("permission_name", filters=user_filters)
+    group_names = await GroupUserLink.values("group_name", filters=user_filters)
+
+    groups: dict[str, set[str]] = {name: set() for (name,) in group_names}
+    if groups:
+        rows = await PermissionGroupLink.values(
+            "group_name",
+            "permission_name",
+            filters={"group_name__in": list(groups)},
+        )
+        for group_name, permission_name in rows:
+            groups[group_name].add(permission_name)
+
+    permissions = {name for (name,) in direct}
+    permissions.update(*groups.values())
+    return EffectivePermissions(
+        permissions=frozenset(permissions),
+        groups={name: frozenset(perms) for name, perms in groups.items()},
+    )
+
+
+async def get_effective_permissions(user_id: int) -> EffectivePermissions:
+    """Effective permissions of the user, served from the cache.
+
+    Entries are deleted by the signals of the authorization app when the links of
+    the user (or of its groups) change, see apps/authorization/signals.py.
+    """
+    if not settings.permission_cache_enabled:
+        return await load_effective_permissions(user_id)
+
+    key = str(user_id)
+    if (data := await permission_cache.get(key)) is not None:
+        return EffectivePermissions.from_dict(data)
+
+    effective = await load_effective_permissions(user_id)
+    await permission_cache.set(key, effective.to_dict(), settings.permission_cache_ttl)
+    return effective
+
+
+def schedule_invalidation(user_ids: Iterable[int]):
+    """Invalidate the permissions of the users from a (sync) database event."""
+    keys = [str(user_id) for user_id in set(user_ids) if user_id is not None]
+    if keys:
+        permission_cache.delete_soon(*keys)
@@ -0,0 +1,96 @@
+"""Invalidation of the effective permissions cache (see services/permissions.py).
+
+Links are usually changed through the relationships (user.permissions, group.users,
+...): SQLAlchemy writes the link tables directly and only emits the update event of
+the owner, so both the link models and their owners are listened to.
+The entries are deleted once the changes are committed: deleted at flush time, they
+could be cached again from the previous rows by a concurrent request.
+"""
+
+from typing import Iterable
+
+from sqlalchemy import inspect, select
+from sqlalchemy.engine.base import Connection
+
+from apps.authorization.models import (
+    Group,
+    GroupUserLink,
+    Permission,
+    PermissionGroupLink,
+    PermissionUserLink,
+)
+from apps.authorization.services import schedule_invalidation
+from apps.user.models import User
+from core.db.signals.managers import signal_manager
+
+
+def _group_users(connection: Connection, group_names: Iterable[str]) -> list[int]:
+    statement = select(GroupUserLink.user_id).where(
+        GroupUserLink.group_name.in_(list(group_names))
+    )
+    return list(connection.execute(statement).scalars())
+
+
+def _invalidate(connection: Connection, user_ids: Iterable[int]):
+    user_ids = list(user_ids)
+    signal_manager.on_commit(connection, lambda: schedule_invalidation(user_ids))
+
+
+def _changed(target, *attributes: str) -> bool:
+    state = inspect(target)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+def user_link_changed(mapper, connection: Connection, target):
+    _invalidate(connection, [target.user_id])
+
+
+def group_link_changed(mapper, connection: Connection, target: PermissionGroupLink):
+    _invalidate(connection, _group_users(connection, [target.group_name]))
+
+
+def user_changed(mapper, connection: Connection, target: User):
+    if _changed(target, "permissions", "groups"):
+        _invalidate(connection, [target.id])
+
+
+def user_deleted(mapper, connection: Connection, target: User):
+    _invalidate(connection, [target.id])
+
+
+def group_changed(mapper, connection: Connection, target: Group):
+    if not _changed(target, "permissions", "users"):
+        return
+
+    removed = [user.id for user in inspect(target).attrs.users.history.deleted]
+    _invalidate(connection, removed + _group_users(connection, [target.name]))
+
+
+def group_deleted(mapper, connection: Connection, target: Group):
+    # before the deletion, the links are removed with it (ondelete="CASCADE")
+    _invalidate(connection, _group_users(connection, [target.name]))
+
+
+def permission_deleted(mapper, connection: Connection, target: Permission):
+    user_links = select(PermissionUserLink.user_id).where(
+        PermissionUserLink.permission_name == target.name
+    )
+    group_links = select(PermissionGroupLink.group_name).where(
+        PermissionGroupLink.permission_name == target.name
+    )
+    users = list(connection.execute(user_links).scalars())
+    groups = list(connection.execute(group_links).scalars())
+    _invalidate(connection, users + _group_users(connection, groups))
+
+
+for link_model in (PermissionUserLink, GroupUserLink):
+    signal_manager.after_insert(link_model)(user_link_changed)
+    signal_manager.after_delete(link_model)(user_link_changed)
+
+signal_manager.after_insert(PermissionGroupLink)(group_link_changed)
+signal_manager.after_delete(PermissionGroupLink)(group_link_changed)
+signal_manager.after_update(User)(user_changed)
+signal_manager.after_delete(User)(user_deleted)
+signal_manager.after_update(Group)(group_changed)
+signal_manager.before_delete(Group)(group_deleted)
+signal_manager.before_delete(Permission)(permission_deleted)
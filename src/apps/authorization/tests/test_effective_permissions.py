@@ -0,0 +1,145 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+import apps.authorization.signals  # noqa: F401 (registers the cache invalidation)
+from apps.authorization.models import Group, Permission, PermissionUserLink
+from apps.authorization.services import EffectivePermissions, get_effective_permissions
+from apps.authorization.services import permissions as permission_services
+from apps.user.models import User
+from core.cache import tiered
+from core.db.dependencies.session import detached_session, session_scope
+from core.unittest.async_case import AsyncTestCase
+
+
+async def invalidated():
+    """Wait for the redis invalidations scheduled by the signals."""
+    await asyncio.gather(*tiered._deletions)
+
+
+def test_effective_permissions_checks():
+    effective = EffectivePermissions(
+        permissions=frozenset({"read", "update", "delete"}),
+        groups={"editors": frozenset({"read", "update"}), "readers": frozenset()},
+    )
+
+    assert effective.has_permissions(["read", "update"])
+    assert not effective.has_permissions(["read", "create"])
+    assert effective.has_permissions(["read", "create"], any_match=True)
+    assert not effective.has_permissions([])
+
+    assert effective.belonging_groups(["editors", "admins"]) == frozenset()
+    assert effective.belonging_groups(["editors", "admins"], any_match=True) == {
+        "editors"
+    }
+    assert effective.group_has_permissions(["readers", "editors"], ["update"])
+    assert not effective.group_has_permissions(["readers"], ["update"])
+    assert EffectivePermissions.from_dict(effective.to_dict()) == effective
+
+
+class TestEffectivePermissions(AsyncTestCase):
+    fixtures = ["users"]
+
+    @pytest.fixture(autouse=True)
+    def enable_permission_cache(self, settings):
+        permission_services.permission_cache.clear_local()
+        with patch.object(settings, "permission_cache_enabled", True):
+            yield
+        permission_services.permission_cache.clear_local()
+
+    async def async_set_up(self):
+        await super().async_set_up()
+        self.user = await User.get(username="test")
+        self.read, self.update = [
+            await Permission(
+                name=name, target_table=User.table_name(), display_name=name
+            ).save()
+            for name in ("effective_read", "effective_update")
+        ]
+        self.group = await Group(
+            name="effective_editors",
+            target_table=User.table_name(),
+            display_name="Editors",
+        ).save()
+
+    async def test_direct_and_group_permissions(self):
+        await self.user.add_permission(self.read)
+        await self.group.add_permission(self.update)
+        await self.group.add_user(self.user)
+        await invalidated()
+
+        effective = await get_effective_permissions(self.user.id)
+        assert effective.permissions == {"effective_read", "effective_update"}
+        assert effective.groups == {"effective_editors": {"effective_update"}}
+
+    async def test_cached_without_database(self):
+        await self.user.add_permission(self.read)
+        await invalidated()
+        await get_effective_permissions(self.user.id)
+
+        with patch.object(
+            PermissionUserLink, "values", side_effect=AssertionError("db lookup")
+        ):
+            effective = await get_effective_permissions(self.user.id)
+        assert effective.has_permissions(["effective_read"])
+
+    async def test_invalidated_on_user_links_change(self):
+        assert not (await get_effective_permissions(self.user.id)).permissions
+
+        await self.user.add_permission(self.read)
+        await invalidated()
+        assert (await get_effective_permissions(self.user.id)).permissions == {
+            "effective_read"
+        }
+
+        await self.user.remove_permissions([self.read])
+        await invalidated()
+        assert not (await get_effective_permissions(self.user.id)).permissions
+
+    async def test_invalidated_on_group_links_change(self):
+        await self.group.add_user(self.user)
+        await invalidated()
+        assert (await get_effective_permissions(self.user.id)).groups == {
+            "effective_editors": frozenset()
+        }
+
+        await self.group.add_permission(self.update)
+        await invalidated()
+        effective = await get_effective_permissions(self.user.id)
+        assert effective.group_has_permissions(
+            ["effective_editors"], ["effective_update"]
+        )
+
+        await self.group.remove_users([self.user])
+        await invalidated()
+        assert not (await get_effective_permissions(self.user.id)).groups
+
+    async def test_invalidated_after_commit(self):
+        assert not (await get_effective_permissions(self.user.id)).permissions
+
+        async with session_scope() as session:
+            await PermissionUserLink(
+                user_id=self.user.id, permission_name=self.read.name
+            ).save()
+            assert session.info.get("on_commit_callbacks")
+            # a concurrent request reads (and caches) the previous rows
+            with detached_session():
+                assert not (await get_effective_permissions(self.user.id)).permissions
+        await invalidated()
+
+        assert (await get_effective_permissions(self.user.id)).permissions == {
+            "effective_read"
+        }
+
+    async def test_not_invalidated_on_rollback(self):
+        with patch.object(
+            permission_services.permission_cache, "delete_soon"
+        ) as delete_soon:
+            with pytest.raises(RuntimeError):
+                async with session_scope():
+                    await PermissionUserLink(
+                        user_id=self.user.id, permission_name=self.read.name
+                    ).save()
+                    raise RuntimeError("rollback")
+        delete_soon.assert_not_called()
@@ -1,30 +1,50 @@
+from collections.abc import Sequence
+from typing import ClassVar
+
 from fastapi import Depends, HTTPException, status
 
 from apps.authentication.dependencies.oauth2 import current_user
 from apps.chat.models import ChatMessage, ChatRoom
+from apps.chat.services.rooms import RoomInfo, get_room_info_or_404
 from apps.user.models import User
 from core.db.query.exceptions import ObjectNotFoundError
 from core.routers.dependencies import AccessDependency
 
 
+async def get_room_or_404(room_id: int, load: Sequence[str] | None) -> ChatRoom:
+    """Fetch the room with the given relationships only (all of them when None)."""
+    manager = ChatRoom.objects() if load is None else ChatRoom.options(load=load)
+    return await manager.get_or_404(id=room_id)
+
+
 class ChatRoomAccess(AccessDependency[ChatRoom]):
+    """Access checked with the cached room metadata (see services/rooms.py).
+
+    Routes only using the room id get a room built from its metadata, the others
+    (load_room) fetch the room once access is granted.
+    """
+
+    room_info: RoomInfo
     room: ChatRoom
     user: User
+    load_room: ClassVar[bool] = False
+    # relationships loaded with the room, None for the model defaults (write routes)
+    room_relationships: ClassVar[Sequence[str] | None] = ()
 
     def test_access(self) -> bool:
         return self.user.is_admin or self.is_chat_owner() or self.is_member()
 
     def is_member(self):
-        return self.user in self.room.members
+        return self.room_info.is_member(self.user.id)
 
     def is_chat_owner(self):
-        return self.user == self.room.owner
+        return self.user.id == self.room_info.owner_id
 
     async def __call__(
         self, room_id: int, user: User = Depends(current_user)
     ) -> ChatRoom:
         try:
-            self.room = await ChatRoom.get_or_404(id=room_id)
+            self.room_info = await get_room_info_or_404(room_id)
         except ObjectNotFoundError as e:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
@@ -33,10 +53,33 @@ class ChatRoomAccess(AccessDependency[ChatRoom]):
         self.user = user
         if not self.test_access():
             self.raise_access_denied()
+
+        if not self.load_room:
+            info = self.room_info
+            return ChatRoom(
+                id=info.id,
+                name=info.name,
+                visibility=info.visibility,
+                owner_id=info.owner_id,
+            )
+
+        try:
+            self.room = await get_room_or_404(room_id, self.room_relationships)
+        except ObjectNotFoundError as e:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
+            ) from e
         return self.room
 
 
+class ChatRoomReadAccess(ChatRoomAccess):
+    load_room = True
+
+
 class ChatRoomEditAccess(ChatRoomAccess):
+    load_room = True
+    room_relationships = None
+
     def test_access(self) -> bool:
         return self.user.is_admin or self.is_chat_owner()
 
@@ -50,7 +93,7 @@ class ChatMessageAccess(AccessDependency[ChatRoom]):
         return self.user.is_admin or self.is_room_owner() or self.is_message_author()
 
     def is_room_owner(self):
-        return self.room.owner == self.user
+        return self.room.owner_id == self.user.id
 
     def is_message_author(self):
         return self.user.id == self.message.author_id
@@ -59,7 +102,7 @@ class ChatMessageAccess(AccessDependency[ChatRoom]):
         self, room_id: int, message_id: int, user: User = Depends(current_user)
     ) -> ChatMessage:
         try:
-            self.room = await ChatRoom.get_or_404(id=room_id)
+            self.room = await get_room_info_or_404(room_id)
             self.message = await ChatMessage.get_or_404(id=message_id)
         except ObjectNotFoundError as e:
             raise HTTPException(
@@ -1,6 +1,6 @@
 from typing import Any
 
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Index, UniqueConstraint
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlmodel import Field, Relationship, col, or_, select
@@ -20,13 +20,13 @@ class ChatRoom(ChatRoomBaseModel, BaseTable, table=True):
     owner: User = Relationship(sa_relationship_kwargs={"lazy": "joined"})
     messages: list["ChatMessage"] = Relationship(
         sa_relationship_kwargs={
-            "lazy": "joined",
+            "lazy": "selectin",
             "order_by": "asc(ChatMessage.created_at)",
         },
         back_populates="room",
     )
     members: list[User] = Relationship(
-        sa_relationship_kwargs={"lazy": "joined"}, link_model=ChatRoomUserLink
+        sa_relationship_kwargs={"lazy": "selectin"}, link_model=ChatRoomUserLink
     )
 
     async def subscribe(self, member: User):
@@ -69,6 +69,11 @@ class ChatRoom(ChatRoomBaseModel, BaseTable, table=True):
 
 
 class ChatMessage(ChatMessageBaseModel, BaseTable, table=True):
+    # room history is scrolled by keyset pagination (see ChatMessage.paginate)
+    __table_args__ = (
+        Index("ix_chatmessage_room_id_created_at_id", "room_id", "created_at", "id"),
+    )
+
     author_id: int | None = Field(
         foreign_key="users.id", default=None, ondelete="SET NULL"
     )
@@ -13,7 +13,8 @@ from apps.chat.dependencies.access import (
 from apps.chat.models import ChatMessage, ChatRoom
 from apps.chat.models.schemas.message import ChatMessageCreate
 from apps.user.models import User
-from core.db.dependencies import SessionDep
+from core.db.dependencies import KeysetParamsDep, SessionDep
+from core.db.query.pagination import KeysetPage
 
 routers = APIRouter()
 
@@ -33,6 +34,20 @@ async def get_room_messages(
     return await apaginate(db, query)
 
 
+@routers.get(
+    "/cursor/",
+    name="room-messages-cursor",
+)
+async def get_room_messages_page(
+    pagination: KeysetParamsDep,
+    room: Annotated[ChatRoom, Depends(ChatRoomAccess())],
+) -> KeysetPage[ChatMessage]:
+    """Scroll the room history, the latest messages come first."""
+    return await pagination.paginate(
+        ChatMessage, order_by="-created_at", room_id=room.id
+    )
+
+
 @routers.post(
     "/",
     name="room-message-add",
@@ -8,9 +8,9 @@ from sqlalchemy.exc import IntegrityError
 
 from apps.authentication.dependencies.oauth2 import current_user
 from apps.chat.dependencies.access import (
-    ChatRoomAccess,
     ChatRoomDeleteAccess,
     ChatRoomEditAccess,
+    ChatRoomReadAccess,
 )
 from apps.chat.dependencies.db import RoomDepends
 from apps.chat.models import ChatRoom
@@ -48,7 +48,7 @@ async def get_rooms(db: SessionDep) -> Page[ChatRoom]:
     "/{room_id}/",
     name="room-get",
 )
-def get_room(room: Annotated[ChatRoom, Depends(ChatRoomAccess())]) -> ChatRoom:
+def get_room(room: Annotated[ChatRoom, Depends(ChatRoomReadAccess())]) -> ChatRoom:
     return room
 
 
@@ -0,0 +1,34 @@
+import json
+from functools import lru_cache
+from typing import Any, Callable
+
+from settings import settings
+
+FrameEncoder = Callable[[Any], str]
+
+
+@lru_cache
+def get_frame_encoder(name: str) -> FrameEncoder:
+    """JSON encoder of the chat frames, orjson and msgspec are optional dependencies
+    (extras of the same names). Resolved at startup, see core.lifespan.
+    """
+    try:
+        if name == "orjson":
+            import orjson
+
+            return lambda data: orjson.dumps(data).decode()
+        if name == "msgspec":
+            import msgspec
+
+            encoder = msgspec.json.Encoder()
+            return lambda data: encoder.encode(data).decode()
+    except ImportError as e:
+        raise RuntimeError(
+            f"Chat frames encoder {name} not available: {e} (install the {name} extra)."
+        ) from e
+    return json.dumps
+
+
+def encode_frame(data: Any) -> str:
+    """Serialize a chat event once: the text frame sent as is to all its websockets."""
+    return get_frame_encoder(settings.chat_json_encoder)(data)
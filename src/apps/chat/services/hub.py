@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+
+import anyio
+from broadcaster import Broadcast
+
+from apps.chat.services.queues import SendQueue, SlowConsumerPolicy
+from core.monitoring.logger import get_logger
+from core.monitoring.metrics import CHAT_ROOM_SUBSCRIPTIONS
+
+_logger = get_logger(__name__)
+
+
+@dataclass(eq=False, slots=True)
+class _Room:
+    channel: str
+    subscribers: set[SendQueue] = field(default_factory=set)
+    # set once the upstream subscription is open (or failed)
+    ready: anyio.Event = field(default_factory=anyio.Event)
+    task: asyncio.Task | None = None
+
+
+class RoomHub:
+    """Fan out the messages of the chat rooms to the websockets of the worker.
+
+    A room with local websockets has a single upstream (broadcaster) subscription,
+    whatever the number of its websockets: a message is received once per room and
+    worker, then its (already serialized) frame is queued for each websocket, in
+    bounded queues (see SendQueue). The subscription is closed with the last
+    websocket of the room.
+    """
+
+    def __init__(
+        self,
+        broadcaster: Broadcast,
+        p_logger: logging.Logger | None = None,
+        *,
+        queue_size: int = 100,
+        slow_consumer_policy: SlowConsumerPolicy = "drop_oldest",
+        slow_consumer_timeout: float = 10.0,
+    ):
+        self.broadcaster = broadcaster
+        self.logger = p_logger or _logger
+        self.queue_size = queue_size
+        self.slow_consumer_policy = slow_consumer_policy
+        self.slow_consumer_timeout = slow_consumer_timeout
+        self._rooms: dict[str, _Room] = {}
+
+    def subscribers(self, channel: str) -> int:
+        room = self._rooms.get(channel)
+        return len(room.subscribers) if room is not None else 0
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[SendQueue]:
+        """Frames of the room, the queue ends when the upstream subscription is lost."""
+        queue = SendQueue(
+            self.queue_size, self.slow_consumer_policy, self.slow_consumer_timeout
+        )
+        room = self._rooms.get(channel)
+        if room is None:
+            room = self._rooms[channel] = _Room(channel)
+            room.task = asyncio.create_task(self._forward(room))
+        room.subscribers.add(queue)
+
+        try:
+            await room.ready.wait()
+            yield queue
+        finally:
+            room.subscribers.discard(queue)
+            queue.discard()
+            if not room.subscribers and self._rooms.get(channel) is room:
+                del self._rooms[channel]
+                room.task.cancel()
+
+    async def _forward(self, room: _Room):
+        try:
+            async with self.broadcaster.subscribe(channel=room.channel) as upstream:
+                CHAT_ROOM_SUBSCRIPTIONS.inc()
+                try:
+                    room.ready.set()
+                    async for event in upstream:
+                        self._fan_out(room, event.message)
+                finally:
+                    CHAT_ROOM_SUBSCRIPTIONS.dec()
+        except Exception as e:
+            self.logger.exception(
+                "Room hub: subscription to %s lost %s", room.channel, e
+            )
+        finally:
+            room.ready.set()
+            if self._rooms.get(room.channel) is room:
+                del self._rooms[room.channel]
+            # ends the websocket queues
+            for queue in room.subscribers:
+                queue.close()
+
+    @staticmethod
+    def _fan_out(room: _Room, frame: str):
+        for queue in room.subscribers:
+            queue.put(frame)
+
+    async def close(self):
+        """Close the upstream subscriptions, before the broadcaster disconnection."""
+        tasks = [room.task for room in self._rooms.values()]
+        self._rooms.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
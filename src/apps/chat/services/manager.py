@@ -8,7 +8,11 @@ from anyio.abc import TaskGroup
 from broadcaster import Broadcast
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
-from apps.chat.models.orm import ChatMessage, ChatRoom
+from apps.chat.services.frames import encode_frame
+from apps.chat.services.hub import RoomHub
+from apps.chat.services.queues import SlowConsumerError
+from apps.chat.services.rooms import RoomInfo, get_room_info
+from apps.chat.services.writer import MessageWriter
 from apps.user.models import User
 from core.design.singleton import Singleton
 from core.monitoring.logger import get_logger
@@ -22,7 +26,7 @@ Fn = Callable[P, Awaitable[Any]]
 
 class ConnectionState(TypedDict):
     user: User | None
-    current_room: ChatRoom | None
+    current_room: RoomInfo | None
     sender_scope: CancelScope | None
     room_event: Event | None
 
@@ -37,6 +41,20 @@ class ChatWebSocketManager(metaclass=Singleton):
     def __init__(self, p_logger: logging.Logger | None = None):
         self.logger = p_logger or _logger
         self.broadcaster = Broadcast(settings.celery_broker)
+        self.hub = RoomHub(
+            self.broadcaster,
+            self.logger,
+            queue_size=settings.chat_send_queue_size,
+            slow_consumer_policy=settings.chat_slow_consumer_policy,
+            slow_consumer_timeout=settings.chat_slow_consumer_timeout,
+        )
+        self.writer = MessageWriter(
+            batch_size=settings.chat_write_batch_size,
+            flush_interval=settings.chat_write_flush_interval,
+            id_block_size=settings.chat_id_block_size,
+            max_pending=settings.chat_write_max_pending,
+            p_logger=self.logger,
+        )
 
     async def init_connection(self, websocket: WebSocket, author: User):
         await websocket.accept()
@@ -76,18 +94,23 @@ class ChatWebSocketManager(metaclass=Singleton):
                 state["room_event"] = anyio.Event()
 
                 self.logger.info("Subscribing to room %s", room.name)
-                async with self.broadcaster.subscribe(channel=room.name) as sub:
+                async with self.hub.subscribe(room.name) as frames:
                     with anyio.CancelScope() as cancel_scope:
                         state["sender_scope"] = cancel_scope
-                        async for event in sub:
-                            await websocket.send_json(event.message)
+                        # serialized once by the publisher, see _publish_message
+                        async for frame in frames:
+                            await frames.send(websocket.send_text, frame)
+                        # not cancelled by a room switch
+                        raise ConnectionError(f"Room {room.name} subscription lost.")
 
         await self._exception_handler(_sender, task_group=task_group)
 
     async def _publish_message(self, msg: str, state: ConnectionState):
         room = state["current_room"]
         msg_data = await self._save_message(msg, state)
-        await self.broadcaster.publish(channel=room.name, message=json.dumps(msg_data))
+        await self.broadcaster.publish(
+            channel=room.name, message=encode_frame(msg_data)
+        )
 
     def _process_raw_message(
         self, raw_message: str, state: ConnectionState
@@ -105,11 +128,16 @@ class ChatWebSocketManager(metaclass=Singleton):
 
     async def _switch_room(self, room_id: int, state: ConnectionState):
         self.logger.info("Switching room %s", room_id)
-        state["current_room"] = await ChatRoom.get(id=room_id)
+        # the room metadata only, not its messages and members
+        room = await get_room_info(room_id)
+        if room is None:
+            self.logger.warning("Unknown room %s", room_id)
+            return
+
+        state["current_room"] = room
         if state["sender_scope"] is not None:
             state["sender_scope"].cancel()
 
-        room = state["current_room"]
         username = state["user"].username
         self.logger.info("User %s switched to room %s", username, room.name)
         # release event for send handler to process
@@ -121,16 +149,19 @@ class ChatWebSocketManager(metaclass=Singleton):
         except WebSocketDisconnect as e:
             self.logger.info("WebSocket: Client disconnected %s", e)
 
+        except SlowConsumerError as e:
+            self.logger.warning("WebSocket: Slow client disconnected %s", e)
+
         except Exception as e:
             self.logger.exception("WebSocket: Exception %s", e)
         finally:
             task_group.cancel_scope.cancel()
 
     async def _save_message(self, message: str, state: ConnectionState):
-        """Persist the given message in the database."""
-        room_id = state["current_room"].id
-        user_id = state["user"].id
-        _msg_obj = await ChatMessage(
-            content=message, room_id=room_id, author_id=user_id
-        ).save()
+        """Queue the given message for the database (write-behind, see MessageWriter)."""
+        _msg_obj = await self.writer.create(
+            content=message,
+            room_id=state["current_room"].id,
+            author_id=state["user"].id,
+        )
         return _msg_obj.model_dump(mode="json")
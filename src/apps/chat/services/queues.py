@@ -0,0 +1,112 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Literal
+
+import anyio
+
+from core.monitoring.metrics import CHAT_DROPPED_FRAMES, CHAT_SEND_QUEUE_FRAMES
+
+SlowConsumerPolicy = Literal["drop_oldest", "disconnect"]
+
+
+class SlowConsumerError(ConnectionError):
+    """The websocket did not read its frames for too long, see SendQueue."""
+
+
+class SendQueue:
+    """Bounded queue of the frames to send on a websocket.
+
+    A full queue (slow client) drops its oldest frames ("drop_oldest" policy), or
+    drops the new ones and is closed when not drained `timeout` seconds after it was
+    full ("disconnect" policy): iterating it then raises SlowConsumerError.
+    Frames are put from the room fan-out without waiting for the websocket, and sent
+    with send(): a client which does not read a frame in `timeout` seconds is
+    disconnected, whatever the policy.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        policy: SlowConsumerPolicy = "drop_oldest",
+        timeout: float = 10.0,
+    ):
+        self.maxsize = maxsize
+        self.policy = policy
+        self.timeout = timeout
+        self._frames: deque[str] = deque()
+        self._wakeup = asyncio.Event()
+        self._full_since: float | None = None
+        self._closed = False
+        self._error: SlowConsumerError | None = None
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def put(self, frame: str):
+        if self._closed:
+            return
+
+        if len(self._frames) < self.maxsize:
+            self._frames.append(frame)
+            CHAT_SEND_QUEUE_FRAMES.inc()
+            self._wakeup.set()
+            return
+
+        now = time.monotonic()
+        if self._full_since is None:
+            self._full_since = now
+        CHAT_DROPPED_FRAMES.labels(policy=self.policy).inc()
+        if self.policy == "drop_oldest":
+            self._frames.popleft()
+            self._frames.append(frame)
+        elif now - self._full_since >= self.timeout:
+            self.close(SlowConsumerError(f"Send queue not drained in {self.timeout}s."))
+
+    def close(self, error: SlowConsumerError | None = None):
+        """Stop the iteration once the queued frames are read, or at once on error."""
+        if self._closed:
+            return
+
+        self._closed = True
+        self._error = error
+        if error is not None:
+            CHAT_SEND_QUEUE_FRAMES.dec(len(self._frames))
+            self._frames.clear()
+        self._wakeup.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> str:
+        while not self._frames:
+            if self._closed:
+                if self._error is not None:
+                    raise self._error
+                raise StopAsyncIteration
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+        frame = self._frames.popleft()
+        CHAT_SEND_QUEUE_FRAMES.dec()
+        # drained, even partially: not stalled
+        self._full_since = None
+        return frame
+
+    async def send(self, send: Callable[[str], Awaitable[Any]], frame: str):
+        """Send the frame (e.g. websocket.send_text), raise SlowConsumerError when it
+        is not sent in `timeout` seconds (stalled client).
+        """
+        try:
+            with anyio.fail_after(self.timeout):
+                await send(frame)
+        except TimeoutError:
+            error = SlowConsumerError(f"Frame not sent in {self.timeout}s.")
+            self.close(error)
+            raise error from None
+
+    def discard(self):
+        """Forget the queued frames, the websocket is gone."""
+        CHAT_SEND_QUEUE_FRAMES.dec(len(self._frames))
+        self._frames.clear()
+        self._closed = True
@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from apps.chat.models.orm import ChatRoom
+from apps.chat.models.relation_links import ChatRoomUserLink
+from apps.chat.models.utils import ChatVisibility
+from core.cache import TieredCache
+from core.db.query.exceptions import ObjectNotFoundError
+from settings import settings
+
+# Metadata of the rooms, keyed by room id.
+room_cache = TieredCache(
+    "chat:room",
+    maxsize=settings.room_cache_size,
+    local_ttl=settings.room_cache_local_ttl,
+    broadcast_deletions=True,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class RoomInfo:
+    """What the access checks and the websockets need of a room: no messages."""
+
+    id: int
+    name: str
+    visibility: ChatVisibility
+    owner_id: int | None
+    member_ids: frozenset[int]
+
+    def is_member(self, user_id: int) -> bool:
+        return user_id in self.member_ids
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "visibility": self.visibility.value,
+            "owner_id": self.owner_id,
+            "member_ids": sorted(self.member_ids),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RoomInfo":
+        return cls(
+            id=data["id"],
+            name=data["name"],
+            visibility=ChatVisibility(data["visibility"]),
+            owner_id=data["owner_id"],
+            member_ids=frozenset(data["member_ids"]),
+        )
+
+
+async def load_room_info(room_id: int) -> RoomInfo | None:
+    """Read the room columns and its member ids, without loading its relationships."""
+    rows = await ChatRoom.values(
+        "id", "name", "visibility", "owner_id", filters={"id": room_id}
+    )
+    if not rows:
+        return None
+
+    ((id_, name, visibility, owner_id),) = rows
+    members = await ChatRoomUserLink.values("user_id", filters={"room_id": room_id})
+    return RoomInfo(
+        id=id_,
+        name=name,
+        visibility=visibility,
+        owner_id=owner_id,
+        member_ids=frozenset(user_id for (user_id,) in members),
+    )
+
+
+async def get_room_info(room_id: int) -> RoomInfo | None:
+    """Metadata of the room, served from the cache.
+
+    Entries are deleted by the signals of the chat app when the room or its members
+    change, see apps/chat/signals.py.
+    """
+    if not settings.room_cache_enabled:
+        return await load_room_info(room_id)
+
+    key = str(room_id)
+    if (data := await room_cache.get(key)) is not None:
+        return RoomInfo.from_dict(data)
+
+    info = await load_room_info(room_id)
+    if info is not None:
+        await room_cache.set(key, info.to_dict(), settings.room_cache_ttl)
+    return info
+
+
+async def get_room_info_or_404(room_id: int) -> RoomInfo:
+    info = await get_room_info(room_id)
+    if info is None:
+        raise ObjectNotFoundError(f"Object {ChatRoom.__name__} not found.")
+    return info
+
+
+def schedule_invalidation(room_ids: Iterable[int]):
+    """Invalidate the metadata of the rooms from a (sync) database event."""
+    keys = [str(room_id) for room_id in set(room_ids) if room_id is not None]
+    if keys:
+        room_cache.delete_soon(*keys)
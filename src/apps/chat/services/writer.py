@@ -0,0 +1,133 @@
+import asyncio
+import datetime
+import logging
+from collections import deque
+
+from sqlalchemy.exc import IntegrityError
+
+from apps.chat.models.orm import ChatMessage
+from core.db.dependencies.session import detached_session
+from core.monitoring.logger import get_logger
+from core.monitoring.metrics import CHAT_DROPPED_MESSAGES, CHAT_PENDING_MESSAGES
+
+_logger = get_logger(__name__)
+
+
+class MessageWriter:
+    """Write-behind buffer of the chat messages.
+
+    A message gets its id (from blocks of the id sequence) and its created_at at
+    once, it can be published before it is written. The pending messages are
+    inserted by batches of `batch_size` (multi-row INSERT), at least every
+    `flush_interval` seconds. A failed batch is retried: the rows are inserted at
+    least once, with ON CONFLICT (id) DO NOTHING. A batch violating a constraint
+    (e.g. its room was deleted meanwhile) is split to drop only the invalid rows.
+    Beyond `max_pending` messages (database too slow, or down), the new messages are
+    inserted at once, before they are published.
+    Pending messages are lost if the process is killed, close() flushes them on
+    shutdown. The rows are inserted without the ORM events (see DBService.bulk_upsert).
+    """
+
+    def __init__(
+        self,
+        *,
+        batch_size: int = 500,
+        flush_interval: float = 0.2,
+        id_block_size: int = 100,
+        max_pending: int = 10_000,
+        p_logger: logging.Logger | None = None,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.id_block_size = id_block_size
+        self.max_pending = max_pending
+        self.logger = p_logger or _logger
+        self._pending: list[ChatMessage] = []
+        self._ids: deque[int] = deque()
+        self._ids_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def create(self, **data) -> ChatMessage:
+        """A new message, written later (see flush), or at once when too many are pending."""
+        message = ChatMessage(
+            **data,
+            id=await self._next_id(),
+            created_at=datetime.datetime.now(datetime.timezone.utc).replace(
+                tzinfo=None
+            ),
+        )
+        if len(self._pending) >= self.max_pending:
+            # backpressure: errors are raised to the sender instead of buffered
+            with detached_session():
+                await ChatMessage.bulk_upsert([message], update_fields=())
+            return message
+
+        self._pending.append(message)
+        CHAT_PENDING_MESSAGES.inc()
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_periodically())
+        return message
+
+    async def _next_id(self) -> int:
+        if not self._ids:
+            async with self._ids_lock:
+                if not self._ids:
+                    self._ids.extend(await ChatMessage.reserve_ids(self.id_block_size))
+        return self._ids.popleft()
+
+    async def _flush_periodically(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                # kept pending, retried at the next flush
+                self.logger.exception("Chat messages: batch insert failed %s", e)
+
+    async def flush(self):
+        """Insert the pending messages, by batches."""
+        # on its own session, whatever the context of the first message
+        with detached_session():
+            while self._pending:
+                batch = self._pending[: self.batch_size]
+                await self._insert(batch)
+                del self._pending[: len(batch)]
+                CHAT_PENDING_MESSAGES.dec(len(batch))
+
+    async def _insert(self, batch: list[ChatMessage]):
+        """Insert the batch, the rows violating a constraint are logged and dropped."""
+        try:
+            await ChatMessage.bulk_upsert(
+                batch, update_fields=(), chunk_size=self.batch_size
+            )
+        except IntegrityError as e:
+            if len(batch) == 1:
+                self.logger.error(
+                    "Chat messages: message %s dropped %s", batch[0].id, e.orig
+                )
+                CHAT_DROPPED_MESSAGES.inc()
+                return
+
+            middle = len(batch) // 2
+            await self._insert(batch[:middle])
+            await self._insert(batch[middle:])
+
+    async def close(self):
+        """Stop the periodic flush and write the pending messages (shutdown)."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            self.logger.exception(
+                "Chat messages: %s pending messages lost %s", len(self._pending), e
+            )
@@ -0,0 +1,48 @@
+"""Invalidation of the rooms metadata cache (see services/rooms.py).
+
+Members are usually changed through the relationship (room.members): SQLAlchemy
+writes the link table directly and only emits the update event of the room, so both
+the link model and the room are listened to.
+The entries are deleted once the changes are committed, like the effective
+permissions (see apps/authorization/signals.py).
+"""
+
+from typing import Iterable
+
+from sqlalchemy import select, union
+from sqlalchemy.engine.base import Connection
+
+from apps.chat.models.orm import ChatRoom
+from apps.chat.models.relation_links import ChatRoomUserLink
+from apps.chat.services.rooms import schedule_invalidation
+from apps.user.models import User
+from core.db.signals.managers import signal_manager
+
+
+def _invalidate(connection: Connection, room_ids: Iterable[int]):
+    room_ids = list(room_ids)
+    signal_manager.on_commit(connection, lambda: schedule_invalidation(room_ids))
+
+
+def member_link_changed(mapper, connection: Connection, target: ChatRoomUserLink):
+    _invalidate(connection, [target.room_id])
+
+
+def room_changed(mapper, connection: Connection, target: ChatRoom):
+    _invalidate(connection, [target.id])
+
+
+def user_deleted(mapper, connection: Connection, target: User):
+    # before the deletion, the owned rooms and the links are removed with the user
+    statement = union(
+        select(ChatRoom.id).where(ChatRoom.owner_id == target.id),
+        select(ChatRoomUserLink.room_id).where(ChatRoomUserLink.user_id == target.id),
+    )
+    _invalidate(connection, connection.execute(statement).scalars())
+
+
+signal_manager.after_insert(ChatRoomUserLink)(member_link_changed)
+signal_manager.after_delete(ChatRoomUserLink)(member_link_changed)
+signal_manager.after_update(ChatRoom)(room_changed)
+signal_manager.after_delete(ChatRoom)(room_changed)
+signal_manager.before_delete(User)(user_deleted)
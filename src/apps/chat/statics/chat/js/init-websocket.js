@@ -6,7 +6,7 @@
 
         window.ws.onmessage = function (event) {
             const messages = document.getElementById("room-conversation")
-            const message = window.createMessage(JSON.parse(JSON.parse(event.data)))
+            const message = window.createMessage(JSON.parse(event.data))
             messages.innerHTML += message
             window.scrollToBottom(messages)
         }
@@ -0,0 +1,60 @@
+import pytest
+
+from apps.chat.models import ChatMessage, ChatRoom
+from apps.chat.services.writer import MessageWriter
+from apps.user.models import User
+
+
+@pytest.fixture()
+async def room(db, user: User):  # pylint: disable=unused-argument
+    return await ChatRoom(name="write-behind", owner=user).save()
+
+
+async def test_messages_written_behind(room: ChatRoom, user: User):
+    writer = MessageWriter(batch_size=10, flush_interval=60, id_block_size=2)
+    messages = [
+        await writer.create(content=f"message {i}", room_id=room.id, author_id=user.id)
+        for i in range(3)
+    ]
+
+    ids = [message.id for message in messages]
+    assert len(set(ids)) == 3
+    assert all(message.created_at is not None for message in messages)
+    # published before it is written
+    assert await ChatMessage.get(id=ids[0]) is None
+
+    await writer.close()
+    assert await ChatMessage.count(room_id=room.id) == 3
+
+
+async def test_flush_retries_are_idempotent(room: ChatRoom, user: User):
+    writer = MessageWriter(flush_interval=60)
+    message = await writer.create(content="once", room_id=room.id, author_id=user.id)
+    await writer.flush()
+
+    # a batch committed but not acknowledged is inserted again
+    writer._pending.append(message)
+    await writer.close()
+    assert await ChatMessage.count(room_id=room.id) == 1
+
+
+async def test_invalid_rows_are_dropped(room: ChatRoom, user: User):
+    writer = MessageWriter(batch_size=10, flush_interval=60)
+    for i in range(4):
+        await writer.create(content=f"valid {i}", room_id=room.id, author_id=user.id)
+    # its room was deleted meanwhile
+    await writer.create(content="invalid", room_id=room.id + 1000, author_id=user.id)
+
+    await writer.close()
+    assert not writer._pending
+    assert await ChatMessage.count(room_id=room.id) == 4
+
+
+async def test_written_at_once_beyond_max_pending(room: ChatRoom, user: User):
+    writer = MessageWriter(flush_interval=60, max_pending=1)
+    await writer.create(content="pending", room_id=room.id, author_id=user.id)
+    message = await writer.create(content="now", room_id=room.id, author_id=user.id)
+
+    assert (await ChatMessage.get(id=message.id)).content == "now"
+    await writer.close()
+    assert await ChatMessage.count(room_id=room.id) == 2
@@ -0,0 +1,83 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+import apps.chat.signals  # noqa: F401 (registers the cache invalidation)
+from apps.chat.models import ChatRoom, ChatRoomUserLink
+from apps.chat.models.utils import ChatVisibility
+from apps.chat.services import rooms as room_services
+from apps.chat.services.rooms import RoomInfo, get_room_info
+from apps.user.models import User
+from core.cache import tiered
+from core.db.dependencies.session import detached_session, session_scope
+
+
+async def invalidated():
+    """Wait for the redis invalidations scheduled by the signals."""
+    await asyncio.gather(*tiered._deletions)
+
+
+@pytest.fixture(autouse=True)
+def enable_room_cache(settings):
+    room_services.room_cache.clear_local()
+    with patch.object(settings, "room_cache_enabled", True):
+        yield
+    room_services.room_cache.clear_local()
+
+
+@pytest.fixture()
+async def room(db, user: User):  # pylint: disable=unused-argument
+    return await ChatRoom(name="cached-room", owner=user).save()
+
+
+def test_room_info_serialization():
+    info = RoomInfo(
+        id=1,
+        name="room",
+        visibility=ChatVisibility.public,
+        owner_id=2,
+        member_ids=frozenset({2, 3}),
+    )
+    assert RoomInfo.from_dict(info.to_dict()) == info
+    assert info.is_member(3)
+    assert not info.is_member(4)
+
+
+async def test_cached_without_loading_the_room(room: ChatRoom, user: User):
+    info = await get_room_info(room.id)
+    assert info.name == "cached-room"
+    assert info.owner_id == user.id
+
+    with patch.object(ChatRoom, "values", side_effect=AssertionError("db lookup")):
+        assert await get_room_info(room.id) == info
+
+
+async def test_invalidated_on_members_change(room: ChatRoom, admin: User):
+    assert not (await get_room_info(room.id)).member_ids
+
+    await room.subscribe(admin)
+    await invalidated()
+    assert (await get_room_info(room.id)).is_member(admin.id)
+
+    room.visibility = ChatVisibility.public
+    await room.save()
+    await invalidated()
+    assert (await get_room_info(room.id)).visibility == ChatVisibility.public
+
+    await room.delete()
+    await invalidated()
+    assert await get_room_info(room.id) is None
+
+
+async def test_invalidated_after_commit(room: ChatRoom, admin: User):
+    assert not (await get_room_info(room.id)).member_ids
+
+    async with session_scope():
+        await ChatRoomUserLink(room_id=room.id, user_id=admin.id).save()
+        # a concurrent access check reads (and caches) the previous members
+        with detached_session():
+            assert not (await get_room_info(room.id)).member_ids
+    await invalidated()
+
+    assert (await get_room_info(room.id)).is_member(admin.id)
@@ -0,0 +1,71 @@
+import asyncio
+import json
+from contextlib import AsyncExitStack
+from unittest.mock import patch
+
+import pytest
+from broadcaster import Broadcast
+
+from apps.chat.services.frames import encode_frame, get_frame_encoder
+from apps.chat.services.hub import RoomHub
+
+
+@pytest.fixture
+async def broadcaster():
+    broadcast = Broadcast("memory://")
+    await broadcast.connect()
+    yield broadcast
+    await broadcast.disconnect()
+
+
+async def test_one_upstream_subscription_per_room(broadcaster):
+    hub = RoomHub(broadcaster)
+
+    async with AsyncExitStack() as stack:
+        streams = [
+            await stack.enter_async_context(hub.subscribe("room")) for _ in range(3)
+        ]
+        assert hub.subscribers("room") == 3
+        assert len(broadcaster._subscribers["room"]) == 1
+
+        await broadcaster.publish(channel="room", message="hello")
+        assert [await stream.__anext__() for stream in streams] == ["hello"] * 3
+        upstream = hub._rooms["room"].task
+
+    assert hub.subscribers("room") == 0
+    await asyncio.gather(upstream, return_exceptions=True)
+    assert not broadcaster._subscribers.get("room")
+
+
+async def test_room_switch_releases_the_subscription(broadcaster):
+    hub = RoomHub(broadcaster)
+
+    async with hub.subscribe("first"), hub.subscribe("second") as second:
+        async with hub.subscribe("first"):
+            assert hub.subscribers("first") == 2
+        assert hub.subscribers("first") == 1
+
+        await broadcaster.publish(channel="second", message="hi")
+        assert await second.__anext__() == "hi"
+
+    await hub.close()
+
+
+@pytest.mark.parametrize("encoder", ["json", "orjson", "msgspec"])
+def test_frame_encoders(settings, encoder):
+    if encoder != "json":
+        pytest.importorskip(encoder)
+
+    data = {"content": "héllo", "room_id": 1, "updated_at": None}
+    with patch.object(settings, "chat_json_encoder", encoder):
+        assert json.loads(encode_frame(data)) == data
+
+
+def test_unavailable_frame_encoder():
+    get_frame_encoder.cache_clear()
+    try:
+        with patch.dict("sys.modules", {"msgspec": None}):
+            with pytest.raises(RuntimeError, match="msgspec extra"):
+                get_frame_encoder("msgspec")
+    finally:
+        get_frame_encoder.cache_clear()
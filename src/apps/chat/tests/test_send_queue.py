@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from apps.chat.services.queues import SendQueue, SlowConsumerError
+
+
+def dropped(policy: str) -> float:
+    return (
+        REGISTRY.get_sample_value("chat_dropped_frames_total", {"policy": policy}) or 0
+    )
+
+
+async def test_drop_oldest():
+    queue = SendQueue(2, "drop_oldest")
+    before = dropped("drop_oldest")
+
+    for frame in ("1", "2", "3"):
+        queue.put(frame)
+
+    assert len(queue) == 2
+    assert [await queue.__anext__(), await queue.__anext__()] == ["2", "3"]
+    assert dropped("drop_oldest") == before + 1
+
+
+async def test_disconnect_slow_consumer():
+    queue = SendQueue(1, "disconnect", timeout=0)
+    queue.put("1")
+    queue.put("2")
+
+    with pytest.raises(SlowConsumerError):
+        await queue.__anext__()
+
+
+async def test_draining_consumer_is_not_disconnected():
+    queue = SendQueue(2, "disconnect", timeout=0.05)
+    for i in range(10):
+        queue.put(str(i))
+        queue.put(str(i))
+        await asyncio.sleep(0.01)
+        # reads a frame, the queue stays nearly full
+        await queue.__anext__()
+
+    assert len(queue) == 1
+
+
+async def test_stalled_send_disconnects():
+    queue = SendQueue(10, timeout=0.01)
+
+    async def stalled_send(frame: str):
+        await asyncio.sleep(60)
+
+    with pytest.raises(SlowConsumerError):
+        await queue.send(stalled_send, "1")
+    queue.put("2")
+    with pytest.raises(SlowConsumerError):
+        await queue.__anext__()
+
+
+async def test_closed_queue_ends_after_its_frames():
+    queue = SendQueue(10)
+    queue.put("1")
+    queue.close()
+    queue.put("2")
+
+    assert [frame async for frame in queue] == ["1"]
@@ -6,6 +6,8 @@ from fastapi.params import Query
 
 from apps.authorization.dependencies import permission_required
 from apps.authorization.models import Permission
+from core.db.dependencies import KeysetParamsDep
+from core.db.query.pagination import KeysetPage
 
 from .models import Hero
 from .models.schema.create import HeroCreate
@@ -21,6 +23,15 @@ perms = {
 _NOT_FOUND_MSG = "Hero not found."
 
 
+@routers.get(
+    "/cursor/",
+    name="hero-list-cursor",
+    description="Get heroes page by page (keyset pagination)",
+)
+async def get_heroes_page(pagination: KeysetParamsDep) -> KeysetPage[Hero]:
+    return await pagination.paginate(Hero)
+
+
 @routers.get("/{pk}/", name="hero-get", description="Get hero by id.")
 async def get_hero(pk: int):
     return await Hero.get(id=pk)
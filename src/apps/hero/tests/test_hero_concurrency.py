@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+from apps.hero.models import Hero
+from core.monitoring.logger import get_logger
+from core.unittest.async_case import AsyncTestCase
+
+logger = get_logger(__name__)
+
+CONCURRENT_CALLS = 1000
+# stay below the postgres max_connections (one connection per query in tests)
+MAX_CONNECTIONS = 50
+
+
+class TestHeroConcurrency(AsyncTestCase):
+    """Stress the shared (cached) model managers with concurrent coroutines."""
+
+    async def test_concurrent_save_and_get(self):
+        semaphore = asyncio.Semaphore(MAX_CONNECTIONS)
+
+        async def save(index: int) -> Hero:
+            async with semaphore:
+                return await Hero(
+                    name=f"Hero {index}", secret_name=f"Secret {index}", age=index
+                ).save()
+
+        async def get(index: int) -> tuple[int, Hero | None]:
+            async with semaphore:
+                return index, await Hero.get(name=f"Hero {index}")
+
+        start = time.perf_counter()
+        saved = await asyncio.gather(*[save(i) for i in range(CONCURRENT_CALLS)])
+        fetched = await asyncio.gather(*[get(i) for i in range(CONCURRENT_CALLS)])
+        logger.info(
+            "%s concurrent save/get done in %.2fs",
+            CONCURRENT_CALLS,
+            time.perf_counter() - start,
+        )
+
+        assert len({hero.id for hero in saved}) == CONCURRENT_CALLS
+        for index, hero in enumerate(saved):
+            assert hero.name == f"Hero {index}"
+        # every coroutine got its own row back, no session cross-talk
+        for index, hero in fetched:
+            assert hero is not None
+            assert hero.secret_name == f"Secret {index}"
+            assert hero.age == index
+        assert await Hero.count() == CONCURRENT_CALLS
+
+    async def test_managers_are_stateless(self):
+        await Hero.first()
+        manager = Hero.objects()
+        assert not hasattr(manager.db_service, "_current_session")
+        assert not hasattr(manager.db_service, "engine")
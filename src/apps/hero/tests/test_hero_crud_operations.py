@@ -24,6 +24,21 @@ class TestHeroCRUD(AsyncTestCase):
         assert HTTPStatus.OK == response.status_code
         assert len(response.json()) >= 1
 
+    async def test_get_heroes_page(self, app):
+        response = await self.client.get(
+            app.url_path_for("hero-list-cursor"), params={"limit": 1}
+        )
+        assert HTTPStatus.OK == response.status_code
+        page = response.json()
+        assert len(page["items"]) == 1
+
+        response = await self.client.get(
+            app.url_path_for("hero-list-cursor"),
+            params={"limit": 1, "after": page["next_page"]},
+        )
+        assert HTTPStatus.OK == response.status_code
+        assert response.json()["items"][0]["id"] > page["items"][0]["id"]
+
     async def test_get_hero(self, app):
         response = await self.client.get(app.url_path_for("hero-get", pk=1))
         assert HTTPStatus.OK == response.status_code
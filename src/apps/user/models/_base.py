@@ -12,6 +12,8 @@ from core.db.models import AuthUser
 
 
 class UserBase(SQLTable):
+    __upsert_conflict_target__ = ("username",)
+
     username: str = Field(unique=True, index=True)
     first_name: str
     last_name: str
@@ -1,5 +1,3 @@
-import re
-from importlib import import_module
 from typing import TYPE_CHECKING, Any, Iterable, Sequence
 
 from sqlmodel import Relationship
@@ -9,8 +7,12 @@ from apps.authorization.models import (
     Permission,
     PermissionUserLink,
 )
-from core.auth.hashers import PasswordHasher
-from settings import settings
+from core.auth.hashers import (
+    HashedPassword,
+    PasswordHasher,
+    get_async_hasher,
+    get_hasher_registry,
+)
 
 from ._base import UserBaseModel
 
@@ -23,11 +25,11 @@ class User(UserBaseModel, table=True):
     __tablename__ = "users"
 
     permissions: list[Permission] = Relationship(
-        sa_relationship_kwargs={"lazy": "joined"}, link_model=PermissionUserLink
+        sa_relationship_kwargs={"lazy": "selectin"}, link_model=PermissionUserLink
     )
     groups: list["Group"] = Relationship(
         back_populates="users",
-        sa_relationship_kwargs={"lazy": "joined"},
+        sa_relationship_kwargs={"lazy": "selectin"},
         link_model=GroupUserLink,
     )
 
@@ -55,11 +57,9 @@ class User(UserBaseModel, table=True):
         return f"{self.first_name} {self.last_name}"
 
     @property
-    def _password_hasher(self) -> PasswordHasher:
-        pattern = r"^(?P<pkg>.+)\.(?P<hasher_class>\w+)$"
-        pkg, hasher_class_name = re.search(pattern, settings.password_hasher).groups()
-        hasher_pkg = import_module(pkg)
-        return getattr(hasher_pkg, hasher_class_name)
+    def _password_hasher(self) -> type[PasswordHasher]:
+        """Hasher of the stored password."""
+        return get_hasher_registry().hasher_for(self.password)
 
     def set_password(self, password_plain: str):
         self.password = password_plain
@@ -67,11 +67,45 @@ class User(UserBaseModel, table=True):
 
     def _hash_password(self, force=False):
         if self.id is None or force:
-            self.password = self._password_hasher.hash(self.password)
+            if isinstance(self.password, HashedPassword):
+                # already hashed, see with_hashed_password
+                self.password = str(self.password)
+            else:
+                self.password = get_hasher_registry().default.hash(self.password)
 
     def check_password(self, password_plain: str):
         return self._password_hasher.verify(password_plain, self.password)
 
+    @property
+    def password_needs_rehash(self) -> bool:
+        """Whether the password was hashed by another hasher than the default one, or with another cost."""
+        return get_hasher_registry().needs_rehash(self.password)
+
+    @classmethod
+    async def make_password(cls, password_plain: str) -> str:
+        """Hash the password in the hashers thread pool, out of the event loop."""
+        hasher = get_async_hasher(get_hasher_registry().default)
+        return await hasher.hash(password_plain)
+
+    @classmethod
+    async def with_hashed_password(cls, data: dict[str, Any]) -> dict[str, Any]:
+        """Hash the password of the user data without blocking the event loop.
+
+        To use before `User(**data)` or `update_from_dict(data)`, which keep the
+        HashedPassword as is.
+        """
+        if data.get("password"):
+            hashed = await cls.make_password(data["password"])
+            return {**data, "password": HashedPassword(hashed)}
+        return data
+
+    async def aset_password(self, password_plain: str):
+        self.password = await self.make_password(password_plain)
+
+    async def acheck_password(self, password_plain: str) -> bool:
+        hasher = get_async_hasher(self._password_hasher)
+        return await hasher.verify(password_plain, self.password)
+
     def _intersection_groups(self, groups: list["Group"]) -> list["Group"]:
         groups_belong_to = []
         user_groups = self.groups
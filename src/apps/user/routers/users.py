@@ -9,6 +9,8 @@ from apps.authorization.models import Permission
 from apps.user.models import User
 from apps.user.models.schema.create import UserCreate
 from apps.user.models.schema.patch import UserPatch
+from core.db.dependencies import KeysetParamsDep
+from core.db.query.pagination import KeysetPage
 
 routers = APIRouter()
 perms = {
@@ -27,6 +29,16 @@ async def get_users(offset: int = 0, limit=100):
     return await User.all(offset=offset, limit=limit)
 
 
+@routers.get(
+    "/cursor/",
+    name="user-list-cursor",
+    description="Get users page by page (keyset pagination)",
+    status_code=HTTPStatus.OK,
+)
+async def get_users_page(pagination: KeysetParamsDep) -> KeysetPage[User]:
+    return await pagination.paginate(User)
+
+
 @routers.get(
     "/{pk}/", name="user-get", description="Get single user", status_code=HTTPStatus.OK
 )
@@ -63,7 +75,7 @@ async def update_user(
 
     user.check_all_required_fields_updated(stored_user.model_dump())
 
-    stored_user.update_from_dict(user.model_dump())
+    stored_user.update_from_dict(await User.with_hashed_password(user.model_dump()))
     return await stored_user.save()
 
 
@@ -96,7 +108,8 @@ async def patch_user(pk: int, user: UserPatch, auth_user: User = Depends(current
         detail = "Cannot use PATCH to update entire object, use PUT instead."
         raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=detail)
 
-    stored_user.update_from_dict(user.model_dump(exclude_unset=True))
+    data = await User.with_hashed_password(user.model_dump(exclude_unset=True))
+    stored_user.update_from_dict(data)
     return await stored_user.save()
 
 
@@ -107,7 +120,8 @@ async def patch_user(pk: int, user: UserPatch, auth_user: User = Depends(current
     status_code=HTTPStatus.CREATED,
 )
 async def post_user(user: UserCreate):
-    return await User(**user.model_dump(exclude_unset=True)).save()
+    data = await User.with_hashed_password(user.model_dump(exclude_unset=True))
+    return await User(**data).save()
 
 
 @routers.delete(
@@ -1,9 +1,8 @@
-import asyncio
-
 from apps.user.models import User
+from core.db.dependencies.session import asyncio_run
 from core.services.celery import celery_app
 
 
 @celery_app.task()
 def create_user_task(**user_data):
-    return asyncio.run(User(**user_data).save())
+    return asyncio_run(User(**user_data).save())
@@ -6,8 +6,7 @@ from starlette.authentication import (
 )
 from starlette.requests import HTTPConnection
 
-from apps.authentication.dependencies.oauth2 import current_session_user
-from apps.authentication.models import JWTToken
+from core.auth.identity import get_identity
 from settings import settings
 
 
@@ -15,11 +14,16 @@ class AuthBackend(AuthenticationBackend):
     async def authenticate(
         self, conn: HTTPConnection
     ) -> tuple[AuthCredentials, BaseUser] | None:
-        user = await current_session_user(conn)
+        if conn.scope["path"].startswith(settings.STATIC_URL):
+            # static files are public, don't load the user
+            return None
+
+        identity = get_identity(conn)
+        user = await identity.session_user(conn)
         if user is None:
             oauth2 = OAuth2PasswordBearer(tokenUrl=settings.AUTH_URL, auto_error=False)
             if (token := await oauth2(conn)) is not None:
-                jwt_token = await JWTToken.get(access_token=token)
+                jwt_token = await identity.token(token)
                 if jwt_token is not None:
                     user = jwt_token.user
 
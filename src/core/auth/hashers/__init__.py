@@ -1,7 +1,17 @@
 from .bcrypt import BCryptPasswordHasher
-from .hasher_proto import PasswordHasher
+from .hasher_proto import AsyncPasswordHasher, HashedPassword, PasswordHasher
+from .pool import PooledPasswordHasher, get_async_hasher
+from .registry import HasherRegistry, get_hasher_registry
+from .scrypt import ScryptPasswordHasher
 
 __all__ = [
+    "AsyncPasswordHasher",
     "BCryptPasswordHasher",
+    "HashedPassword",
+    "HasherRegistry",
     "PasswordHasher",
+    "PooledPasswordHasher",
+    "ScryptPasswordHasher",
+    "get_async_hasher",
+    "get_hasher_registry",
 ]
@@ -0,0 +1,53 @@
+from functools import lru_cache
+
+from argon2 import PasswordHasher as Argon2Hasher
+from argon2 import Type
+from argon2.exceptions import InvalidHashError, VerificationError
+
+from settings import settings
+
+_PREFIX = "$argon2id$"
+
+
+@lru_cache
+def _hasher(time_cost: int, memory_cost: int, parallelism: int) -> Argon2Hasher:
+    return Argon2Hasher(
+        time_cost=time_cost,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+        type=Type.ID,
+    )
+
+
+def _current_hasher() -> Argon2Hasher:
+    return _hasher(
+        settings.argon2_time_cost,
+        settings.argon2_memory_cost,
+        settings.argon2_parallelism,
+    )
+
+
+class Argon2PasswordHasher:
+    """argon2id, requires the argon2-cffi package."""
+
+    @classmethod
+    def hash(cls, password: str) -> str:
+        return _current_hasher().hash(password)
+
+    @classmethod
+    def verify(cls, plain_password: str, hashed_password: str) -> bool:
+        try:
+            return _current_hasher().verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    @classmethod
+    def identify(cls, hashed_password: str) -> bool:
+        return hashed_password.startswith(_PREFIX)
+
+    @classmethod
+    def needs_rehash(cls, hashed_password: str) -> bool:
+        try:
+            return _current_hasher().check_needs_rehash(hashed_password)
+        except InvalidHashError:
+            return False
@@ -1,14 +1,33 @@
+import re
+
 import bcrypt
 
+from settings import settings
+
+_BCRYPT_HASH = re.compile(r"^\$2[aby]\$(?P<rounds>\d{2})\$[./A-Za-z0-9]{53}$")
+
 
 class BCryptPasswordHasher:
     @classmethod
     def hash(cls, password: str) -> str:
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
         pwd_bytes = password.encode("utf-8")
         return bcrypt.hashpw(password=pwd_bytes, salt=salt).decode("utf-8")
 
     @classmethod
     def verify(cls, plain_password: str, hashed_password: str) -> bool:
         password_byte_enc = plain_password.encode("utf-8")
-        return bcrypt.checkpw(password_byte_enc, hashed_password.encode("utf-8"))
+        try:
+            return bcrypt.checkpw(password_byte_enc, hashed_password.encode("utf-8"))
+        except ValueError:
+            # malformed hash
+            return False
+
+    @classmethod
+    def identify(cls, hashed_password: str) -> bool:
+        return _BCRYPT_HASH.match(hashed_password) is not None
+
+    @classmethod
+    def needs_rehash(cls, hashed_password: str) -> bool:
+        match = _BCRYPT_HASH.match(hashed_password)
+        return match is not None and int(match["rounds"]) != settings.bcrypt_rounds
@@ -1,6 +1,13 @@
 from typing import Protocol
 
 
+class HashedPassword(str):
+    """A password already hashed, kept as is by the User model (see with_hashed_password).
+
+    Explicit: a plain password is never taken for a hash because of its format.
+    """
+
+
 class PasswordHasher(Protocol):
     @classmethod
     def hash(cls, password_plain: str) -> str:
@@ -8,4 +15,23 @@ class PasswordHasher(Protocol):
 
     @classmethod
     def verify(cls, password_plain: str, hashed_password: str) -> bool:
-        """Define this method in the concrete hash class."""
+        """Define this method in the concrete hash class, False for a malformed hash."""
+
+    @classmethod
+    def identify(cls, hashed_password: str) -> bool:
+        """Whether the value is a hash made by this hasher."""
+
+    @classmethod
+    def needs_rehash(cls, hashed_password: str) -> bool:
+        """Whether the hash was made with other parameters (cost) than the current ones.
+
+        False for a malformed hash.
+        """
+
+
+class AsyncPasswordHasher(Protocol):
+    """Password hasher which does not block the event loop, see PooledPasswordHasher."""
+
+    async def hash(self, password_plain: str) -> str: ...
+
+    async def verify(self, password_plain: str, hashed_password: str) -> bool: ...
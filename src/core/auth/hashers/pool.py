@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, TypeVar
+
+from core.auth.hashers.hasher_proto import PasswordHasher
+from core.monitoring.metrics import PASSWORD_HASHER_QUEUE, PASSWORD_HASHER_SECONDS
+from settings import settings
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_hasher_executor() -> ThreadPoolExecutor:
+    """Thread pool of the password hashers, shared by the event loops of the process.
+
+    bcrypt releases the GIL: `password_hasher_workers` hashes run in parallel at most,
+    the others wait in the pool queue (see the password_hasher_queue_depth metric).
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.password_hasher_workers,
+                thread_name_prefix="password-hasher",
+            )
+        return _executor
+
+
+def shutdown_hasher_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+class _Queued:
+    """Count a job in the queue depth metric until it starts (or is cancelled)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queued = True
+        PASSWORD_HASHER_QUEUE.inc()
+
+    def leave(self):
+        with self._lock:
+            if self._queued:
+                self._queued = False
+                PASSWORD_HASHER_QUEUE.dec()
+
+
+async def run_in_hasher_pool(operation: str, fn: Callable[..., T], *args) -> T:
+    queued = _Queued()
+
+    def job() -> T:
+        queued.leave()
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            duration = time.perf_counter() - start
+            PASSWORD_HASHER_SECONDS.labels(operation=operation).observe(duration)
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_hasher_executor(), job)
+    finally:
+        queued.leave()
+
+
+class PooledPasswordHasher:
+    """AsyncPasswordHasher running a (blocking) PasswordHasher in the hashers thread pool.
+
+    example:
+     > hasher = get_async_hasher(BCryptPasswordHasher)
+     > hashed = await hasher.hash("secret")
+     > await hasher.verify("secret", hashed)
+    """
+
+    def __init__(self, hasher: type[PasswordHasher]):
+        self.hasher = hasher
+
+    async def hash(self, password_plain: str) -> str:
+        return await run_in_hasher_pool("hash", self.hasher.hash, password_plain)
+
+    async def verify(self, password_plain: str, hashed_password: str) -> bool:
+        return await run_in_hasher_pool(
+            "verify", self.hasher.verify, password_plain, hashed_password
+        )
+
+
+@lru_cache
+def get_async_hasher(hasher: type[PasswordHasher]) -> PooledPasswordHasher:
+    return PooledPasswordHasher(hasher)
@@ -0,0 +1,65 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib import import_module
+
+from core.auth.hashers.hasher_proto import PasswordHasher
+from core.monitoring.logger import get_logger
+from settings import settings
+
+logger = get_logger(__name__)
+
+
+def load_hasher(path: str) -> type[PasswordHasher]:
+    pattern = r"^(?P<pkg>.+)\.(?P<hasher_class>\w+)$"
+    pkg, hasher_class_name = re.search(pattern, path).groups()
+    return getattr(import_module(pkg), hasher_class_name)
+
+
+@dataclass(frozen=True)
+class HasherRegistry:
+    """Hashers of the stored passwords, new passwords are hashed with the default one."""
+
+    default: type[PasswordHasher]
+    hashers: tuple[type[PasswordHasher], ...]
+
+    def identify(self, hashed_password: str) -> type[PasswordHasher] | None:
+        for hasher in self.hashers:
+            if hasher.identify(hashed_password):
+                return hasher
+        return None
+
+    def hasher_for(self, hashed_password: str) -> type[PasswordHasher]:
+        """Hasher which made the hash, the default one when unknown."""
+        return self.identify(hashed_password) or self.default
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Whether the hash was not made by the default hasher with its current cost."""
+        hasher = self.identify(hashed_password)
+        return hasher is not self.default or hasher.needs_rehash(hashed_password)
+
+
+@lru_cache
+def get_hasher_registry() -> HasherRegistry:
+    """Resolve the hashers of settings.password_hashers once per process.
+
+    A hasher whose dependency is missing (e.g. argon2-cffi) is skipped, unless
+    it is the default one: resolved at startup (see core.lifespan), the application
+    does not start without it.
+    """
+    try:
+        default = load_hasher(settings.password_hasher)
+    except ImportError as e:
+        raise RuntimeError(
+            f"Default password hasher {settings.password_hasher} not available: {e}"
+            " (e.g. install the argon2 extra)."
+        ) from e
+    hashers = [default]
+    for path in settings.password_hashers:
+        if path == settings.password_hasher:
+            continue
+        try:
+            hashers.append(load_hasher(path))
+        except ImportError as e:
+            logger.warning("Password hasher %s not available: %s", path, e)
+    return HasherRegistry(default=default, hashers=tuple(hashers))
@@ -0,0 +1,75 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import secrets
+
+from settings import settings
+
+_ALGORITHM = "scrypt"
+_KEY_LENGTH = 64
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode("utf-8"),
+        salt=salt,
+        n=n,
+        r=r,
+        p=p,
+        maxmem=256 * n * r * p,
+        dklen=_KEY_LENGTH,
+    )
+
+
+def _b64(value: bytes) -> str:
+    return base64.b64encode(value).decode("ascii")
+
+
+def _parse(hashed_password: str) -> tuple[int, int, int, bytes, bytes] | None:
+    """(n, r, p, salt, key) of the hash, None when malformed."""
+    parts = hashed_password.split("$")
+    if len(parts) != 6 or parts[0] != _ALGORITHM:
+        return None
+    try:
+        n, r, p = (int(part) for part in parts[1:4])
+        salt, key = (base64.b64decode(part, validate=True) for part in parts[4:])
+    except (ValueError, binascii.Error):
+        return None
+    return n, r, p, salt, key
+
+
+class ScryptPasswordHasher:
+    """scrypt of the standard library, hashes format: scrypt$n$r$p$salt$key (base64)."""
+
+    @classmethod
+    def hash(cls, password: str) -> str:
+        n, r, p = settings.scrypt_n, settings.scrypt_r, settings.scrypt_p
+        salt = secrets.token_bytes(16)
+        key = _scrypt(password, salt, n, r, p)
+        return f"{_ALGORITHM}${n}${r}${p}${_b64(salt)}${_b64(key)}"
+
+    @classmethod
+    def verify(cls, plain_password: str, hashed_password: str) -> bool:
+        if (parsed := _parse(hashed_password)) is None:
+            return False
+
+        n, r, p, salt, expected = parsed
+        try:
+            actual = _scrypt(plain_password, salt, n, r, p)
+        except ValueError:
+            # invalid parameters (e.g. n not a power of 2)
+            return False
+        return hmac.compare_digest(actual, expected)
+
+    @classmethod
+    def identify(cls, hashed_password: str) -> bool:
+        return _parse(hashed_password) is not None
+
+    @classmethod
+    def needs_rehash(cls, hashed_password: str) -> bool:
+        if (parsed := _parse(hashed_password)) is None:
+            return False
+
+        current = (settings.scrypt_n, settings.scrypt_r, settings.scrypt_p)
+        return parsed[:3] != current
@@ -0,0 +1,93 @@
+from starlette.requests import HTTPConnection
+
+from apps.authentication.models import JWTToken
+from apps.authentication.services import get_token, get_user
+from apps.user.models import User
+from core.monitoring.metrics import IDENTITY_LOOKUPS
+from settings import settings
+
+_UNSET = object()
+
+
+class Identity:
+    """Authenticated user of a request, resolved once and shared by its dependencies.
+
+    AuthBackend, current_user, current_session_user and oauth2_scheme read it with
+    `get_identity(request)` instead of looking up the user or the token each time.
+    """
+
+    def __init__(self):
+        self._session_user = _UNSET
+        self._tokens: dict[str, JWTToken | None] = {}
+        self._permissions: frozenset[str] | None = None
+        self._groups: frozenset[str] | None = None
+
+    async def session_user(self, conn: HTTPConnection) -> User | None:
+        """User saved in the session (see auth_utils.session_save_user)."""
+        if self._session_user is _UNSET:
+            session = conn.session if "session" in conn.scope else {}
+            data = session.get(settings.session_user_key, None)
+            if data is None:
+                self._session_user = None
+            else:
+                IDENTITY_LOOKUPS.labels(source="session").inc()
+                self._session_user = await self._load_session_user(data["username"])
+                self._permissions = self._groups = None
+        return self._session_user
+
+    @staticmethod
+    async def _load_session_user(username: str) -> User | None:
+        if settings.token_cache_enabled:
+            # the users cache of the stateless tokens, see token_cache.get_user
+            return await get_user(username, ttl=settings.token_cache_ttl)
+        return await User.get(username=username)
+
+    async def token(self, access_token: str) -> JWTToken | None:
+        if access_token not in self._tokens:
+            IDENTITY_LOOKUPS.labels(source="token").inc()
+            self._tokens[access_token] = await get_token(access_token)
+            self._permissions = self._groups = None
+        return self._tokens[access_token]
+
+    @property
+    def user(self) -> User | None:
+        """The session user, or the user of the (first) resolved token."""
+        if self._session_user is not _UNSET and self._session_user is not None:
+            return self._session_user
+
+        for token in self._tokens.values():
+            if token is not None and token.user is not None:
+                return token.user
+        return None
+
+    @property
+    def permissions(self) -> frozenset[str]:
+        """Names of the user permissions, given directly or through its groups."""
+        if self._permissions is None:
+            user = self.user
+            if user is None:
+                return frozenset()
+
+            self._permissions = frozenset(
+                [perm.name for perm in user.permissions]
+                + [perm.name for group in user.groups for perm in group.permissions]
+            )
+        return self._permissions
+
+    @property
+    def groups(self) -> frozenset[str]:
+        if self._groups is None:
+            user = self.user
+            if user is None:
+                return frozenset()
+
+            self._groups = frozenset(group.name for group in user.groups)
+        return self._groups
+
+
+def get_identity(conn: HTTPConnection) -> Identity:
+    """Identity of the request (or websocket), stored in its ASGI scope."""
+    identity = conn.scope.get("identity")
+    if identity is None:
+        identity = conn.scope["identity"] = Identity()
+    return identity
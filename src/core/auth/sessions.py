@@ -0,0 +1,104 @@
+import asyncio
+import json
+import secrets
+from typing import Any
+
+from redis.exceptions import RedisError
+
+from core.cache import get_redis, redis_key
+from core.monitoring.logger import get_logger
+from settings import settings
+
+logger = get_logger(__name__)
+
+_PREFIX = "session"
+# Revocations in progress (strong references, see asyncio.create_task).
+_revocations: set[asyncio.Task] = set()
+
+
+def new_session_id() -> str:
+    return secrets.token_urlsafe(32)
+
+
+def _key(session_id: str) -> str:
+    return redis_key(f"{_PREFIX}:{session_id}")
+
+
+def _user_key(user_id: int) -> str:
+    """Set of the session ids of a user, see revoke_user_sessions."""
+    return redis_key(f"{_PREFIX}:user:{user_id}")
+
+
+def session_user_id(data: dict[str, Any]) -> int | None:
+    user = data.get(settings.session_user_key) or {}
+    return user.get("id")
+
+
+async def load_session(session_id: str) -> dict[str, Any] | None:
+    """Payload of the session, its expiration is pushed back (sliding expiration)."""
+    try:
+        raw = await get_redis().getex(_key(session_id), ex=settings.max_age)
+    except (RedisError, OSError) as e:
+        logger.warning("Session store: redis get failed: %s", e)
+        return None
+    return json.loads(raw) if raw is not None else None
+
+
+async def save_session(session_id: str, data: dict[str, Any]):
+    redis = get_redis()
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.set(_key(session_id), json.dumps(data), ex=settings.max_age)
+            if (user_id := session_user_id(data)) is not None:
+                pipe.sadd(_user_key(user_id), session_id)
+                pipe.expire(_user_key(user_id), settings.max_age)
+            await pipe.execute()
+    except (RedisError, OSError) as e:
+        logger.warning("Session store: redis set failed: %s", e)
+
+
+async def touch_user_sessions(user_id: int):
+    """Keep the sessions index of the user as long as its (slided) sessions."""
+    try:
+        await get_redis().expire(_user_key(user_id), settings.max_age)
+    except (RedisError, OSError) as e:
+        logger.warning("Session store: redis expire failed: %s", e)
+
+
+async def delete_session(session_id: str, user_id: int | None = None):
+    redis = get_redis()
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.delete(_key(session_id))
+            if user_id is not None:
+                pipe.srem(_user_key(user_id), session_id)
+            await pipe.execute()
+    except (RedisError, OSError) as e:
+        logger.warning("Session store: redis delete failed: %s", e)
+
+
+async def revoke_user_sessions(user_id: int):
+    """Log the user out of all its sessions, on every worker at once."""
+    redis = get_redis()
+    if redis is None:
+        return
+
+    user_key = _user_key(user_id)
+    try:
+        session_ids = await redis.smembers(user_key)
+        keys = [_key(sid.decode()) for sid in session_ids]
+        await redis.delete(user_key, *keys)
+    except (RedisError, OSError) as e:
+        logger.warning("Session store: redis revoke failed: %s", e)
+
+
+def revoke_user_sessions_soon(user_id: int):
+    """revoke_user_sessions from sync code (e.g. database events)."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+
+    task = loop.create_task(revoke_user_sessions(user_id))
+    _revocations.add(task)
+    task.add_done_callback(_revocations.discard)
@@ -14,9 +14,14 @@ def generate_jwt_token(token_data: JWTPayload) -> str:
     return jwt.encode(_token_data, settings.secret_key, algorithm=settings.algorithm)
 
 
-def decode_jwt_token(access_token: str) -> JWTPayload:
+def decode_jwt_token(access_token: str, *, verify_exp: bool = True) -> JWTPayload:
     return JWTPayload(
-        **jwt.decode(access_token, settings.secret_key, algorithms=[settings.algorithm])
+        **jwt.decode(
+            access_token,
+            settings.secret_key,
+            algorithms=[settings.algorithm],
+            options={"verify_exp": verify_exp},
+        )
     )
 
 
@@ -35,6 +40,7 @@ def get_token_expire_datetime(created_at: datetime.datetime | None = None):
 def session_save_user(request: Request, user: User):
     """Save user info into the session."""
     request.session[settings.session_user_key] = {
+        "id": user.id,
         "name": user.full_name,
         "username": user.username,
     }
@@ -0,0 +1,12 @@
+from .memory import TTLCache
+from .redis import close_redis, get_redis, redis_key
+from .tiered import TieredCache, stop_listeners
+
+__all__ = [
+    "close_redis",
+    "get_redis",
+    "redis_key",
+    "stop_listeners",
+    "TieredCache",
+    "TTLCache",
+]
@@ -0,0 +1,63 @@
+import asyncio
+import weakref
+
+from redis import asyncio as aioredis
+
+# Like the database engines, redis connections are bound to the loop that opened them.
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def cache_url() -> str:
+    """Redis url of the shared cache, the celery broker one by default."""
+    from settings import settings
+
+    return settings.cache_url or settings.celery_broker
+
+
+def redis_key(key: str) -> str:
+    """Key (or channel) of the application in the shared redis, see settings.cache_key_prefix."""
+    from settings import settings
+
+    return f"{settings.cache_key_prefix}{key}"
+
+
+def get_redis() -> aioredis.Redis | None:
+    """Return the redis client of the current event loop, None when no cache is configured."""
+    from settings import settings
+
+    url = cache_url()
+    if not url:
+        return None
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = aioredis.from_url(
+            url,
+            socket_timeout=settings.cache_socket_timeout,
+            socket_connect_timeout=settings.cache_socket_timeout,
+        )
+    return client
+
+
+def new_pubsub_client() -> aioredis.Redis | None:
+    """A dedicated redis client for pub/sub: subscribers block on reads, no read timeout."""
+    from settings import settings
+
+    url = cache_url()
+    if not url:
+        return None
+    return aioredis.from_url(url, socket_connect_timeout=settings.cache_socket_timeout)
+
+
+async def close_redis():
+    """Close the redis client of the running event loop."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,169 @@
+import asyncio
+import json
+import weakref
+from typing import Any
+
+from redis.exceptions import RedisError
+
+from core.cache.memory import TTLCache
+from core.cache.redis import get_redis, new_pubsub_client, redis_key
+from core.monitoring.logger import get_logger
+
+logger = get_logger(__name__)
+# Deletions in progress (strong references, see asyncio.create_task).
+_deletions: set[asyncio.Task] = set()
+# Subscribers to the deletions of the other workers (see TieredCache.broadcast_deletions).
+_listeners: set[asyncio.Task] = set()
+_RETRY_DELAY = 1.0  # seconds
+
+
+class TieredCache:
+    """Two tiers cache of JSON values: a bounded in-process LRU in front of redis.
+
+    The redis tier is shared by the workers and outlives their restarts. Entries are
+    kept at most `local_ttl` seconds in process, so a deletion made by another worker
+    is seen after `local_ttl` seconds at worst.
+    Redis is optional: when it is not configured or unavailable, only the in-process tier is used.
+    With broadcast_deletions, deletions are also published (redis pub/sub) and dropped
+    at once from the in-process tier of the other workers.
+
+    example:
+     > cache = TieredCache("auth:token", maxsize=1000, local_ttl=30)
+     > await cache.set("key", {"id": 1}, ttl=300)
+     > await cache.get("key")
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        maxsize: int = 1024,
+        local_ttl: float = 30,
+        broadcast_deletions: bool = False,
+    ):
+        self.namespace = namespace
+        self.local_ttl = local_ttl
+        self.local = TTLCache(maxsize)
+        self.broadcast_deletions = broadcast_deletions
+        self._listeners: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Task
+        ] = weakref.WeakKeyDictionary()
+
+    def _redis_key(self, key: str) -> str:
+        return redis_key(f"{self.namespace}:{key}")
+
+    @property
+    def _channel(self) -> str:
+        return redis_key(f"{self.namespace}:deleted")
+
+    async def get(self, key: str) -> Any | None:
+        self._listen()
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        if (redis := get_redis()) is None:
+            return None
+
+        redis_key = self._redis_key(key)
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                raw, ttl = await pipe.get(redis_key).ttl(redis_key).execute()
+        except (RedisError, OSError) as e:
+            logger.warning("Cache %s: redis get failed: %s", self.namespace, e)
+            return None
+
+        if raw is None:
+            return None
+
+        value = json.loads(raw)
+        if ttl > 0:
+            self.local.set(key, value, min(ttl, self.local_ttl))
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float):
+        ttl = int(ttl)
+        if ttl <= 0:
+            return
+
+        self._listen()
+        self.local.set(key, value, min(ttl, self.local_ttl))
+        if (redis := get_redis()) is None:
+            return
+
+        try:
+            await redis.set(self._redis_key(key), json.dumps(value), ex=ttl)
+        except (RedisError, OSError) as e:
+            logger.warning("Cache %s: redis set failed: %s", self.namespace, e)
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self.local.delete(key)
+
+        if not keys or (redis := get_redis()) is None:
+            return
+
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.delete(*[self._redis_key(key) for key in keys])
+                if self.broadcast_deletions:
+                    pipe.publish(self._channel, json.dumps(list(keys)))
+                await pipe.execute()
+        except (RedisError, OSError) as e:
+            logger.warning("Cache %s: redis delete failed: %s", self.namespace, e)
+
+    def delete_soon(self, *keys: str):
+        """Delete from sync code (e.g. database events): the in-process tier immediately,
+        redis in a background task of the running event loop.
+        """
+        for key in keys:
+            self.local.delete(key)
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        task = loop.create_task(self.delete(*keys))
+        _deletions.add(task)
+        task.add_done_callback(_deletions.discard)
+
+    def clear_local(self):
+        self.local.clear()
+
+    def _listen(self):
+        """Subscribe (once per event loop) to the deletions of the other workers."""
+        if not self.broadcast_deletions or get_redis() is None:
+            return
+
+        loop = asyncio.get_running_loop()
+        task = self._listeners.get(loop)
+        if task is None or task.done():
+            task = self._listeners[loop] = loop.create_task(self._drop_deleted())
+            _listeners.add(task)
+            task.add_done_callback(_listeners.discard)
+
+    async def _drop_deleted(self):
+        while (client := new_pubsub_client()) is not None:
+            try:
+                async with client, client.pubsub() as pubsub:
+                    await pubsub.subscribe(self._channel)
+                    # deletions may have been missed while not subscribed
+                    self.local.clear()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            for key in json.loads(message["data"]):
+                                self.local.delete(key)
+            except (RedisError, OSError) as e:
+                logger.warning(
+                    "Cache %s: redis subscription lost: %s", self.namespace, e
+                )
+                await asyncio.sleep(_RETRY_DELAY)
+
+
+async def stop_listeners():
+    """Stop the subscriptions to the deletions of the other workers (shutdown)."""
+    tasks = list(_listeners)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
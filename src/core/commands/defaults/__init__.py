@@ -1,3 +1,6 @@
+from .benchmark_chat import app as benchmark_chat_command
+from .benchmark_login import app as benchmark_login_command
+from .benchmark_statements import app as benchmark_statements_command
 from .collect_statics import app as collect_statics_command
 from .fixtures import app as fixture_command
 from .health_check import app as health_check_command
@@ -10,4 +13,7 @@ __all__ = [
     "fixture_command",
     "health_check_command",
     "collect_statics_command",
+    "benchmark_login_command",
+    "benchmark_chat_command",
+    "benchmark_statements_command",
 ]
@@ -0,0 +1,82 @@
+import asyncio
+import json
+import time
+from contextlib import AsyncExitStack
+from typing import Annotated
+
+import typer
+from broadcaster import Broadcast
+
+from apps.chat.services.frames import get_frame_encoder
+from apps.chat.services.hub import RoomHub
+from core.monitoring.logger import get_logger
+
+_logger = get_logger(__file__)
+app = typer.Typer(rich_markup_mode="rich")
+
+_MESSAGE = {
+    "id": 1,
+    "content": "Hello, this is a chat message of a usual size.",
+    "room_id": 1,
+    "author_id": 1,
+    "created_at": "2026-01-01T00:00:00",
+    "updated_at": None,
+}
+
+
+async def _run(sockets: int, messages: int, encoder: str, per_socket: bool) -> float:
+    """Messages/s delivered to the sockets of a room, through an in-memory broadcaster."""
+    encode = get_frame_encoder(encoder)
+    broadcaster = Broadcast("memory://")
+    await broadcaster.connect()
+    # no frame dropped by the send queues
+    hub = RoomHub(broadcaster, queue_size=messages)
+    delivered = 0
+
+    async def socket(frames):
+        nonlocal delivered
+        async for frame in frames:
+            # the previous websocket.send_json(message): encoded again per socket
+            _ = json.dumps(frame) if per_socket else frame
+            delivered += 1
+            if delivered == sockets * messages:
+                return
+
+    async with AsyncExitStack() as stack:
+        streams = [
+            await stack.enter_async_context(hub.subscribe("benchmark"))
+            for _ in range(sockets)
+        ]
+        consumers = [asyncio.create_task(socket(stream)) for stream in streams]
+        start = time.perf_counter()
+        for _ in range(messages):
+            await broadcaster.publish(channel="benchmark", message=encode(_MESSAGE))
+        await asyncio.wait(consumers, return_when=asyncio.FIRST_COMPLETED)
+        duration = time.perf_counter() - start
+        for consumer in consumers:
+            consumer.cancel()
+
+    await hub.close()
+    await broadcaster.disconnect()
+    return sockets * messages / duration
+
+
+@app.command(
+    name="benchmark-chat",
+    help="Measure the chat messages delivered per second to the websockets of a room, with frames serialized once or per websocket.",
+)
+def benchmark_chat(
+    sockets: Annotated[
+        int, typer.Option("--sockets", "-s", help="Websockets in the room.")
+    ] = 1000,
+    messages: Annotated[
+        int, typer.Option("--messages", "-n", help="Messages published.")
+    ] = 100,
+    encoder: Annotated[
+        str, typer.Option("--encoder", "-e", help="json, orjson or msgspec.")
+    ] = "json",
+):
+    for per_socket in (True, False):
+        rate = asyncio.run(_run(sockets, messages, encoder, per_socket))
+        mode = "encoded per websocket" if per_socket else "serialized once"
+        _logger.info(f"{mode} ({encoder}): {rate:.0f} messages/s delivered")
@@ -0,0 +1,74 @@
+import asyncio
+import statistics
+import time
+from typing import Annotated
+
+import typer
+
+from core.auth.hashers import BCryptPasswordHasher, get_async_hasher
+from core.auth.hashers.pool import shutdown_hasher_executor
+from core.monitoring.logger import get_logger
+
+_logger = get_logger(__file__)
+app = typer.Typer(rich_markup_mode="rich")
+
+_TICK = 0.005  # seconds
+
+
+async def _measure_lag(stop: asyncio.Event, lags: list[float]):
+    """Delay of a periodic timer: the time the event loop was blocked by other tasks."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(_TICK)
+        lags.append(time.perf_counter() - start - _TICK)
+
+
+async def _run(logins: int, concurrency: int, pooled: bool) -> dict[str, float]:
+    hashed = BCryptPasswordHasher.hash("benchmark")
+    hasher = get_async_hasher(BCryptPasswordHasher)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            if pooled:
+                await hasher.verify("benchmark", hashed)
+            else:
+                BCryptPasswordHasher.verify("benchmark", hashed)
+            # the rest of the request (database, response)
+            await asyncio.sleep(0)
+
+    stop, lags = asyncio.Event(), []
+    monitor = asyncio.create_task(_measure_lag(stop, lags))
+    start = time.perf_counter()
+    await asyncio.gather(*[login() for _ in range(logins)])
+    duration = time.perf_counter() - start
+    stop.set()
+    await monitor
+
+    lags = sorted(lags) or [0.0]
+    return {
+        "logins/s": logins / duration,
+        "lag p50 (ms)": statistics.median(lags) * 1000,
+        "lag p99 (ms)": lags[min(len(lags) - 1, int(len(lags) * 0.99))] * 1000,
+        "lag max (ms)": lags[-1] * 1000,
+    }
+
+
+@app.command(
+    name="benchmark-login",
+    help="Compare the login (password verification) throughput and the event loop lag, with and without the hashers thread pool.",
+)
+def benchmark_login(
+    logins: Annotated[
+        int, typer.Option("--logins", "-n", help="Number of logins.")
+    ] = 50,
+    concurrency: Annotated[
+        int, typer.Option("--concurrency", "-c", help="Concurrent logins.")
+    ] = 10,
+):
+    for pooled in (False, True):
+        results = asyncio.run(_run(logins, concurrency, pooled))
+        mode = "thread pool" if pooled else "event loop"
+        summary = ", ".join(f"{name}: {value:.1f}" for name, value in results.items())
+        _logger.info(f"bcrypt verify in the {mode}: {summary}")
+    shutdown_hasher_executor()
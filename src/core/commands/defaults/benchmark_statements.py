@@ -0,0 +1,39 @@
+import timeit
+from typing import Annotated
+
+import typer
+from sqlmodel import select
+
+from apps.user.models import User
+from core.monitoring.logger import get_logger
+
+_logger = get_logger(__file__)
+app = typer.Typer(rich_markup_mode="rich")
+
+
+def _resolve():
+    return select(User).where(*User.resolve_filters(username="spider"))
+
+
+def _cached():
+    shape = User.filters_shape(username="spider")
+    return User.compiled_statement(shape), User.bind_filters(shape, username="spider")
+
+
+@app.command(
+    name="benchmark-statements",
+    help="Compare the per call python overhead of a `User.get(username=...)` statement, resolved each time or cached by filters shape.",
+)
+def benchmark_statements(
+    number: Annotated[
+        int, typer.Option("--number", "-n", help="Statements per repetition.")
+    ] = 2000,
+    repeat: Annotated[int, typer.Option("--repeat", "-r", help="Repetitions.")] = 5,
+):
+    resolve_time = min(timeit.repeat(_resolve, number=number, repeat=repeat))
+    cached_time = min(timeit.repeat(_cached, number=number, repeat=repeat))
+    _logger.info(
+        "statement per call: resolve_filters %.1fus, compiled_statement %.1fus",
+        resolve_time / number * 1e6,
+        cached_time / number * 1e6,
+    )
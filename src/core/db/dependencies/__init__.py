@@ -1,9 +1,14 @@
 from .db import DBService, DBServiceDep
-from .session import SessionDep, get_session
+from .pagination import KeysetParams, KeysetParamsDep
+from .session import SessionDep, detached_session, get_session, session_scope
 
 __all__ = [
     "DBService",
     "DBServiceDep",
+    "detached_session",
     "get_session",
+    "KeysetParams",
+    "KeysetParamsDep",
+    "session_scope",
     "SessionDep",
 ]
@@ -1,18 +1,23 @@
 import asyncio
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable
+from contextvars import ContextVar
 from functools import wraps
-from typing import Iterable
+from typing import Iterable, Sequence
 
 from fastapi import Depends
-from sqlalchemy import func
+from sqlalchemy import ColumnElement, Select, func, text, update
 from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.selectable import ForUpdateArg
 from sqlmodel import SQLModel, delete, select
 from typing_extensions import Annotated, Any, ParamSpec, TypeVar
 
-from core.db.dependencies.session import get_engine
+from core.db.dependencies.session import current_session, is_scoped, new_session
+from core.db.query.bulk import copy_records, group_rows, row_values, upsert_statement
 from core.db.query.exceptions import ObjectNotFoundError
+from core.db.query.loaders import LoadProfile
+from core.db.query.pagination import Keyset, KeysetPage
+from core.db.signals.managers import signal_manager
 
 P = ParamSpec("P")
 Fn = Callable[P, Any]
@@ -22,33 +27,75 @@ T = TypeVar("T", bound=SQLModel)
 def inject_session(func: Fn) -> Fn:
     @wraps(func)
     async def wrapper(*args, **kwargs) -> Any:
-        self_obj = args[0]
-        _engine = get_engine()
-        setattr(self_obj, "engine", _engine)
-        async with AsyncSession(_engine) as session:
+        session = kwargs.get("session")
+        if session is None:
+            # reuse the unit of work session (see session_scope), if any
+            session = current_session()
+        if session is not None:
+            kwargs["session"] = session
+            return await func(*args, **kwargs)
+
+        # the session only lives on this call stack, never on the (shared) service
+        async with new_session() as session:
             kwargs["session"] = session
-            setattr(self_obj, "_current_session", session)
-            res = await func(*args, **kwargs)
-        await session.flush()
-        setattr(self_obj, "_current_session", None)
-        return res
+            return await func(*args, **kwargs)
 
     return wrapper
 
 
+def inject_stream_session(func: Fn) -> Fn:
+    """inject_session for async generators.
+
+    A stream runs on its own session (and connection) by default: the server side
+    cursor stays open while iterating and the streamed instances stay out of the
+    unit of work identity map. Close early stopped streams with `contextlib.aclosing`.
+    """
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs) -> AsyncIterator:
+        if kwargs.get("session") is not None:
+            async for item in func(*args, **kwargs):
+                yield item
+            return
+
+        async with new_session() as session:
+            kwargs["session"] = session
+            async for item in func(*args, **kwargs):
+                yield item
+
+    return wrapper
+
+
+def _with_options(statement: Select, model: SQLModel, options: LoadProfile | None):
+    if options is None:
+        return statement
+    return options.apply(statement, model)
+
+
+# Session opened by DBService.session, kept per asyncio task.
+_task_session: ContextVar[AsyncSession | None] = ContextVar(
+    "db_service_session", default=None
+)
+
+
 class DBService:
-    """Group some utility functions for db queries."""
+    """Group some utility functions for db queries.
 
-    def __init__(self):
-        self.engine = None
-        self._current_session: AsyncSession | None = None
+    The service is stateless and safe to share between concurrent coroutines,
+    sessions are bound to the current call or task.
+    """
 
     @property
     def session(self) -> AsyncSession:
-        if self._current_session is None:
-            self._current_session = AsyncSession(self.engine)
+        if (scoped_session := current_session()) is not None:
+            return scoped_session
+
+        session = _task_session.get()
+        if session is None:
+            session = new_session()
+            _task_session.set(session)
 
-        return self._current_session
+        return session
 
     async def __aenter__(self):
         return self
@@ -57,12 +104,25 @@ class DBService:
         await self.dispose()
 
     async def dispose(self):
-        await self.engine.dispose()
+        """Release the session of the current task, the engine pool is shared by the whole process."""
+        session = _task_session.get()
+        if session is not None:
+            _task_session.set(None)
+            await session.close()
+
+    @staticmethod
+    async def commit(session: AsyncSession):
+        """Commit the session, unless it belongs to a unit of work which commits once at the end."""
+        if is_scoped(session):
+            await session.flush()
+            return
+
+        await session.commit()
 
     @inject_session
     async def insert(self, item: T, *, session: AsyncSession = None):
         session.add(item)
-        await session.commit()
+        await self.commit(session)
         await session.refresh(item)
         return item
 
@@ -76,26 +136,122 @@ class DBService:
         """Insert a batch of SQLModel instances."""
         async with session.begin_nested():
             session.add_all(instances)
-        await session.commit()
+        await self.commit(session)
+
+    @inject_session
+    async def bulk_upsert(
+        self,
+        model: type[SQLModel],
+        instances: Iterable[SQLModel | dict[str, Any]],
+        *,
+        session: AsyncSession = None,
+        conflict_target: Sequence[str] | None = None,
+        update_fields: Sequence[str] | None = None,
+        update_when: ColumnElement[bool] | None = None,
+        returning: bool = False,
+        chunk_size: int = 1000,
+    ) -> list[SQLModel] | None:
+        """Insert or update a batch of rows with INSERT ... ON CONFLICT DO UPDATE.
+
+        Rows are sent by chunks of multi-row VALUES instead of one INSERT per
+        instance, the conflict target defaults to the model __upsert_conflict_target__.
+        Core statements: the ORM events (see core.db.signals) are not triggered.
+        Docs: https://docs.sqlalchemy.org/en/20/orm/queryguide/dml.html#orm-upsert-statements
+        """
+        conflict_target = tuple(conflict_target or model.__upsert_conflict_target__)
+        rows = [row_values(model.__table__, instance) for instance in instances]
+        items = []
+        for chunk in group_rows(rows, chunk_size):
+            statement = upsert_statement(
+                model,
+                chunk,
+                conflict_target=conflict_target,
+                update_fields=update_fields,
+                update_when=update_when,
+            )
+            if not returning:
+                await session.execute(statement)
+                continue
+
+            res = await session.scalars(
+                statement.returning(model),
+                execution_options={"populate_existing": True},
+            )
+            items.extend(res.unique().all())
+        await self.commit(session)
+        return items if returning else None
 
     @inject_session
-    async def get(self, model: SQLModel, *, session: AsyncSession = None, **filters):
+    async def bulk_copy(
+        self,
+        model: type[SQLModel],
+        instances: Iterable[SQLModel | dict[str, Any]],
+        *,
+        session: AsyncSession = None,
+    ) -> int:
+        """Insert a batch of new rows with COPY, the fastest path for pure inserts.
+
+        No conflict handling and no ORM events, all rows must set the same columns.
+        Docs: https://magicstack.github.io/asyncpg/current/api/index.html#asyncpg.connection.Connection.copy_records_to_table
+        """
+        table = model.__table__
+        rows = [row_values(table, instance) for instance in instances]
+        if not rows:
+            return 0
+
+        connection = await session.connection()
+        columns, records = copy_records(table, rows, connection.dialect)
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table.name, records=records, columns=columns, schema_name=table.schema
+        )
+        await self.commit(session)
+        return len(records)
+
+    @inject_session
+    async def get(
+        self,
+        model: SQLModel,
+        *,
+        session: AsyncSession = None,
+        options: LoadProfile | None = None,
+        **filters,
+    ):
+        shape = model.filters_shape(**filters)
+        if shape is not None:
+            statement = model.compiled_statement(shape, options=options)
+            res = await session.scalars(statement, model.bind_filters(shape, **filters))
+            return res.first()
+
         filter_by = model.resolve_filters(**filters)
-        res = await session.scalars(select(model).where(*filter_by))
+        statement = _with_options(select(model).where(*filter_by), model, options)
+        res = await session.scalars(statement)
         return res.first()
 
     @inject_session
     async def get_or_404(
-        self, model: SQLModel, *, session: AsyncSession = None, **filters
+        self,
+        model: SQLModel,
+        *,
+        session: AsyncSession = None,
+        options: LoadProfile | None = None,
+        **filters,
     ):
-        item = await self.get(model, session=session, **filters)
+        item = await self.get(model, session=session, options=options, **filters)
         if item is None:
             raise ObjectNotFoundError(f"Object {model.__name__} not found.")
         return item
 
     @inject_session
-    async def first(self, model: SQLModel, *, session: AsyncSession = None):
-        res = await session.scalars(select(model).limit(1))
+    async def first(
+        self,
+        model: SQLModel,
+        *,
+        session: AsyncSession = None,
+        options: LoadProfile | None = None,
+    ):
+        statement = _with_options(select(model).limit(1), model, options)
+        res = await session.scalars(statement)
         return res.first()
 
     @inject_session
@@ -112,6 +268,24 @@ class DBService:
 
         return res.all()
 
+    @inject_stream_session
+    async def values_stream(
+        self,
+        model: SQLModel,
+        *attrs,
+        session: AsyncSession = None,
+        filters: dict[str, Any] | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator:
+        """Stream the rows of `values`, fetched by batches from a server side cursor."""
+        statement = select(*[model.get_attribute(attr) for attr in attrs])
+        if filters:
+            statement = statement.where(*model.resolve_filters(**filters))
+
+        result = await session.stream(statement.execution_options(yield_per=batch_size))
+        async for row in result:
+            yield row
+
     @inject_session
     async def all(
         self,
@@ -121,14 +295,14 @@ class DBService:
         order_by: str | None = "id",
         offset: int = 0,
         limit: int = 100,
+        options: LoadProfile | None = None,
     ):
         """Get all items of the given model."""
         _order_by = order_by or "id"
         order_by = model.resolve_order_by(_order_by)
         # based on https://docs.sqlalchemy.org/en/14/orm/extensions/asyncio.html#dynamic-asyncio
-        data = await session.scalars(
-            select(model).order_by(order_by).offset(offset).limit(limit)
-        )
+        statement = select(model).order_by(order_by).offset(offset).limit(limit)
+        data = await session.scalars(_with_options(statement, model, options))
 
         return data.unique().all()
 
@@ -141,20 +315,102 @@ class DBService:
         order_by: str = "id",
         offset: int = 0,
         limit: int = 100,
+        options: LoadProfile | None = None,
         **filters,
     ):
         _order_by = order_by or "id"
+        shape = model.filters_shape(**filters)
+        if shape is not None:
+            statement = model.compiled_statement(
+                shape, _order_by, paginate=True, options=options
+            )
+            params = model.bind_filters(shape, **filters)
+            data_list = await session.scalars(
+                statement, {**params, "_offset": offset, "_limit": limit}
+            )
+            return data_list.unique().all()
+
         order_by = model.resolve_order_by(_order_by)
         filter_by = model.resolve_filters(**filters)
-        data_list = await session.scalars(
+        statement = (
             select(model)
             .where(*filter_by)
             .order_by(order_by)
             .offset(offset)
             .limit(limit)
         )
+        data_list = await session.scalars(_with_options(statement, model, options))
         return data_list.unique().all()
 
+    @inject_stream_session
+    async def stream(
+        self,
+        model: SQLModel,
+        *,
+        session: AsyncSession = None,
+        order_by: str | None = "id",
+        batch_size: int = 1000,
+        options: LoadProfile | None = None,
+        **filters,
+    ) -> AsyncIterator:
+        """Iterate over all the matching items with a bounded memory.
+
+        Items are fetched by batches of `batch_size` from a server side cursor
+        (yield_per), instead of loading the whole result like `filter`.
+        """
+        statement = (
+            select(model)
+            .where(*model.resolve_filters(**filters))
+            .order_by(model.resolve_order_by(order_by or "id"))
+            .execution_options(yield_per=batch_size)
+        )
+        result = await session.stream_scalars(_with_options(statement, model, options))
+        async for item in result:
+            yield item
+
+    @inject_session
+    async def paginate(
+        self,
+        model: SQLModel,
+        *,
+        session: AsyncSession = None,
+        order_by: str | None = "id",
+        after: str | None = None,
+        before: str | None = None,
+        limit: int = 100,
+        options: LoadProfile | None = None,
+        **filters,
+    ) -> KeysetPage:
+        """Keyset pagination: fetch the page placed after (or before) the given cursor."""
+        keyset = Keyset(model, order_by or "id")
+        backwards = before is not None
+        cursor = before if backwards else after
+        statement = select(model).where(*model.resolve_filters(**filters))
+        statement = _with_options(statement, model, options)
+        if cursor is not None:
+            statement = statement.where(keyset.seek(cursor, backwards=backwards))
+
+        # one more item tells whether another page follows
+        statement = statement.order_by(*keyset.order_by(backwards=backwards))
+        data = await session.scalars(statement.limit(limit + 1))
+        items = list(data.unique().all())
+        has_more = len(items) > limit
+        items = items[:limit]
+        if backwards:
+            items.reverse()
+
+        first, last = (items[0], items[-1]) if items else (None, None)
+        has_next = has_more if not backwards else cursor is not None
+        has_previous = has_more if backwards else cursor is not None
+        return KeysetPage(
+            items=items,
+            current_page=cursor,
+            next_page=keyset.cursor(last) if last is not None and has_next else None,
+            previous_page=(
+                keyset.cursor(first) if first is not None and has_previous else None
+            ),
+        )
+
     @inject_session
     async def count(
         self,
@@ -198,7 +454,7 @@ class DBService:
     async def delete(self, instance: SQLModel, *, session: AsyncSession = None):
         session.add(instance)
         await session.delete(instance)
-        await session.commit()
+        await self.commit(session)
 
     @inject_session
     async def bulk_delete(
@@ -210,19 +466,104 @@ class DBService:
         """Delete all given instances.
 
         Docs: https://docs.sqlalchemy.org/en/20/orm/session_basics.html#deleting"""
-        async with session.begin():
-            try:
-                session.add_all(instances)
-            except InvalidRequestError:
-                pass
+        try:
+            session.add_all(instances)
+        except InvalidRequestError:
+            pass
 
-            await asyncio.gather(*[session.delete(instance) for instance in instances])
-        await session.commit()
+        await asyncio.gather(*[session.delete(instance) for instance in instances])
+        await self.commit(session)
+
+    @inject_session
+    async def filter_delete(
+        self,
+        model: type[SQLModel],
+        *,
+        session: AsyncSession = None,
+        limit: int | None = None,
+        **filters,
+    ) -> list[int]:
+        """Delete the rows matching the filters with a single DELETE ... WHERE.
+
+        Return the deleted ids, after_delete signals are sent with the deleted rows.
+        With a limit, only the first `limit` matching rows are deleted (batches).
+        """
+        if not filters:
+            raise ValueError("No filter given, use truncate() to delete all rows.")
+
+        clauses = model.resolve_filters(**filters)
+        if limit is not None:
+            # postgres has no DELETE ... LIMIT
+            batch = select(model.id).where(*clauses).limit(limit).scalar_subquery()
+            clauses = [model.id.in_(batch)]
+        statement = delete(model).where(*clauses)
+        ids = await self._execute_returning(session, statement, model, "after_delete")
+        await self.commit(session)
+        return ids
+
+    @inject_session
+    async def filter_update(
+        self,
+        model: type[SQLModel],
+        values: dict[str, Any],
+        *,
+        session: AsyncSession = None,
+        **filters,
+    ) -> list[int]:
+        """Update the rows matching the filters with a single UPDATE ... WHERE.
+
+        Return the updated ids, after_update signals are sent with the updated rows.
+        """
+        if not filters:
+            raise ValueError("No filter given, refusing to update all rows.")
+
+        statement = (
+            update(model).where(*model.resolve_filters(**filters)).values(**values)
+        )
+        ids = await self._execute_returning(session, statement, model, "after_update")
+        await self.commit(session)
+        return ids
+
+    @staticmethod
+    async def _execute_returning(
+        session: AsyncSession, statement, model: type[SQLModel], event_name: str
+    ) -> list[int]:
+        if not signal_manager.handlers(event_name, model):
+            res = await session.execute(statement.returning(model.id))
+            return list(res.scalars().all())
+
+        # the signals receive the rows as (detached) model instances
+        res = await session.execute(statement.returning(*model.__table__.columns))
+        instances = [model(**row) for row in res.mappings().all()]
+        await session.run_sync(
+            lambda sync_session: signal_manager.dispatch(
+                event_name, model, sync_session.connection(), instances
+            )
+        )
+        return [instance.id for instance in instances]
+
+    @inject_session
+    async def reserve_ids(
+        self, model: type[SQLModel], count: int, *, session: AsyncSession = None
+    ) -> list[int]:
+        """Take `count` values of the id sequence of the model, for rows inserted later.
+
+        A sequence value is never given twice, even when the transaction rolls back.
+        """
+        # a text statement: always run on the primary (see RoutingSession)
+        statement = text(
+            "SELECT nextval(pg_get_serial_sequence(:table, 'id')) "
+            "FROM generate_series(1, :count)"
+        )
+        res = await session.execute(
+            statement, {"table": model.__table__.fullname, "count": count}
+        )
+        return list(res.scalars().all())
 
     @inject_session
     async def truncate(self, instance: SQLModel, *, session: AsyncSession = None):
         await session.execute(delete(instance))
-        await session.commit()
+        await self.commit(session)
 
 
 async def get_db_service():
@@ -0,0 +1,45 @@
+from typing import Annotated, Any
+
+from fastapi import Depends, HTTPException, Query, status
+from sqlmodel import SQLModel
+
+from core.db.query.exceptions import InvalidCursorError
+from core.db.query.pagination import KeysetPage
+
+
+class KeysetParams:
+    """Query parameters of the keyset paginated list routes."""
+
+    def __init__(
+        self,
+        after: Annotated[
+            str | None, Query(description="Cursor of the next page (next_page)")
+        ] = None,
+        before: Annotated[
+            str | None,
+            Query(description="Cursor of the previous page (previous_page)"),
+        ] = None,
+        limit: Annotated[int, Query(ge=1, le=100)] = 50,
+    ):
+        self.after = after
+        self.before = before
+        self.limit = limit
+
+    async def paginate(
+        self, model: type[SQLModel], *, order_by: str = "id", **filters: Any
+    ) -> KeysetPage:
+        try:
+            return await model.paginate(
+                **filters,
+                order_by=order_by,
+                after=self.after,
+                before=self.before,
+                limit=self.limit,
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+            ) from e
+
+
+KeysetParamsDep = Annotated[KeysetParams, Depends()]
@@ -0,0 +1,176 @@
+import asyncio
+import random
+import time
+import weakref
+from dataclasses import dataclass
+
+from sqlalchemy import Engine, Select, event, text
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session
+
+from core.monitoring.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds the replica is behind the primary, 0 when it replayed all the received WAL
+# (an idle primary does not make the replica lag).
+LAG_QUERY = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()"
+    " THEN 0"
+    " ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+    " END"
+)
+# session.info key set once the session wrote to the primary
+WROTE_KEY = "wrote_to_primary"
+
+
+@dataclass
+class ReplicaState:
+    uri: str
+    available: bool = False
+    lag: float | None = None
+    checked_at: float = 0.0  # time.monotonic()
+
+    def mark(self, *, available: bool, lag: float | None = None):
+        self.available = available
+        self.lag = lag
+        self.checked_at = time.monotonic()
+
+
+# Health of the replicas of the process, shared by all the event loops.
+_states: dict[str, ReplicaState] = {}
+# Health checks in progress (strong references, see asyncio.create_task).
+_checks: set[asyncio.Task] = set()
+_watched_engines: weakref.WeakSet[Engine] = weakref.WeakSet()
+
+
+def replica_states() -> list[ReplicaState]:
+    return list(_states.values())
+
+
+async def check_replica(uri: str) -> ReplicaState:
+    """Check the replica is reachable and not lagging too far behind the primary."""
+    from core.db.dependencies.session import get_engine
+    from settings import settings
+
+    state = _states.setdefault(uri, ReplicaState(uri))
+    try:
+        async with asyncio.timeout(settings.postgres_replica_check_timeout):
+            async with get_engine(uri).connect() as connection:
+                lag = float(await connection.scalar(LAG_QUERY) or 0)
+    except (OSError, SQLAlchemyError, TimeoutError) as e:
+        logger.warning("Database replica %s is unavailable: %s", _host(uri), e)
+        state.mark(available=False)
+        return state
+
+    available = lag <= settings.postgres_replica_max_lag
+    if not available:
+        logger.warning("Database replica %s lags by %.1fs", _host(uri), lag)
+    state.mark(available=available, lag=lag)
+    return state
+
+
+async def check_replicas() -> list[ReplicaState]:
+    from settings import settings
+
+    return list(
+        await asyncio.gather(
+            *[check_replica(uri) for uri in settings.postgres_replica_uris]
+        )
+    )
+
+
+def replica_engine() -> AsyncEngine | None:
+    """Engine of a random available replica, None to use the primary database.
+
+    Replicas are checked in the background every `postgres_replica_check_interval`
+    seconds; a replica which was never checked, or whose last check is too old, is not used.
+    """
+    from core.db.dependencies.session import get_engine
+    from settings import settings
+
+    if not settings.postgres_replica_uris:
+        return None
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+    now = time.monotonic()
+    interval = settings.postgres_replica_check_interval
+    states = [
+        _states.setdefault(uri, ReplicaState(uri))
+        for uri in settings.postgres_replica_uris
+    ]
+    if any(now - state.checked_at >= interval for state in states) and not _checks:
+        task = loop.create_task(check_replicas())
+        _checks.add(task)
+        task.add_done_callback(_checks.discard)
+
+    available = [
+        state
+        for state in states
+        if state.available and now - state.checked_at < 3 * interval
+    ]
+    if not available:
+        return None
+
+    state = random.choice(available)
+    engine = get_engine(state.uri)
+    _watch(engine.sync_engine, state)
+    return engine
+
+
+def _watch(engine: Engine, state: ReplicaState):
+    """Stop routing to the replica as soon as a connection to it fails."""
+    if engine in _watched_engines:
+        return
+
+    def on_error(context: ExceptionContext):
+        if context.is_disconnect or isinstance(context.original_exception, OSError):
+            logger.warning("Database replica %s is unavailable", _host(state.uri))
+            state.mark(available=False)
+
+    event.listen(engine, "handle_error", on_error)
+    _watched_engines.add(engine)
+
+
+def _host(uri: str) -> str:
+    return uri.rpartition("@")[2]
+
+
+class RoutingSession(Session):
+    """Session sending its read-only queries to a replica, when there is any.
+
+    Writes, SELECT ... FOR UPDATE, and every query run after a write of the session
+    (or of the request unit of work, see session_scope) go to the primary database
+    to read your own writes.
+    Docs: https://docs.sqlalchemy.org/en/20/orm/persistence_techniques.html#custom-vertical-partitioning
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._is_read(clause):
+            if not self._wrote() and (engine := replica_engine()) is not None:
+                return engine.sync_engine
+        else:
+            self.info[WROTE_KEY] = True
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+    def _is_read(self, clause) -> bool:
+        return (
+            isinstance(clause, Select)
+            and clause._for_update_arg is None
+            and not self._flushing
+        )
+
+    def _wrote(self) -> bool:
+        from core.db.dependencies.session import current_session
+
+        if self.info.get(WROTE_KEY):
+            return True
+        scoped_session = current_session()
+        return scoped_session is not None and bool(scoped_session.info.get(WROTE_KEY))
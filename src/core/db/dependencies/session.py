@@ -1,26 +1,195 @@
-from typing import Annotated
+import asyncio
+import weakref
+from collections.abc import AsyncIterator, Coroutine, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Annotated, Any, TypeVar
 
 from fastapi import Depends
-from sqlalchemy import NullPool
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from core.db.dependencies.replicas import RoutingSession
+from core.monitoring.queries import instrument_engine
 
-def get_engine(**kwargs) -> create_async_engine:
-    """Create async database engine.
+T = TypeVar("T")
+
+# Pooled connections are bound to the event loop that opened them,
+# so process-wide engines are kept per running loop (e.g. celery tasks call asyncio.run).
+_engines: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, AsyncEngine]
+] = weakref.WeakKeyDictionary()
+# Unit of work session of the current request, see session_scope().
+_scoped_session: ContextVar[AsyncSession | None] = ContextVar(
+    "scoped_session", default=None
+)
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def pool_options() -> dict[str, Any]:
+    """Connection pool options of the current worker process."""
+    from settings import settings
+
+    if not settings.postgres_pool_enabled:
+        return {"poolclass": NullPool}
+
+    pool_size = settings.postgres_pool_size
+    max_overflow = settings.postgres_max_overflow
+    if settings.postgres_max_connections:
+        # share the database connections budget between the server workers
+        budget = max(
+            1, settings.postgres_max_connections // max(1, settings.web_concurrency)
+        )
+        pool_size = min(pool_size, budget)
+        max_overflow = max(0, min(max_overflow, budget - pool_size))
+
+    return {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_recycle": settings.postgres_pool_recycle,
+        "pool_timeout": settings.postgres_pool_timeout,
+    }
+
+
+def create_engine(uri: str | None = None, **kwargs) -> AsyncEngine:
+    """Create a new async database engine.
 
     Docs: https://docs.sqlalchemy.org/en/14/orm/extensions/asyncio.html
     """
     from settings import settings
 
-    kw = {"pool_pre_ping": True, "poolclass": NullPool, **kwargs}
-    return create_async_engine(settings.uri, **kw)
+    kw = {"pool_pre_ping": True, **pool_options(), **kwargs}
+    engine = create_async_engine(uri or settings.uri, **kw)
+    instrument_engine(engine)
+    return engine
+
+
+def get_engine(uri: str | None = None, **kwargs) -> AsyncEngine:
+    """Return the process-wide engine of the current database (or of the given replica uri).
+
+    Passing engine options, or calling it outside an event loop, creates a dedicated engine instead.
+    """
+    from settings import settings
+
+    uri = uri or settings.uri
+    loop = _running_loop()
+    if kwargs or loop is None:
+        return create_engine(uri, **kwargs)
+
+    loop_engines = _engines.setdefault(loop, {})
+    engine = loop_engines.get(uri)
+    if engine is None:
+        engine = loop_engines[uri] = create_engine(uri)
+    return engine
+
+
+def iter_engines() -> Iterator[AsyncEngine]:
+    """Iterate over all the process-wide engines."""
+    for loop_engines in list(_engines.values()):
+        yield from list(loop_engines.values())
+
+
+async def dispose_engine(engine: AsyncEngine):
+    """Close all the engine connections and forget it."""
+    for loop_engines in list(_engines.values()):
+        for uri, _engine in list(loop_engines.items()):
+            if _engine is engine:
+                loop_engines.pop(uri)
+    await engine.dispose()
+
+
+async def dispose_engines():
+    """Close the engines (primary and replicas) of the running event loop."""
+    loop = _running_loop()
+    for engine in list(_engines.get(loop, {}).values()) if loop else []:
+        await dispose_engine(engine)
+
+
+def asyncio_run(coroutine: Coroutine[Any, Any, T]) -> T:
+    """asyncio.run for sync code (e.g. celery tasks): the engines opened by the event
+    loop are disposed with it, their connections are not left to the garbage collector.
+    """
+
+    async def _run() -> T:
+        try:
+            return await coroutine
+        finally:
+            await dispose_engines()
+
+    return asyncio.run(_run())
+
+
+def new_session(**kwargs) -> AsyncSession:
+    """Open a session on the process-wide engine.
+
+    Read-only queries are sent to the replicas, if any (see RoutingSession).
+    """
+    return AsyncSession(get_engine(), sync_session_class=RoutingSession, **kwargs)
+
+
+def current_session() -> AsyncSession | None:
+    """Return the unit of work session of the current context, if any."""
+    return _scoped_session.get()
+
+
+def is_scoped(session: AsyncSession) -> bool:
+    """Whether the given session is owned by the current unit of work."""
+    return session is _scoped_session.get()
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    """Share a single session (and transaction) with every query run in this context.
+
+    DBService, ModelManager and ModelQuery transparently reuse it instead of opening their own session.
+    Pending changes are committed when leaving the block, or rolled back if an error is raised.
+
+    example:
+     > async with session_scope():
+     >     user = await User.get(username="fastapi")
+     >     await Hero(name="Spider-Boy", user=user).save()
+    """
+    session = new_session(expire_on_commit=False)
+    token = _scoped_session.set(session)
+    try:
+        yield session
+        await session.commit()
+    except BaseException:
+        await session.rollback()
+        raise
+    finally:
+        _scoped_session.reset(token)
+        await session.close()
+
+
+@contextmanager
+def detached_session():
+    """Opt out of the current unit of work.
+
+    Queries run in this block use their own session, e.g. background work outliving the request.
+    """
+    token = _scoped_session.set(None)
+    try:
+        yield
+    finally:
+        _scoped_session.reset(token)
 
 
 async def get_session():
-    engine = get_engine()
-    async with AsyncSession(engine) as session:
+    if (session := current_session()) is not None:
+        yield session
+        return
+
+    async with new_session() as session:
         yield session
 
 
@@ -5,4 +5,9 @@ from core.db.fixtures.utils import ModelDataType
 
 class DefaultLoader(ModelBaseLoader[SQLTable]):
     async def load(self, data_list: list[ModelDataType]):
-        await SQLTable.bulk_create_or_update(self._to_instances(data_list))
+        instances = self._to_instances(data_list)
+        if not instances:
+            return
+
+        # a fixture group holds a single model, reloading it updates the rows
+        await type(instances[0]).bulk_upsert(instances)
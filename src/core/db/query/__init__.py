@@ -1,3 +1,4 @@
+from .loaders import LoadProfile
 from .mixins import ModelQuery
 
-__all__ = ["ModelQuery"]
+__all__ = ["LoadProfile", "ModelQuery"]
@@ -0,0 +1,105 @@
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any
+
+from sqlalchemy import ColumnElement, Dialect, Table, case
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlmodel import SQLModel
+
+# asyncpg (and postgres) accept at most 32767 parameters per statement
+MAX_STATEMENT_PARAMS = 32767
+
+Row = dict[str, Any]
+
+
+def row_values(table: Table, item: SQLModel | Row) -> Row:
+    """Column values of an instance, without the unset ones filled by the database.
+
+    Like the ORM, a None primary key or a None column with a default is omitted
+    so the sequence or the default applies.
+    """
+    if isinstance(item, dict):
+        return {key: value for key, value in item.items() if key in table.columns}
+
+    values = {}
+    for column in table.columns:
+        value = getattr(item, column.key, None)
+        if value is None and (
+            column.primary_key
+            or column.default is not None
+            or column.server_default is not None
+        ):
+            continue
+        values[column.name] = value
+    return values
+
+
+def group_rows(rows: Iterable[Row], chunk_size: int) -> Iterator[list[Row]]:
+    """Group rows having the same columns by chunks, one multi-row VALUES each."""
+    groups: dict[tuple[str, ...], list[Row]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+
+    for keys, group in groups.items():
+        size = max(1, min(chunk_size, MAX_STATEMENT_PARAMS // max(1, len(keys))))
+        for start in range(0, len(group), size):
+            yield group[start : start + size]
+
+
+def upsert_statement(
+    model: type[SQLModel],
+    rows: list[Row],
+    *,
+    conflict_target: Sequence[str],
+    update_fields: Sequence[str] | None = None,
+    update_when: ColumnElement[bool] | None = None,
+) -> Insert:
+    """INSERT ... ON CONFLICT (conflict_target) DO UPDATE of the given rows.
+
+    All the inserted columns are updated (or only update_fields), `onupdate`
+    SQL defaults like updated_at are applied as the ORM would do.
+    Nothing to update turns into ON CONFLICT DO NOTHING.
+    With update_when, the existing rows not matching it keep their values, unlike
+    DO UPDATE ... WHERE they are still returned by RETURNING.
+    """
+    table: Table = model.__table__
+    statement = insert(model).values(rows)
+    set_ = {
+        key: statement.excluded[key]
+        for key in rows[0]
+        if key not in conflict_target
+        and not table.columns[key].primary_key
+        and (update_fields is None or key in update_fields)
+    }
+    if not set_:
+        return statement.on_conflict_do_nothing(index_elements=conflict_target)
+
+    for column in table.columns:
+        onupdate = column.onupdate
+        if column.name not in set_ and onupdate is not None:
+            if onupdate.is_clause_element:
+                set_[column.name] = onupdate.arg
+    if update_when is not None:
+        set_ = {
+            key: case((update_when, value), else_=table.columns[key])
+            for key, value in set_.items()
+        }
+    return statement.on_conflict_do_update(index_elements=conflict_target, set_=set_)
+
+
+def copy_records(
+    table: Table, rows: list[Row], dialect: Dialect
+) -> tuple[list[str], list[tuple]]:
+    """Columns and records of a COPY, values are converted by the column types."""
+    columns = list(rows[0])
+    if any(len(row) != len(columns) or set(row) != set(columns) for row in rows):
+        raise ValueError("COPY rows must all set the same columns.")
+
+    processors = [table.columns[name].type.bind_processor(dialect) for name in columns]
+    records = [
+        tuple(
+            processor(row[name]) if processor else row[name]
+            for name, processor in zip(columns, processors)
+        )
+        for row in rows
+    ]
+    return columns, records
@@ -1,2 +1,6 @@
 class ObjectNotFoundError(Exception):
     pass
+
+
+class InvalidCursorError(ValueError):
+    pass
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Select, inspect
+from sqlalchemy.orm import (
+    Load,
+    joinedload,
+    load_only,
+    noload,
+    raiseload,
+    selectinload,
+)
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlmodel import SQLModel
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    """Loader strategy of a query, instead of the relationships `lazy` defaults.
+
+    - load: relationships to load, dotted for nested ones ("groups.permissions").
+      Collections are loaded with SELECT IN, scalar relationships with a JOIN.
+    - only: columns to fetch (all by default).
+    - raiseload: accessing a relationship not listed in `load` raises an error
+      instead of returning an empty value (noload).
+
+    Queries run in the unit of work session, like the others: an instance it
+    already holds is returned as loaded (identity map), and an instance first loaded
+    with a profile keeps its profile loads for the rest of the unit of work.
+
+    example:
+     > ChatRoom.options(load=["owner", "members"]).get(id=1)
+    """
+
+    load: tuple[str, ...] = ()
+    only: tuple[str, ...] = ()
+    raiseload: bool = False
+
+    def apply(self, statement: Select, model: type[SQLModel]) -> Select:
+        return statement.options(*self.options(model))
+
+    def options(self, model: type[SQLModel]) -> list[LoaderOption]:
+        options = self._relationship_options(model, None, _path_tree(self.load))
+        if self.only:
+            options.append(
+                load_only(*[model.get_attribute(name) for name in self.only])
+            )
+        return options
+
+    def _relationship_options(
+        self, model: type[SQLModel], parent: Load | None, tree: dict[str, Any]
+    ) -> list[LoaderOption]:
+        options = []
+        relationships = inspect(model).relationships
+        for name, children in tree.items():
+            if name not in relationships:
+                raise AttributeError(
+                    f"Model {model.__name__} does not have any relationship named: '{name}'."
+                )
+
+            relationship = relationships[name]
+            attribute = getattr(model, name)
+            if parent is None:
+                loader = (selectinload if relationship.uselist else joinedload)(
+                    attribute
+                )
+            elif relationship.uselist:
+                loader = parent.selectinload(attribute)
+            else:
+                loader = parent.joinedload(attribute)
+
+            options.append(loader)
+            options.extend(
+                self._relationship_options(relationship.mapper.class_, loader, children)
+            )
+
+        # every other relationship of this level is not loaded
+        if parent is None:
+            options.append(raiseload("*") if self.raiseload else noload("*"))
+        else:
+            options.append(
+                parent.raiseload("*") if self.raiseload else parent.noload("*")
+            )
+        return options
+
+
+def _path_tree(paths: tuple[str, ...]) -> dict[str, Any]:
+    tree: dict[str, Any] = {}
+    for path in paths:
+        node = tree
+        for name in path.split("."):
+            node = node.setdefault(name, {})
+    return tree
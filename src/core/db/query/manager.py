@@ -1,33 +1,28 @@
-from collections.abc import Callable
-from functools import wraps
-from typing import Any, Iterable, ParamSpec, TypeVar
+from typing import Any, AsyncIterator, Iterable, Sequence, TypeVar
 
+from sqlalchemy import ColumnElement
 from sqlmodel import SQLModel
 
 from core.db.dependencies import DBService
+from core.db.query.loaders import LoadProfile
 
-P = ParamSpec("P")
-Fn = Callable[P, Any]
 T = TypeVar("T", bound=SQLModel)
 
 
-def connection_manager(func: Fn) -> Fn:
-    @wraps(func)
-    async def wrapper(*args, **kwargs) -> Any:
-        self_obj: ModelManager = args[0]
-        res = await func(*args, **kwargs)
-        await self_obj.db_service.dispose()
-        return res
-
-    return wrapper
-
-
 class ModelManager:
-    """Group some utility functions for db queries."""
+    """Group some utility functions for db queries.
 
-    def __init__(self, model_class: type[SQLModel]):
+    Managers are cached per model (see ModelQuery.objects) and shared by all the
+    coroutines, they must not hold any session state.
+    The (immutable) load profile applies to the read queries (see ModelQuery.options).
+    """
+
+    def __init__(
+        self, model_class: type[SQLModel], load_profile: LoadProfile | None = None
+    ):
         super().__init__()
         self.model_class = model_class
+        self.load_profile = load_profile
         self.db_service = DBService()
 
     @property
@@ -38,32 +33,62 @@ class ModelManager:
     def sync_session(self):
         return self.session.sync_session
 
-    @connection_manager
     async def insert(self, item: SQLModel):
         return await self.db_service.insert(item)
 
-    @connection_manager
     async def bulk_create_or_update(self, data: list[SQLModel]):
         """Insert a batch of SQLModel instances."""
         await self.db_service.bulk_create_or_update(data)
 
-    @connection_manager
+    async def bulk_upsert(
+        self,
+        data: Iterable[SQLModel | dict[str, Any]],
+        *,
+        conflict_target: Sequence[str] | None = None,
+        update_fields: Sequence[str] | None = None,
+        update_when: ColumnElement[bool] | None = None,
+        returning: bool = False,
+        chunk_size: int = 1000,
+    ):
+        return await self.db_service.bulk_upsert(
+            self.model_class,
+            data,
+            conflict_target=conflict_target,
+            update_fields=update_fields,
+            update_when=update_when,
+            returning=returning,
+            chunk_size=chunk_size,
+        )
+
+    async def bulk_copy(self, data: Iterable[SQLModel | dict[str, Any]]) -> int:
+        return await self.db_service.bulk_copy(self.model_class, data)
+
     async def get(self, **filters):
-        return await self.db_service.get(self.model_class, **filters)
+        return await self.db_service.get(
+            self.model_class, **filters, options=self.load_profile
+        )
 
-    @connection_manager
     async def get_or_404(self, **filters):
-        return await self.db_service.get_or_404(self.model_class, **filters)
+        return await self.db_service.get_or_404(
+            self.model_class, **filters, options=self.load_profile
+        )
 
-    @connection_manager
     async def first(self):
-        return await self.db_service.first(self.model_class)
+        return await self.db_service.first(self.model_class, options=self.load_profile)
 
-    @connection_manager
     async def values(self, *attrs, filters: dict[str, Any] | None = None):
         return await self.db_service.values(self.model_class, *attrs, filters=filters)
 
-    @connection_manager
+    def values_stream(
+        self,
+        *attrs,
+        filters: dict[str, Any] | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator:
+        return self.db_service.values_stream(
+            self.model_class, *attrs, filters=filters, batch_size=batch_size
+        )
+
     async def all(
         self,
         *,
@@ -73,10 +98,13 @@ class ModelManager:
     ):
         """Get all items of the given model."""
         return await self.db_service.all(
-            self.model_class, offset=offset, limit=limit, order_by=order_by
+            self.model_class,
+            offset=offset,
+            limit=limit,
+            order_by=order_by,
+            options=self.load_profile,
         )
 
-    @connection_manager
     async def filter(
         self,
         *,
@@ -86,32 +114,76 @@ class ModelManager:
         **filters,
     ):
         return await self.db_service.filter(
-            self.model_class, **filters, offset=offset, limit=limit, order_by=order_by
+            self.model_class,
+            **filters,
+            offset=offset,
+            limit=limit,
+            order_by=order_by,
+            options=self.load_profile,
+        )
+
+    def stream(
+        self,
+        *,
+        order_by: str | None = None,
+        batch_size: int = 1000,
+        **filters,
+    ) -> AsyncIterator:
+        return self.db_service.stream(
+            self.model_class,
+            **filters,
+            order_by=order_by,
+            batch_size=batch_size,
+            options=self.load_profile,
+        )
+
+    async def paginate(
+        self,
+        *,
+        order_by: str | None = None,
+        after: str | None = None,
+        before: str | None = None,
+        limit: int = 100,
+        **filters,
+    ):
+        return await self.db_service.paginate(
+            self.model_class,
+            **filters,
+            order_by=order_by,
+            after=after,
+            before=before,
+            limit=limit,
+            options=self.load_profile,
         )
 
-    @connection_manager
     async def count(
         self,
         **filters,
     ) -> int:
         return await self.db_service.count(self.model_class, **filters)
 
-    @connection_manager
     async def exists(self, item: SQLModel) -> bool:
         return await self.db_service.exists(self.model_class, item)
 
-    @connection_manager
     async def delete(self, item: SQLModel):
         await self.db_service.delete(item)
 
-    @connection_manager
     async def bulk_delete(self, items: Iterable[SQLModel]):
         await self.db_service.bulk_delete(items)
 
-    @connection_manager
+    async def filter_delete(self, *, limit: int | None = None, **filters) -> list[int]:
+        return await self.db_service.filter_delete(
+            self.model_class, limit=limit, **filters
+        )
+
+    async def filter_update(self, values: dict[str, Any], **filters) -> list[int]:
+        return await self.db_service.filter_update(self.model_class, values, **filters)
+
+    async def reserve_ids(self, count: int) -> list[int]:
+        return await self.db_service.reserve_ids(self.model_class, count)
+
     async def refresh(self, item: SQLModel) -> SQLModel:
         return await self.db_service.refresh(item)
 
-    @connection_manager
     async def truncate(self):
         await self.db_service.truncate(self.model_class)
@@ -1,19 +1,43 @@
-from collections.abc import Iterable
+from collections.abc import AsyncIterator, Iterable, Sequence
 from functools import lru_cache
-from typing import Any, Self
+from typing import Any, ClassVar, Self
 
+from sqlalchemy import ColumnElement
 from sqlmodel import SQLModel
 
+from core.db.query.loaders import LoadProfile
 from core.db.query.manager import ModelManager
 from core.db.query.operators import QueryExpressionManager
+from core.db.query.pagination import KeysetPage
 
 
 class ModelQuery(QueryExpressionManager):
+    # unique columns identifying an existing row for bulk_upsert
+    __upsert_conflict_target__: ClassVar[tuple[str, ...]] = ("id",)
+
     @classmethod
     @lru_cache
     def objects(cls) -> ModelManager:
         return ModelManager(cls)
 
+    @classmethod
+    def options(
+        cls,
+        *,
+        load: Sequence[str] = (),
+        only: Sequence[str] = (),
+        raiseload: bool = False,
+    ) -> ModelManager:
+        """Manager whose read queries load only the given relationships (see LoadProfile).
+
+        :example
+          > room = await ChatRoom.options(load=["owner", "members"]).get(id=1)
+          > users = await User.options(only=["id", "username"]).filter(is_active=True)
+        """
+        return ModelManager(
+            cls, load_profile=LoadProfile(tuple(load), tuple(only), raiseload)
+        )
+
     @classmethod
     async def get(cls, **filters) -> Self | None:
         return await cls.objects().get(**filters)
@@ -37,6 +61,23 @@ class ModelQuery(QueryExpressionManager):
         """
         return await cls.objects().values(*fields, filters=filters)
 
+    @classmethod
+    def values_stream(
+        cls,
+        *fields,
+        filters: dict[str, Any] | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator:
+        """Like `values`, the rows are streamed by batches from a server side cursor.
+
+        :example
+          > async for username, email in User.values_stream("username", "email"):
+          >     ...
+        """
+        return cls.objects().values_stream(
+            *fields, filters=filters, batch_size=batch_size
+        )
+
     @classmethod
     async def filter(
         cls,
@@ -50,6 +91,44 @@ class ModelQuery(QueryExpressionManager):
             **filters, offset=offset, limit=limit, order_by=order_by
         )
 
+    @classmethod
+    def stream(
+        cls,
+        *,
+        order_by: str | None = None,
+        batch_size: int = 1000,
+        **filters,
+    ) -> AsyncIterator[Self]:
+        """Iterate over all the matching items, `batch_size` rows in memory at most.
+
+        example:
+         > async for message in ChatMessage.stream(room_id=1, batch_size=500):
+         >     ...
+        """
+        return cls.objects().stream(**filters, order_by=order_by, batch_size=batch_size)
+
+    @classmethod
+    async def paginate(
+        cls,
+        *,
+        order_by: str | None = None,
+        after: str | None = None,
+        before: str | None = None,
+        limit: int = 100,
+        **filters,
+    ) -> KeysetPage[Self]:
+        """Keyset pagination, pass the next_page/previous_page cursors as after/before.
+
+        example:
+         > page = await ChatMessage.paginate(order_by="created_at", room_id=1)
+         > next_page = await ChatMessage.paginate(
+         >     order_by="created_at", room_id=1, after=page.next_page
+         > )
+        """
+        return await cls.objects().paginate(
+            **filters, order_by=order_by, after=after, before=before, limit=limit
+        )
+
     @classmethod
     async def count(cls, **filters) -> int:
         return await cls.objects().count(**filters)
@@ -70,6 +149,27 @@ class ModelQuery(QueryExpressionManager):
     async def bulk_delete(cls, items: Iterable[SQLModel]):
         return await cls.objects().bulk_delete(items)
 
+    @classmethod
+    async def filter_delete(cls, *, limit: int | None = None, **filters) -> list[int]:
+        """Delete all the items matching the filters in a single statement.
+
+        With a limit, only the first `limit` items are deleted (batch deletes).
+
+        example:
+         > await ChatMessage.filter_delete(created_at__lt=last_year)
+         > await JWTToken.filter_delete(created_at__lt=expired_at, limit=1000)
+        """
+        return await cls.objects().filter_delete(limit=limit, **filters)
+
+    @classmethod
+    async def filter_update(cls, values: dict[str, Any], **filters) -> list[int]:
+        """Update all the items matching the filters in a single statement.
+
+        example:
+         > await Hero.filter_update({"age": None}, age__gt=200)
+        """
+        return await cls.objects().filter_update(values, **filters)
+
     async def refresh(self) -> Self:
         return await self.objects().refresh(self)
 
@@ -80,6 +180,43 @@ class ModelQuery(QueryExpressionManager):
     async def bulk_create_or_update(cls, items: Iterable[SQLModel]) -> None:
         await cls.objects().bulk_create_or_update(items)
 
+    @classmethod
+    async def bulk_upsert(
+        cls,
+        items: Iterable[SQLModel | dict[str, Any]],
+        *,
+        conflict_target: Sequence[str] | None = None,
+        update_fields: Sequence[str] | None = None,
+        update_when: ColumnElement[bool] | None = None,
+        returning: bool = False,
+        chunk_size: int = 1000,
+    ) -> list[Self] | None:
+        """Insert the items, or update the existing ones, with INSERT ... ON CONFLICT.
+
+        example:
+         > await Permission.bulk_upsert(
+         >     [{"name": "read:hero", "target_table": "hero"}], conflict_target=["name"]
+         > )
+        """
+        return await cls.objects().bulk_upsert(
+            items,
+            conflict_target=conflict_target,
+            update_fields=update_fields,
+            update_when=update_when,
+            returning=returning,
+            chunk_size=chunk_size,
+        )
+
+    @classmethod
+    async def bulk_copy(cls, items: Iterable[SQLModel | dict[str, Any]]) -> int:
+        """Insert new items with COPY, see DBService.bulk_copy."""
+        return await cls.objects().bulk_copy(items)
+
+    @classmethod
+    async def reserve_ids(cls, count: int) -> list[int]:
+        """Ids for items inserted later (e.g. by batches), see DBService.reserve_ids."""
+        return await cls.objects().reserve_ids(count)
+
     @classmethod
     async def truncate(cls) -> Self:
         return await cls.objects().truncate()
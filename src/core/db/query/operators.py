@@ -1,10 +1,23 @@
+from collections.abc import Callable
 from functools import lru_cache, partial
 from typing import Annotated, Any, Sequence
 
+from sqlalchemy import ColumnElement, Integer, Select, bindparam
+from sqlalchemy.orm import ColumnProperty
 from sqlalchemy.sql._typing import ColumnExpressionArgument
-from sqlmodel import asc, col, desc
+from sqlmodel import asc, col, desc, select
 from typing_extensions import Doc
 
+from core.db.query.loaders import LoadProfile
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _like_pattern(value: Any) -> str:
+    return f"%{value}%"
+
 
 class QueryExpressionManager:
     @classmethod
@@ -56,6 +69,97 @@ class QueryExpressionManager:
             _filters.extend(resolver(**{_key: value}))
         return _filters
 
+    @classmethod
+    def filters_shape(cls, **filters) -> tuple[str, ...] | None:
+        """Cache key of the given filters: their sorted `field__operator` keys.
+
+        Return None when the filters can't be bound as statement parameters
+        (None values, relationships, SQL expressions, unknown fields or operators),
+        these are resolved by resolve_filters on each call.
+        """
+        for key, value in filters.items():
+            if value is None or isinstance(value, ColumnElement):
+                return None
+
+            name, sep, operator = key.partition("__")
+            if sep and not operator:
+                return None
+            try:
+                cls._operator_resolvers(operator)
+            except ValueError:
+                return None
+            if operator in ("in", "not_in") and not isinstance(value, (list, tuple)):
+                return None
+
+            attribute = getattr(cls, name, None)
+            if not isinstance(getattr(attribute, "property", None), ColumnProperty):
+                return None
+
+        return tuple(sorted(filters))
+
+    @classmethod
+    def bind_filters(cls, shape: tuple[str, ...], **filters) -> dict[str, Any]:
+        """Parameters of the compiled_statement of the given filters shape."""
+        _, params = cls._compiled_filters(shape)
+        return {param: transform(filters[key]) for param, key, transform in params}
+
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def compiled_statement(
+        cls,
+        shape: tuple[str, ...],
+        order_by: str | None = None,
+        paginate: bool = False,
+        options: LoadProfile | None = None,
+    ) -> Select:
+        """Reusable `select` of the model for a filters shape (see filters_shape).
+
+        Built once per shape, so SQLAlchemy's compiled cache is hit without rebuilding
+        any expression; values are given at execution time with bind_filters.
+        When paginated, `offset` and `limit` are parameters as well.
+        The load profile (see LoadProfile) is part of the cache key.
+        """
+        clauses, _ = cls._compiled_filters(shape)
+        statement = select(cls).where(*clauses)
+        if order_by:
+            statement = statement.order_by(cls.resolve_order_by(order_by))
+        if options is not None:
+            statement = options.apply(statement, cls)
+        if paginate:
+            statement = statement.offset(bindparam("_offset", type_=Integer)).limit(
+                bindparam("_limit", type_=Integer)
+            )
+        return statement
+
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _compiled_filters(
+        cls, shape: tuple[str, ...]
+    ) -> tuple[list[ColumnExpressionArgument[bool]], list[tuple[str, str, Callable]]]:
+        clauses = []
+        params = []
+        for index, key in enumerate(shape):
+            name, _, operator = key.partition("__")
+            attribute = cls.get_attribute(name)
+            param = f"_filter_{index}"
+            value = bindparam(
+                param, type_=attribute.type, expanding=operator in ("in", "not_in")
+            )
+            if operator in ("not_contains", "not_icontains"):
+                # the LIKE pattern is built in python, like _not_contains does
+                clauses.append(
+                    attribute.notilike(value)
+                    if operator == "not_icontains"
+                    else attribute.notlike(value)
+                )
+                params.append((param, key, _like_pattern))
+                continue
+
+            resolver = cls._operator_resolvers(operator)
+            clauses.extend(resolver(**{name: value}))
+            params.append((param, key, _identity))
+        return clauses, params
+
     @classmethod
     def resolve_order_by(
         cls,
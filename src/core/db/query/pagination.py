@@ -0,0 +1,89 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Sequence
+from typing import Any, Generic, TypeVar
+
+import pydantic_core
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from sqlalchemy import tuple_
+from sqlalchemy.sql._typing import ColumnExpressionArgument
+from sqlmodel import SQLModel, asc, desc
+
+from core.db.query.exceptions import InvalidCursorError
+
+T = TypeVar("T")
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque (url safe) cursor of the keyset values of an item."""
+    raw = json.dumps(pydantic_core.to_jsonable_python(list(values)))
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    try:
+        values = json.loads(urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError("Invalid cursor value.") from e
+
+    if not isinstance(values, list):
+        raise InvalidCursorError("Invalid cursor value.")
+    return values
+
+
+class Keyset:
+    """Keyset (seek method) pagination of a model ordered by a column.
+
+    The `id` column is used as tiebreaker, so the order is total and a page is fetched
+    with `WHERE (column, id) > (:column, :id) ORDER BY column, id LIMIT :limit`,
+    whatever the page depth (unlike OFFSET).
+    Docs: https://use-the-index-luke.com/no-offset
+    """
+
+    def __init__(self, model: type[SQLModel], order_by: str = "id"):
+        self.descending = order_by.startswith("-")
+        attribute = order_by.removeprefix("-")
+        names = [attribute] if attribute == "id" else [attribute, "id"]
+        self.columns = [model.get_attribute(name) for name in names]
+
+    def order_by(self, *, backwards: bool = False) -> list:
+        order = desc if self.descending != backwards else asc
+        return [order(column) for column in self.columns]
+
+    def seek(
+        self, cursor: str, *, backwards: bool = False
+    ) -> ColumnExpressionArgument[bool]:
+        """Filter the items placed after the cursor (or before it when backwards)."""
+        values = decode_cursor(cursor)
+        if len(values) != len(self.columns):
+            raise InvalidCursorError("Invalid cursor value.")
+
+        try:
+            values = [
+                TypeAdapter(column.type.python_type).validate_python(value)
+                for column, value in zip(self.columns, values)
+            ]
+        except (ValidationError, NotImplementedError) as e:
+            raise InvalidCursorError("Invalid cursor value.") from e
+
+        keys = tuple_(*self.columns)
+        if self.descending != backwards:
+            return keys < tuple_(*values)
+        return keys > tuple_(*values)
+
+    def cursor(self, item: SQLModel) -> str:
+        return encode_cursor([getattr(item, column.key) for column in self.columns])
+
+
+class KeysetPage(BaseModel, Generic[T]):
+    """Page of a keyset pagination.
+
+    Same fields as fastapi_pagination CursorPage, the cursors are given back as
+    `after` (next_page) and `before` (previous_page) query parameters.
+    """
+
+    items: Sequence[T]
+    current_page: str | None = Field(None, description="Cursor of the current page")
+    previous_page: str | None = Field(None, description="Cursor for the previous page")
+    next_page: str | None = Field(None, description="Cursor for the next page")
@@ -3,6 +3,8 @@ from functools import lru_cache
 from typing import Any, Callable, Literal, ParamSpec
 
 from sqlalchemy import event as sa_event
+from sqlalchemy import inspect
+from sqlalchemy.engine.base import Connection
 
 from core.db.signals.managers.mixins import (
     MapperEventMixin,
@@ -86,6 +88,40 @@ class SignalManager(MapperEventMixin, SchemaEventMixin, SessionEventMixin):
         sa_event.remove(target, event_name, callback)
         self.event_handlers.remove(event)
 
+    def handlers(self, event_name: EventName, target: Any) -> list[Fn]:
+        """Callbacks registered for the event of the target or of its parent classes."""
+        return [
+            event.callback
+            for event in self.event_handlers
+            if event.name == event_name
+            and (
+                event.target is target
+                or (
+                    isinstance(target, type)
+                    and isinstance(event.target, type)
+                    and issubclass(target, event.target)
+                )
+            )
+        ]
+
+    def dispatch(
+        self,
+        event_name: EventName,
+        model: type,
+        connection: Connection,
+        instances: list[Any],
+    ):
+        """Call the mapper signals of a batch of instances.
+
+        Set-based statements (see DBService.filter_delete) skip the ORM unit of work,
+        so SQLAlchemy doesn't emit the mapper events for them.
+        """
+        self._guard_unknown_event_name(event_name)
+        mapper = inspect(model)
+        for callback in self.handlers(event_name, model):
+            for instance in instances:
+                callback(mapper, connection, instance)
+
 
 @lru_cache
 def get_signal_manager():
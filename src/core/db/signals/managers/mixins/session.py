@@ -1,6 +1,10 @@
+import weakref
 from typing import Callable
 from warnings import deprecated
 
+from sqlalchemy import event as sa_event
+from sqlalchemy.engine.base import Connection
+from sqlalchemy.orm import Session as OrmSession
 from sqlmodel import Session
 from typing_extensions import Any, ParamSpec
 
@@ -8,6 +12,27 @@ from core.db.signals.utils.types import EventCategory
 
 P = ParamSpec("P")
 Fn = Callable[P, Any]
+_ON_COMMIT = "on_commit_callbacks"
+# Session of the transaction in progress on each connection (see on_commit).
+_connection_sessions: weakref.WeakKeyDictionary[Connection, OrmSession] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+@sa_event.listens_for(OrmSession, "after_begin")
+def _bind_connection(session: OrmSession, transaction, connection: Connection):
+    _connection_sessions[connection] = session
+
+
+@sa_event.listens_for(OrmSession, "after_commit")
+def _run_on_commit(session: OrmSession):
+    for callback in session.info.pop(_ON_COMMIT, []):
+        callback()
+
+
+@sa_event.listens_for(OrmSession, "after_rollback")
+def _drop_on_commit(session: OrmSession):
+    session.info.pop(_ON_COMMIT, None)
 
 
 class SessionEventMixin:
@@ -16,6 +41,26 @@ class SessionEventMixin:
     Docs: https://docs.sqlalchemy.org/en/20/orm/events.html#session-events
     """
 
+    @staticmethod
+    def on_commit(connection: Connection, callback: Callable[[], Any]):
+        """Call `callback` once the transaction of the connection is committed.
+
+        Mapper events are sent at flush time, before the commit: side effects which
+        must not be seen before the new rows (e.g. cache invalidations) are deferred
+        here. Callbacks are dropped on rollback, and called at once when the connection
+        is not used by a session.
+
+        Example:
+        >>> @signal_manager.after_insert(User)
+        >>> def user_created(mapper, connection: Connection, target: User):
+        >>>     signal_manager.on_commit(connection, lambda: cache.delete_soon("users"))
+        """
+        session = _connection_sessions.get(connection)
+        if session is None or not session.in_transaction():
+            callback()
+            return
+        session.info.setdefault(_ON_COMMIT, []).append(callback)
+
     @deprecated("Use mapper event 'after_delete instead.'")
     def after_bulk_delete(self, session: Session):
         """Event for after the legacy Query.delete() method has been called.
@@ -1,15 +1,36 @@
 from sqlalchemy.ext.asyncio import AsyncEngine
 
+from apps.chat.services.frames import get_frame_encoder
 from apps.chat.services.manager import ChatWebSocketManager
+from core.auth.hashers import get_hasher_registry
+from core.auth.hashers.pool import shutdown_hasher_executor
+from core.cache import close_redis, stop_listeners
+from core.db.dependencies.session import dispose_engine, dispose_engines
+from core.monitoring.metrics import register_db_pool_metrics
+from settings import settings
 
 websocket_manager = ChatWebSocketManager()
 
 
 async def setup(_: AsyncEngine):
     """Script to be run after fastapi setup."""
+    register_db_pool_metrics()
+    # fails when the default password hasher is not installed
+    get_hasher_registry()
+    # fails when the chat frames encoder is not installed
+    get_frame_encoder(settings.chat_json_encoder)
     await websocket_manager.broadcaster.connect()
 
 
-async def teardown(_: AsyncEngine):
+async def teardown(engine: AsyncEngine):
     """Script to be run before fastapi shutdown."""
+    await websocket_manager.hub.close()
     await websocket_manager.broadcaster.disconnect()
+    # before the engines disposal
+    await websocket_manager.writer.close()
+    await stop_listeners()
+    await close_redis()
+    shutdown_hasher_executor()
+    await dispose_engine(engine)
+    # read replica engines
+    await dispose_engines()
@@ -5,12 +5,15 @@ from settings import settings
 
 from .auth import auth_related_middlewares
 from .cors import cors_middleware
+from .db import db_session_middleware
 from .session import session_middleware
 
 
 def register_middlewares(app: FastAPI):
     cors_middleware(app)
     auth_related_middlewares(app)
+    # wraps the authentication so the user lookup shares the request session
+    db_session_middleware(app)
     session_middleware(app)
     app.add_middleware(ProxyHeadersMiddleware, trusted_hosts=settings.trusted_hosts)
 
@@ -1,52 +1,56 @@
 import re
-from typing import Any, Callable, ParamSpec
+from typing import Iterable
 
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI
 from starlette.middleware.authentication import AuthenticationMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import RedirectResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from core.auth.backend import AuthBackend
 from settings import settings
 
-P = ParamSpec("P")
-Fn = Callable[P, Any]
-
-
-class SessionAuthRequiredMiddleware(BaseHTTPMiddleware):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.exempt_paths = settings.EXEMPT_AUTH_URLS
-
-    def is_exempt_path(self, url_path: str):
-        return any(
-            re.search(re.compile("^" + pattern), url_path) is not None
-            for pattern in self.exempt_paths
-        )
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        current_path = request.url.path
-
-        # Skip exempt paths
-        if self.is_exempt_path(current_path):
-            return await call_next(request)
-
-        if request.url.path.startswith(settings.WEB_ROUTER_PREFIX):
-            # Template view only: Check session auth
-            session_user = (
-                request.session.get(settings.session_user_key)
-                if hasattr(request, "session")
-                else None
-            )
-            if not session_user:
-                redirect_url = settings.SESSION_AUTH_URL
-                referer = request.url.path
-                if referer != redirect_url:
-                    redirect_url += "?referer=" + referer
-
-                response = RedirectResponse(url=redirect_url)
-                return response
-        return await call_next(request)
+
+def compile_exempt_paths(patterns: Iterable[str]) -> re.Pattern:
+    """Single regex matching the paths which begin with one of the patterns."""
+    return re.compile("^(?:" + "|".join(f"(?:{p})" for p in sorted(patterns)) + ")")
+
+
+class SessionAuthRequiredMiddleware:
+    """Redirect the anonymous requests of the template views to the login page.
+
+    The user saved in the session (see auth_utils.session_save_user) is checked,
+    without loading it from the database.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.exempt_paths = compile_exempt_paths(settings.EXEMPT_AUTH_URLS)
+
+    def is_exempt_path(self, url_path: str) -> bool:
+        return self.exempt_paths.match(url_path) is not None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if not path.startswith(settings.WEB_ROUTER_PREFIX) or self.is_exempt_path(path):
+            await self.app(scope, receive, send)
+            return
+
+        # Template view only: Check session auth
+        session = scope.get("session") or {}
+        if not session.get(settings.session_user_key):
+            redirect_url = settings.SESSION_AUTH_URL
+            if path != redirect_url:
+                redirect_url += "?referer=" + path
+
+            response = RedirectResponse(url=redirect_url)
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
 
 
 def auth_related_middlewares(app: FastAPI):
@@ -0,0 +1,43 @@
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.db.dependencies.session import session_scope
+from core.monitoring.metrics import DB_QUERIES_PER_REQUEST
+from core.monitoring.queries import count_queries
+
+
+class DBSessionMiddleware:
+    """Run each http request in a single unit of work (see session_scope).
+
+    Changes are committed before the response is sent if it succeeded (status < 400),
+    otherwise they are rolled back. The number of queries of the request is exported
+    as the http_request_db_queries metric.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            # websockets are long-lived, keep a session per query
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as counter:
+            async with session_scope() as session:
+
+                async def send_wrapper(message: Message):
+                    if message["type"] == "http.response.start":
+                        if message["status"] < 400:
+                            await session.commit()
+                        else:
+                            await session.rollback()
+                    await send(message)
+
+                await self.app(scope, receive, send_wrapper)
+
+        DB_QUERIES_PER_REQUEST.observe(counter.count)
+
+
+def db_session_middleware(app: FastAPI):
+    app.add_middleware(DBSessionMiddleware)
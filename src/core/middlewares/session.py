@@ -1,10 +1,128 @@
+import json
+from typing import Any
+
 from fastapi import FastAPI
+from starlette.datastructures import MutableHeaders
 from starlette.middleware.sessions import SessionMiddleware
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from core.auth.sessions import (
+    delete_session,
+    load_session,
+    new_session_id,
+    save_session,
+    session_user_id,
+    touch_user_sessions,
+)
+from core.cache.redis import cache_url
 from settings import settings
 
 
+def _dump(data: dict[str, Any]) -> str:
+    return json.dumps(data, sort_keys=True)
+
+
+class RedisSessionMiddleware:
+    """Sessions stored in redis, the cookie only holds the session id.
+
+    Sessions expire after `max_age` seconds without requests (sliding expiration).
+    The session id changes when the user of the session changes (login), and the
+    sessions of a user can be deleted at once, see core.auth.sessions.revoke_user_sessions.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        session_cookie: str,
+        max_age: int,
+        same_site: str = "lax",
+        https_only: bool = False,
+        domain: str | None = None,
+    ):
+        self.app = app
+        self.session_cookie = session_cookie
+        self.max_age = max_age
+        self.security_flags = f"httponly; samesite={same_site}"
+        if https_only:
+            self.security_flags += "; secure"
+        if domain is not None:
+            self.security_flags += f"; domain={domain}"
+
+    def _cookie(self, value: str, max_age: int) -> str:
+        return f"{self.session_cookie}={value}; path=/; Max-Age={max_age}; {self.security_flags}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        session_id = HTTPConnection(scope).cookies.get(self.session_cookie)
+        initial = await load_session(session_id) if session_id else None
+        if initial is None:
+            session_id = None
+        scope["session"] = dict(initial or {})
+        initial_dump = _dump(initial or {})
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                cookie = await self._commit(session_id, initial, initial_dump, scope)
+                if cookie is not None:
+                    MutableHeaders(scope=message).append("Set-Cookie", cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _commit(
+        self,
+        session_id: str | None,
+        initial: dict[str, Any] | None,
+        initial_dump: str,
+        scope: Scope,
+    ) -> str | None:
+        """Save the changes of the session, return the session cookie to set."""
+        session = scope["session"]
+        initial_user = session_user_id(initial or {})
+        if not session:
+            if session_id is None:
+                return None
+            # cleared (logout)
+            await delete_session(session_id, initial_user)
+            return self._cookie("null", 0)
+
+        if _dump(session) == initial_dump:
+            if initial_user is not None:
+                await touch_user_sessions(initial_user)
+            # sliding expiration of the cookie too
+            return self._cookie(session_id, self.max_age)
+
+        new_id = session_id
+        if session_id is None or session_user_id(session) != initial_user:
+            # new session, or login: don't keep an id known before
+            new_id = new_session_id()
+            if session_id is not None:
+                await delete_session(session_id, initial_user)
+
+        await save_session(new_id, session)
+        return self._cookie(new_id, self.max_age)
+
+
 def session_middleware(app: FastAPI):
+    if settings.session_backend == "redis":
+        if not cache_url():
+            raise RuntimeError("The redis session backend requires settings.cache_url.")
+
+        app.add_middleware(
+            RedisSessionMiddleware,
+            session_cookie=settings.session_cookie,
+            max_age=settings.max_age,
+            https_only=settings.cookie_secure,
+            same_site=settings.cookie_samesite,
+            domain=settings.cookie_domain,
+        )
+        return
+
     app.add_middleware(
         SessionMiddleware,
         secret_key=settings.secret_key,
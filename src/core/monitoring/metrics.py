@@ -0,0 +1,119 @@
+from functools import lru_cache
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy import QueuePool, make_url
+
+from core.db.dependencies.replicas import replica_states
+from core.db.dependencies.session import iter_engines
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    "http_request_db_queries",
+    "Number of database queries run by an http request.",
+    buckets=(0, 1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 64),
+)
+CHAT_ROOM_SUBSCRIPTIONS = Gauge(
+    "chat_room_subscriptions",
+    "Upstream (broadcaster) subscriptions of the chat rooms, one per room with local websockets.",
+)
+CHAT_SEND_QUEUE_FRAMES = Gauge(
+    "chat_send_queue_frames",
+    "Chat frames waiting in the websockets send queues of the worker.",
+)
+CHAT_DROPPED_FRAMES = Counter(
+    "chat_dropped_frames",
+    "Chat frames dropped because of a full websocket send queue (slow client).",
+    labelnames=["policy"],
+)
+CHAT_PENDING_MESSAGES = Gauge(
+    "chat_pending_messages",
+    "Chat messages published but not written yet (write-behind buffer).",
+)
+CHAT_DROPPED_MESSAGES = Counter(
+    "chat_dropped_messages",
+    "Chat messages published but never written (constraint violation, e.g. deleted room).",
+)
+IDENTITY_LOOKUPS = Counter(
+    "auth_identity_lookups",
+    "Lookups of the authenticated user (session user or token), once per request at most.",
+    labelnames=["source"],
+)
+LOGIN_ATTEMPTS = Counter(
+    "auth_login_attempts",
+    "Login attempts checked by the login rate limiter.",
+    labelnames=["outcome"],
+)
+LOGIN_RATE_LIMITED = Counter(
+    "auth_login_rate_limited",
+    "Login attempts rejected by the login rate limiter, by reached limit.",
+    labelnames=["scope"],
+)
+PASSWORD_HASHER_QUEUE = Gauge(
+    "password_hasher_queue_depth",
+    "Password hash/verify jobs waiting for a thread of the hashers pool.",
+)
+PASSWORD_HASHER_SECONDS = Histogram(
+    "password_hasher_seconds",
+    "Duration of the password hash/verify jobs in the hashers pool.",
+    labelnames=["operation"],
+    buckets=(0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0),
+)
+
+
+class DBPoolCollector(Collector):
+    """Export the connection pool state of the process-wide database engines, and the replicas lag.
+
+    Values are read at scrape time, see settings.METRICS_PATH endpoint.
+    """
+
+    def collect(self):
+        labels = ["database", "host"]
+        size = GaugeMetricFamily(
+            "db_pool_size", "Number of connections kept in the pool.", labels=labels
+        )
+        checked_in = GaugeMetricFamily(
+            "db_pool_checked_in",
+            "Number of idle connections available in the pool.",
+            labels=labels,
+        )
+        checked_out = GaugeMetricFamily(
+            "db_pool_checked_out",
+            "Number of connections currently in use.",
+            labels=labels,
+        )
+        overflow = GaugeMetricFamily(
+            "db_pool_overflow",
+            "Number of connections opened beyond the pool size.",
+            labels=labels,
+        )
+        for engine in iter_engines():
+            pool = engine.pool
+            if not isinstance(pool, QueuePool):
+                continue
+
+            label_values = [engine.url.database or "", engine.url.host or ""]
+            size.add_metric(label_values, pool.size())
+            checked_in.add_metric(label_values, pool.checkedin())
+            checked_out.add_metric(label_values, pool.checkedout())
+            overflow.add_metric(label_values, pool.overflow())
+
+        replica_lag = GaugeMetricFamily(
+            "db_replica_lag_seconds",
+            "Replication lag of the read replicas at their last health check.",
+            labels=labels,
+        )
+        for state in replica_states():
+            if state.lag is not None:
+                url = make_url(state.uri)
+                replica_lag.add_metric([url.database or "", url.host or ""], state.lag)
+
+        yield from (size, checked_in, checked_out, overflow, replica_lag)
+
+
+@lru_cache
+def register_db_pool_metrics() -> DBPoolCollector:
+    """Register the database pool collector once per process."""
+    collector = DBPoolCollector()
+    REGISTRY.register(collector)
+    return collector
@@ -0,0 +1,39 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass
+class QueryCounter:
+    count: int = 0
+
+
+# Counter of the current request, see count_queries().
+_query_counter: ContextVar[QueryCounter | None] = ContextVar(
+    "query_counter", default=None
+)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """Count the database queries run in this context (asyncio tasks it starts included)."""
+    counter = QueryCounter()
+    token = _query_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _query_counter.reset(token)
+
+
+def _on_cursor_execute(*_):
+    if (counter := _query_counter.get()) is not None:
+        counter.count += 1
+
+
+def instrument_engine(engine: AsyncEngine):
+    # sqlalchemy runs the driver calls in greenlets sharing the calling task context
+    event.listen(engine.sync_engine, "before_cursor_execute", _on_cursor_execute)
@@ -0,0 +1,78 @@
+import hashlib
+import time
+from dataclasses import dataclass
+
+from redis.exceptions import RedisError
+
+from core.cache import get_redis, redis_key
+from core.monitoring.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Sliding window counter: the hits of the previous window are weighted by the part
+# of it still inside the sliding window. Nothing is counted once a limit is reached.
+# KEYS: (current window, previous window) key pairs
+# ARGV: elapsed part of the current window, keys ttl, one limit per key pair
+_HIT_SCRIPT = """
+local elapsed = tonumber(ARGV[1])
+for i = 1, #KEYS, 2 do
+    local current = tonumber(redis.call('GET', KEYS[i]) or '0')
+    local previous = tonumber(redis.call('GET', KEYS[i + 1]) or '0')
+    if current + previous * (1 - elapsed) >= tonumber(ARGV[2 + (i + 1) / 2]) then
+        return (i + 1) / 2
+    end
+end
+for i = 1, #KEYS, 2 do
+    redis.call('INCR', KEYS[i])
+    redis.call('EXPIRE', KEYS[i], ARGV[2])
+end
+return 0
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    scope: str
+    identifier: str
+    limit: int
+
+    @property
+    def key(self) -> str:
+        digest = hashlib.sha256(self.identifier.encode()).hexdigest()[:32]
+        return f"{self.scope}:{digest}"
+
+
+class SlidingWindowLimiter:
+    """At most `limit` hits per sliding window of `window` seconds, counted in redis.
+
+    Shared by all the workers. When redis can not be reached, hits are allowed.
+    """
+
+    def __init__(self, name: str, window: int):
+        self.name = name
+        self.window = window
+
+    def _keys(self, rate_limit: RateLimit, now: float) -> tuple[str, str]:
+        current = int(now // self.window)
+        prefix = redis_key(f"ratelimit:{self.name}:{rate_limit.key}")
+        return f"{prefix}:{current}", f"{prefix}:{current - 1}"
+
+    async def hit(self, *rate_limits: RateLimit) -> RateLimit | None:
+        """Count a hit in all the rate limits, unless one of them is reached: return it."""
+        if (redis := get_redis()) is None:
+            return None
+
+        now = time.time()
+        keys = [key for limit in rate_limits for key in self._keys(limit, now)]
+        elapsed = (now % self.window) / self.window
+        try:
+            # sent by its sha (EVALSHA) once loaded
+            exceeded = await redis.register_script(_HIT_SCRIPT)(
+                keys=keys,
+                args=[elapsed, self.window * 2]
+                + [rate_limit.limit for rate_limit in rate_limits],
+            )
+        except (RedisError, OSError) as e:
+            logger.warning("Rate limiter %s: redis script failed: %s", self.name, e)
+            return None
+        return rate_limits[exceeded - 1] if exceeded else None
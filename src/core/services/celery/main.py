@@ -50,7 +50,11 @@ def _scheduler_configs(celery_instance: Celery):
         "debug-task-every-5-minutes": {
             "task": "core.tasks.basic.liveness_task",
             "schedule": crontab(minute=5),
-        }
+        },
+        "purge-expired-tokens-every-hour": {
+            "task": "core.tasks.tokens.purge_expired_tokens_task",
+            "schedule": crontab(minute=0),
+        },
     }
 
 
@@ -1,7 +1,9 @@
 from .basic import liveness_task
 from .fixtures import load_fixtures_task
+from .tokens import purge_expired_tokens_task
 
 __all__ = [
     "liveness_task",
     "load_fixtures_task",
+    "purge_expired_tokens_task",
 ]
@@ -1,7 +1,6 @@
-import asyncio
-
 from sqlalchemy.exc import IntegrityError
 
+from core.db.dependencies.session import asyncio_run
 from core.monitoring.logger import get_logger
 from core.services.celery import celery_app
 from core.services.runners import FixtureRunner
@@ -22,7 +21,7 @@ def load_fixtures_task(
     )
     try:
         runner = FixtureRunner(logger=_logger)
-        asyncio.run(runner(app_names=apps, fixture_names=names, fixture_paths=paths))
+        asyncio_run(runner(app_names=apps, fixture_names=names, fixture_paths=paths))
         return runner.loader.count_created
     except IntegrityError as e:
         raise SQLAlchemyIntegrityError(str(e)) from None
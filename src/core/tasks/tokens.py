@@ -0,0 +1,14 @@
+from apps.authentication.models import JWTToken
+from core.db.dependencies.session import asyncio_run
+from core.monitoring.logger import get_logger
+from core.services.celery import celery_app
+
+_logger = get_logger(__name__)
+
+
+@celery_app.task()
+def purge_expired_tokens_task(batch_size: int = 1000) -> int:
+    """Delete the tokens expired for more than settings.TOKEN_REFRESH_DELAY_MINUTES."""
+    count = asyncio_run(JWTToken.purge_expired(batch_size=batch_size))
+    _logger.info(f"Task: {count} expired tokens purged.")
+    return count
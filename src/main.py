@@ -19,16 +19,16 @@ from core.services import celery
 from core.services.files import apps as file_apps
 from settings import settings
 
-_engine = get_engine()
-
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     sentry_init()
     setup_signals()
-    await setup(_engine)
+    # process-wide pooled engine, shared by all the requests of this worker
+    engine = get_engine()
+    await setup(engine)
     yield
-    await teardown(_engine)
+    await teardown(engine)
 
 
 app = FastAPI(lifespan=lifespan, debug=settings.DEBUG)
@@ -0,0 +1,30 @@
+"""Add chat message keyset pagination index
+
+Revision ID: 4fa45f1f3373
+Revises: 23f50e2c858d
+Create Date: 2026-10-18 10:12:41.208413
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4fa45f1f3373"
+down_revision: Union[str, None] = "23f50e2c858d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_chatmessage_room_id_created_at_id",
+        "chatmessage",
+        ["room_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chatmessage_room_id_created_at_id", table_name="chatmessage")
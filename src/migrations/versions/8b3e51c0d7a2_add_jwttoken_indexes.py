@@ -0,0 +1,40 @@
+"""Add jwttoken user and access token indexes
+
+Revision ID: 8b3e51c0d7a2
+Revises: 4fa45f1f3373
+Create Date: 2026-10-18 14:05:27.513904
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8b3e51c0d7a2"
+down_revision: Union[str, None] = "4fa45f1f3373"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # a single token per user: keep the last issued one
+    op.execute(
+        """
+        DELETE FROM jwttoken
+        WHERE user_id IS NOT NULL AND id NOT IN (
+            SELECT DISTINCT ON (user_id) id FROM jwttoken
+            WHERE user_id IS NOT NULL
+            ORDER BY user_id, created_at DESC, id DESC
+        )
+        """
+    )
+    op.create_index("ix_jwttoken_user_id", "jwttoken", ["user_id"], unique=True)
+    op.create_index(
+        "ix_jwttoken_access_token", "jwttoken", ["access_token"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jwttoken_access_token", table_name="jwttoken")
+    op.drop_index("ix_jwttoken_user_id", table_name="jwttoken")
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from settings.constants import AppConstants
 from settings.csrf import CSRFSettings
@@ -14,6 +15,89 @@ class Settings(AppConstants, CSRFSettings, SecretSettings):
     postgres_db: str = "fastapi"
     postgres_host: str = "localhost"
     postgres_port: int = 5432
+    """
+    Connection pool of each worker process.
+    Docs: https://docs.sqlalchemy.org/en/20/core/pooling.html#sqlalchemy.pool.QueuePool
+    """
+    postgres_pool_enabled: bool = True
+    postgres_pool_size: int = 5
+    postgres_max_overflow: int = 10
+    postgres_pool_recycle: int = 1800  # seconds
+    postgres_pool_timeout: int = 30  # seconds
+    """
+    Maximum number of connections the application is allowed to open on the database.
+    When set, it is divided between the server workers to size the pool of each worker.
+    """
+    postgres_max_connections: int | None = None
+    # number of server worker processes, same variable as uvicorn/fastapi run --workers
+    web_concurrency: int = 1
+    """
+    Read replicas (postgresql+asyncpg:// uris), the read-only queries are sent to them.
+    A replica is used while its last health check, run every check interval (seconds),
+    found it reachable and less than max lag seconds behind the primary.
+    """
+    postgres_replica_uris: list[str] = []
+    postgres_replica_max_lag: float = 5.0  # seconds
+    postgres_replica_check_interval: float = 10.0  # seconds
+    postgres_replica_check_timeout: float = 2.0  # seconds
+
+    # shared cache (redis url), the celery broker is used when empty
+    cache_url: str = ""
+    cache_socket_timeout: float = 0.5  # seconds
+    # prepended to the redis keys and channels, to share a redis database
+    cache_key_prefix: str = ""
+    """
+    Validation cache of the authentication tokens (with their user), in process and in redis.
+    A token is cached for token_cache_ttl seconds at most, and token_cache_local_ttl
+    seconds in each worker. Revoked tokens and changed users are dropped at once from
+    the other workers (pub/sub).
+    The session users are read from the same cache.
+    """
+    token_cache_enabled: bool = True
+    token_cache_size: int = 10_000
+    token_cache_ttl: int = 300  # seconds
+    token_cache_local_ttl: int = 30  # seconds
+    """
+    Stateless mode: tokens are verified with their signature and expiration instead of
+    the tokens table, users are resolved from the token subject through the cache above.
+    Revoked tokens (logout, refresh) are denied with a redis denylist, when it can not
+    be checked the tokens table is used.
+    """
+    jwt_stateless: bool = False
+    """
+    Sessions backend: "cookie" (signed cookie) or "redis" (settings.cache_url, the
+    cookie only holds the session id). Redis sessions can be revoked, see
+    core.auth.sessions.revoke_user_sessions.
+    """
+    session_backend: Literal["cookie", "redis"] = "cookie"
+    """
+    Effective permission names of each user (direct and through its groups), in process
+    and in redis. Entries are deleted when the permissions or groups of the user change,
+    other workers are told at once (pub/sub).
+    """
+    permission_cache_enabled: bool = True
+    permission_cache_size: int = 10_000
+    permission_cache_ttl: int = 3600  # seconds
+    permission_cache_local_ttl: int = 30  # seconds
+    """
+    Metadata of the chat rooms (name, visibility, owner, member ids), in process and in
+    redis, for the access checks and the websocket room switches. Entries are deleted
+    when the room or its members change, other workers are told at once (pub/sub).
+    """
+    room_cache_enabled: bool = True
+    room_cache_size: int = 10_000
+    room_cache_ttl: int = 3600  # seconds
+    room_cache_local_ttl: int = 60  # seconds
+    """
+    Login rate limits, sliding windows of login_rate_limit_window seconds counted in
+    redis: per client ip, per username and for all the logins. Rejected logins
+    (429) don't reach the database nor the password hasher. Not applied without redis.
+    """
+    login_rate_limit_enabled: bool = True
+    login_rate_limit_window: int = 60  # seconds
+    login_rate_limit_per_ip: int = 20
+    login_rate_limit_per_username: int = 10
+    login_rate_limit_global: int = 1000
 
     # sentry config
     sentry_send_pii: bool = False
@@ -39,6 +123,30 @@ class Settings(AppConstants, CSRFSettings, SecretSettings):
     """
     celery_worker_heartbeat: int = 120  # Send a heartbeat every 120 seconds by default
 
+    # encoder of the chat websocket frames, "orjson" and "msgspec" are extras
+    chat_json_encoder: Literal["json", "orjson", "msgspec"] = "json"
+    """
+    Frames waiting to be sent on each chat websocket. When the queue of a slow client
+    is full, "drop_oldest" drops its oldest frames, "disconnect" drops the new ones and
+    closes the websocket after chat_slow_consumer_timeout seconds. Whatever the policy,
+    a websocket which does not read a frame for chat_slow_consumer_timeout seconds
+    is closed.
+    """
+    chat_send_queue_size: int = 100
+    chat_slow_consumer_policy: Literal["drop_oldest", "disconnect"] = "drop_oldest"
+    chat_slow_consumer_timeout: float = 10.0  # seconds
+    """
+    Chat messages are published at once and written afterwards (write-behind), by
+    batches of chat_write_batch_size rows at least every chat_write_flush_interval
+    seconds. Their ids are taken from the sequence by blocks of chat_id_block_size.
+    Beyond chat_write_max_pending messages not written yet, messages are written
+    before they are published.
+    """
+    chat_write_batch_size: int = 500
+    chat_write_flush_interval: float = 0.2  # seconds
+    chat_id_block_size: int = 100
+    chat_write_max_pending: int = 10_000
+
     # for http headers: X-Forwarded-Proto etc.
     trusted_hosts: list[str] = ["*"]
 
@@ -12,12 +12,32 @@ class SecretSettings(AppBaseSettings):
     # security
     _PASSWORD_HASHERS = [
         "core.auth.hashers.bcrypt.BCryptPasswordHasher",
+        "core.auth.hashers.argon2.Argon2PasswordHasher",
+        "core.auth.hashers.scrypt.ScryptPasswordHasher",
     ]
     """
     Choose one of the listed password hashes in the PASSWORD_HASHERS settings. default take the first one.
+    Passwords hashed by the other ones (or with another cost) are hashed again with the
+    chosen one at the next successful login.
     """
     password_hasher_index: int = 0
     """
+    Cost of the hashers, higher is slower to hash and to brute force.
+    argon2 memory cost in KiB, requires the argon2-cffi package (argon2 extra).
+    """
+    bcrypt_rounds: int = 12
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65_536
+    argon2_parallelism: int = 4
+    scrypt_n: int = 2**14
+    scrypt_r: int = 8
+    scrypt_p: int = 1
+    """
+    Hashing runs in a thread pool (bcrypt releases the GIL), out of the event loop.
+    Keep it below the number of CPUs: the event loop needs one.
+    """
+    password_hasher_workers: int = 2
+    """
     Used to generate/decode JWT tokens
     """
     algorithm: str = "HS256"
@@ -25,3 +45,7 @@ class SecretSettings(AppBaseSettings):
     @property
     def password_hasher(self):
         return self._PASSWORD_HASHERS[self.password_hasher_index]
+
+    @property
+    def password_hashers(self) -> list[str]:
+        return list(self._PASSWORD_HASHERS)
@@ -0,0 +1,150 @@
+import asyncio
+import time
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+from prometheus_client import REGISTRY
+
+from apps.user.models import User
+from core.auth.hashers import (
+    BCryptPasswordHasher,
+    ScryptPasswordHasher,
+    get_async_hasher,
+    get_hasher_registry,
+)
+from core.unittest.async_case import AsyncTestCase
+
+
+async def test_pooled_hasher():
+    hasher = get_async_hasher(BCryptPasswordHasher)
+    hashed = await hasher.hash("secret")
+
+    assert BCryptPasswordHasher.identify(hashed)
+    assert not BCryptPasswordHasher.identify("secret")
+    assert await hasher.verify("secret", hashed)
+    assert not await hasher.verify("wrong", hashed)
+    assert REGISTRY.get_sample_value("password_hasher_queue_depth") == 0
+
+
+async def test_pooled_hasher_does_not_block_the_event_loop():
+    hasher = get_async_hasher(BCryptPasswordHasher)
+    hashed = BCryptPasswordHasher.hash("secret")
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.001)
+            ticks += 1
+
+    ticker = asyncio.create_task(tick())
+    start = time.perf_counter()
+    await asyncio.gather(*[hasher.verify("secret", hashed) for _ in range(4)])
+    duration = time.perf_counter() - start
+    ticker.cancel()
+
+    # the timer kept running while the passwords were verified
+    assert ticks >= duration / 0.001 / 4
+
+
+async def test_user_with_hashed_password():
+    data = await User.with_hashed_password({"username": "hasher", "password": "pwd"})
+    assert BCryptPasswordHasher.identify(data["password"])
+
+    user = User(**data, first_name="Hash", last_name="Er")
+    # not hashed twice
+    assert user.password == data["password"]
+    assert await user.acheck_password("pwd")
+    assert user.check_password("pwd")
+
+    await user.aset_password("new")
+    assert await user.acheck_password("new")
+
+
+def test_hash_shaped_password_is_hashed():
+    password = "scrypt$a$b$c$d$e"
+    user = User(username="shape", first_name="a", last_name="b", password=password)
+
+    assert user.password != password
+    assert BCryptPasswordHasher.identify(user.password)
+    assert user.check_password(password)
+
+
+@pytest.mark.parametrize(
+    "hasher", [BCryptPasswordHasher, ScryptPasswordHasher], ids=["bcrypt", "scrypt"]
+)
+@pytest.mark.parametrize(
+    "malformed", ["scrypt$a$b$c$d$e", "scrypt$3$8$1$c2FsdA==$a2V5", "$2b$12$short", ""]
+)
+def test_malformed_hashes(hasher, malformed):
+    assert not hasher.verify("secret", malformed)
+    assert not hasher.needs_rehash(malformed)
+
+
+def test_scrypt_hasher(settings):
+    hashed = ScryptPasswordHasher.hash("secret")
+
+    assert ScryptPasswordHasher.identify(hashed)
+    assert not BCryptPasswordHasher.identify(hashed)
+    assert ScryptPasswordHasher.verify("secret", hashed)
+    assert not ScryptPasswordHasher.verify("wrong", hashed)
+    assert not ScryptPasswordHasher.needs_rehash(hashed)
+    with patch.object(settings, "scrypt_n", settings.scrypt_n * 2):
+        assert ScryptPasswordHasher.needs_rehash(hashed)
+
+
+def test_argon2_hasher(settings):
+    pytest.importorskip("argon2")
+    from core.auth.hashers.argon2 import Argon2PasswordHasher
+
+    hashed = Argon2PasswordHasher.hash("secret")
+    assert Argon2PasswordHasher.identify(hashed)
+    assert Argon2PasswordHasher.verify("secret", hashed)
+    assert not Argon2PasswordHasher.verify("wrong", hashed)
+    with patch.object(settings, "argon2_time_cost", settings.argon2_time_cost + 1):
+        assert Argon2PasswordHasher.needs_rehash(hashed)
+
+
+def test_hasher_registry(settings):
+    registry = get_hasher_registry()
+    bcrypt_hash = BCryptPasswordHasher.hash("secret")
+    scrypt_hash = ScryptPasswordHasher.hash("secret")
+
+    assert registry.default is BCryptPasswordHasher
+    assert registry.hasher_for(scrypt_hash) is ScryptPasswordHasher
+    assert registry.identify("secret") is None
+    assert not registry.needs_rehash(bcrypt_hash)
+    assert registry.needs_rehash(scrypt_hash)
+    with patch.object(settings, "bcrypt_rounds", settings.bcrypt_rounds + 1):
+        assert registry.needs_rehash(bcrypt_hash)
+
+
+class TestRehashOnLogin(AsyncTestCase):
+    fixtures = ["users"]
+
+    async def test_stale_hash_upgraded(self, app):
+        user = await User.get(username="test")
+        user.password = ScryptPasswordHasher.hash("test")
+        await user.save()
+
+        data = {"username": "test", "password": "test"}
+        response = await self.client.post(app.url_path_for("jwt-auth"), data=data)
+        assert response.status_code == HTTPStatus.OK
+
+        user = await User.get(username="test")
+        assert BCryptPasswordHasher.identify(user.password)
+        assert user.check_password("test")
+
+
+def test_unavailable_default_hasher(settings):
+    get_hasher_registry.cache_clear()
+    try:
+        with patch(
+            "core.auth.hashers.registry.load_hasher",
+            side_effect=ImportError("No module named 'argon2'"),
+        ):
+            with pytest.raises(RuntimeError, match="not available"):
+                get_hasher_registry()
+    finally:
+        get_hasher_registry.cache_clear()
@@ -0,0 +1,36 @@
+from http import HTTPStatus
+
+from prometheus_client import REGISTRY
+
+from apps.user.models import User
+from core.unittest.async_case import AsyncTestCase
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestRequestIdentity(AsyncTestCase):
+    fixtures = ["users"]
+
+    async def async_set_up(self):
+        await super().async_set_up()
+        self.user = await User.get(username="test")
+
+    async def test_token_resolved_once_per_request(self, app):
+        await self.client.user_login(self.user)
+        lookups = sample("auth_identity_lookups_total", source="token")
+        requests = sample("http_request_db_queries_count")
+
+        # AuthBackend, oauth2_scheme and current_user share the same lookup
+        response = await self.client.get(app.url_path_for("user-own-groups"))
+        assert response.status_code == HTTPStatus.OK
+
+        assert sample("auth_identity_lookups_total", source="token") == lookups + 1
+        assert sample("http_request_db_queries_count") == requests + 1
+
+    async def test_anonymous_request(self, app):
+        lookups = sample("auth_identity_lookups_total", source="token")
+        response = await self.client.get(app.url_path_for("user-own-groups"))
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        assert sample("auth_identity_lookups_total", source="token") == lookups
@@ -0,0 +1,77 @@
+import asyncio
+import uuid
+from unittest.mock import patch
+
+from core.cache import TieredCache, TTLCache, stop_listeners
+
+
+def test_ttl_cache_lru_eviction():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    assert cache.get("a") == 1
+
+    # "b" is the least recently used entry
+    cache.set("c", 3, ttl=60)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expiration():
+    cache = TTLCache()
+    with patch("core.cache.memory.time.monotonic", return_value=100):
+        cache.set("a", 1, ttl=10)
+        cache.set("b", 2, ttl=0)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+
+    with patch("core.cache.memory.time.monotonic", return_value=110):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+async def test_tiered_cache_shared_tier():
+    namespace = f"test:{uuid.uuid4().hex}"
+    cache = TieredCache(namespace, local_ttl=30)
+    other_worker_cache = TieredCache(namespace, local_ttl=30)
+
+    await cache.set("key", {"id": 1}, ttl=60)
+    assert await other_worker_cache.get("key") == {"id": 1}
+
+    await cache.delete("key")
+    assert await cache.get("key") is None
+    # still in the other worker memory until its local ttl
+    assert await other_worker_cache.get("key") == {"id": 1}
+    other_worker_cache.clear_local()
+    assert await other_worker_cache.get("key") is None
+
+
+async def test_tiered_cache_without_redis(settings):
+    cache = TieredCache(f"test:{uuid.uuid4().hex}")
+    with (
+        patch.object(settings, "cache_url", ""),
+        patch.object(settings, "celery_broker", ""),
+    ):
+        await cache.set("key", [1, 2], ttl=60)
+        assert await cache.get("key") == [1, 2]
+
+
+async def test_tiered_cache_broadcast_deletions():
+    namespace = f"test:{uuid.uuid4().hex}"
+    cache = TieredCache(namespace, local_ttl=30, broadcast_deletions=True)
+    other_worker_cache = TieredCache(namespace, local_ttl=30, broadcast_deletions=True)
+
+    await cache.set("key", {"id": 1}, ttl=60)
+    assert await other_worker_cache.get("key") == {"id": 1}
+    # the other worker subscribes in the background
+    await asyncio.sleep(0.5)
+
+    await cache.delete("key")
+    for _ in range(50):
+        if other_worker_cache.local.get("key") is None:
+            break
+        await asyncio.sleep(0.01)
+    assert other_worker_cache.local.get("key") is None
+    await stop_listeners()
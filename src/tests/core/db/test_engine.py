@@ -0,0 +1,77 @@
+from unittest.mock import patch
+
+from sqlalchemy import AsyncAdaptedQueuePool, NullPool
+
+from core.db.dependencies.session import (
+    asyncio_run,
+    dispose_engine,
+    get_engine,
+    iter_engines,
+    pool_options,
+)
+from core.monitoring.metrics import DBPoolCollector
+
+
+async def test_get_engine_is_shared(settings):
+    with patch.object(settings, "postgres_pool_enabled", True):
+        engine = get_engine()
+        assert engine is get_engine()
+        assert isinstance(engine.pool, AsyncAdaptedQueuePool)
+        assert engine in list(iter_engines())
+
+        # dedicated engine when options are given
+        assert get_engine(echo=True) is not engine
+
+        await dispose_engine(engine)
+        assert engine not in list(iter_engines())
+
+
+def test_asyncio_run_disposes_its_engines():
+    async def open_engine():
+        return get_engine()
+
+    # e.g. a celery task: the engine of its event loop is not kept
+    engine = asyncio_run(open_engine())
+    assert engine not in list(iter_engines())
+
+
+def test_pool_options_disabled(settings):
+    with patch.object(settings, "postgres_pool_enabled", False):
+        assert pool_options() == {"poolclass": NullPool}
+
+
+def test_pool_options_per_worker_sizing(settings):
+    with (
+        patch.object(settings, "postgres_pool_enabled", True),
+        patch.object(settings, "postgres_pool_size", 10),
+        patch.object(settings, "postgres_max_overflow", 10),
+        patch.object(settings, "postgres_max_connections", 24),
+        patch.object(settings, "web_concurrency", 4),
+    ):
+        options = pool_options()
+
+    assert options["poolclass"] is AsyncAdaptedQueuePool
+    # 24 connections shared by 4 workers
+    assert options["pool_size"] == 6
+    assert options["max_overflow"] == 0
+
+
+async def test_db_pool_collector(settings):
+    with patch.object(settings, "postgres_pool_enabled", True):
+        engine = get_engine()
+        metrics = {metric.name: metric for metric in DBPoolCollector().collect()}
+        await dispose_engine(engine)
+
+    assert set(metrics) == {
+        "db_pool_size",
+        "db_pool_checked_in",
+        "db_pool_checked_out",
+        "db_pool_overflow",
+        "db_replica_lag_seconds",
+    }
+    [sample] = [
+        s
+        for s in metrics["db_pool_size"].samples
+        if s.labels["database"] == settings.postgres_db
+    ]
+    assert sample.value == settings.postgres_pool_size
@@ -0,0 +1,62 @@
+import pytest
+
+from apps.user.models import User
+from core.db.query.exceptions import InvalidCursorError
+from core.db.query.pagination import decode_cursor, encode_cursor
+from core.unittest.async_case import AsyncTestCase
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(["2025-01-01T10:00:00", 3])) == [
+        "2025-01-01T10:00:00",
+        3,
+    ]
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not a cursor")
+
+
+class TestKeysetPagination(AsyncTestCase):
+    fixtures = ["users"]
+
+    async def test_paginate_forward_and_backward(self):
+        users = sorted(
+            await User.all(), key=lambda u: (u.created_at, u.id), reverse=True
+        )
+        expected = [user.id for user in users]
+        assert len(expected) > 2
+
+        first = await User.paginate(order_by="-created_at", limit=2)
+        assert [user.id for user in first.items] == expected[:2]
+        assert first.previous_page is None
+        assert first.next_page is not None
+
+        second = await User.paginate(
+            order_by="-created_at", limit=2, after=first.next_page
+        )
+        assert [user.id for user in second.items] == expected[2:4]
+        assert second.previous_page is not None
+
+        back = await User.paginate(
+            order_by="-created_at", limit=2, before=second.previous_page
+        )
+        assert [user.id for user in back.items] == expected[:2]
+        assert back.previous_page is None
+
+    async def test_paginate_all_pages(self):
+        ids, cursor = [], None
+        while True:
+            page = await User.paginate(limit=1, after=cursor)
+            ids.extend(user.id for user in page.items)
+            if (cursor := page.next_page) is None:
+                break
+
+        assert ids == sorted(user.id for user in await User.all())
+
+    async def test_paginate_invalid_cursor(self, app):
+        with pytest.raises(InvalidCursorError):
+            await User.paginate(order_by="created_at", after=encode_cursor(["x", 1]))
+
+        response = await self.client.get(
+            app.url_path_for("user-list-cursor"), params={"after": "not a cursor"}
+        )
+        assert response.status_code == 400
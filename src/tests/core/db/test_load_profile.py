@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from apps.authorization.models import Group
+from apps.user.models import User
+from apps.user.utils.types import UserRole
+from core.db.query import LoadProfile
+from core.unittest.async_case import AsyncTestCase
+
+
+def test_load_profile_unknown_relationship():
+    with pytest.raises(AttributeError):
+        LoadProfile(load=("unknown",)).options(User)
+
+    with pytest.raises(AttributeError):
+        LoadProfile(load=("groups.unknown",)).options(User)
+
+
+def test_load_profile_is_a_cache_key():
+    profile = LoadProfile(load=("groups",))
+    shape = User.filters_shape(username="spider")
+    assert User.compiled_statement(shape, options=profile) is User.compiled_statement(
+        shape, options=LoadProfile(load=("groups",))
+    )
+    assert User.compiled_statement(shape, options=profile) is not (
+        User.compiled_statement(shape)
+    )
+
+
+class TestLoadProfile(AsyncTestCase):
+    fixtures = ["users"]
+
+    async def async_set_up(self):
+        await super().async_set_up()
+        self.admin = await User.get(role=UserRole.admin)
+        self.group = await Group(
+            name="administrators",
+            target_table=User.table_name(),
+            display_name="Administrators",
+        ).save()
+        await self.group.add_user(self.admin)
+
+    async def test_default_loading(self):
+        user = await User.get(id=self.admin.id)
+        assert [group.id for group in user.groups] == [self.group.id]
+
+    async def test_not_loaded_relationships(self):
+        user = await User.options().get(id=self.admin.id)
+        assert user.groups == []
+        assert user.permissions == []
+
+        user = await User.options(raiseload=True).get(id=self.admin.id)
+        with pytest.raises(InvalidRequestError):
+            _ = user.groups
+
+    async def test_nested_relationships(self):
+        users = await User.options(load=["groups.users"], raiseload=True).filter(
+            id=self.admin.id
+        )
+        assert [user.id for user in users[0].groups[0].users] == [self.admin.id]
+        with pytest.raises(InvalidRequestError):
+            _ = users[0].permissions
+
+    async def test_only_columns(self):
+        user = await User.options(only=["id", "username"]).get(id=self.admin.id)
+        assert user.username == self.admin.username
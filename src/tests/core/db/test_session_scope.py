@@ -0,0 +1,46 @@
+import pytest
+
+from apps.user.models import User
+from core.db.dependencies.session import (
+    current_session,
+    detached_session,
+    session_scope,
+)
+
+
+async def test_session_scope_commits_on_exit(db):  # pylint: disable=unused-argument
+    async with session_scope() as session:
+        assert current_session() is session
+        await User(
+            username="u_scoped", first_name="Scoped", last_name="User", password="x"
+        ).save()
+        # flushed in the shared transaction, visible to the following queries
+        assert await User.get(username="u_scoped") is not None
+        with detached_session():
+            assert current_session() is None
+            # not committed yet
+            assert await User.get(username="u_scoped") is None
+
+    assert current_session() is None
+    assert await User.get(username="u_scoped") is not None
+
+
+async def test_session_scope_rolls_back_on_error(db):  # pylint: disable=unused-argument
+    with pytest.raises(ValueError):
+        async with session_scope():
+            await User(
+                username="u_rollback", first_name="Roll", last_name="Back", password="x"
+            ).save()
+            raise ValueError
+
+    assert await User.get(username="u_rollback") is None
+
+
+async def test_load_profiles_share_the_scope(db):  # pylint: disable=unused-argument
+    async with session_scope():
+        user = await User(
+            username="u_profile", first_name="Pro", last_name="File", password="x"
+        ).save()
+        # not committed yet, same session and connection
+        loaded = await User.options(only=["id", "username"]).get(username="u_profile")
+        assert loaded is user
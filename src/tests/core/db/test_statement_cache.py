@@ -0,0 +1,49 @@
+from sqlmodel import select
+
+from apps.authentication.models import JWTToken
+from apps.user.models import User
+from core.unittest.async_case import AsyncTestCase
+
+
+def test_filters_shape():
+    assert User.filters_shape(username="a", id__in=[1]) == ("id__in", "username")
+    # resolved on each call
+    assert User.filters_shape(email=None) is None
+    assert User.filters_shape(username__unknown="a") is None
+    assert User.filters_shape(unknown_field="a") is None
+    assert User.filters_shape(id__in=select(User.id)) is None
+    assert JWTToken.filters_shape(user=User(id=1)) is None
+
+
+def test_compiled_statement_is_reused():
+    shape = User.filters_shape(username="spider")
+    statement = User.compiled_statement(shape)
+    assert statement is User.compiled_statement(User.filters_shape(username="iron"))
+    assert User.bind_filters(shape, username="spider") == {"_filter_0": "spider"}
+
+
+def test_compiled_statement_cache_hits():
+    """The statements are built once per filters shape, see benchmark-statements."""
+    shape = User.filters_shape(username="spider")
+    User.compiled_statement(shape)
+    hits = User.compiled_statement.cache_info().hits
+
+    for name in ("iron", "hulk", "thor"):
+        User.compiled_statement(User.filters_shape(username=name))
+    assert User.compiled_statement.cache_info().hits == hits + 3
+
+
+class TestCompiledStatement(AsyncTestCase):
+    fixtures = ["users"]
+
+    async def test_cached_lookups(self):
+        user = await User.first()
+        assert await User.get(username=user.username) == user
+        assert await User.get(username=user.username, id__in=[user.id]) == user
+        assert await User.get(username=user.username, id__not_in=[user.id]) is None
+        assert user not in await User.filter(
+            username__not_icontains=user.username.upper()
+        )
+        assert [u.id for u in await User.filter(order_by="-id", limit=1)] == [
+            max(u.id for u in await User.all())
+        ]
@@ -0,0 +1,76 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from core.auth.sessions import load_session, revoke_user_sessions
+from core.middlewares.session import RedisSessionMiddleware
+
+
+async def login(request: Request):
+    request.session["user"] = {"id": int(request.query_params["id"])}
+    return JSONResponse(request.session)
+
+
+async def read(request: Request):
+    return JSONResponse(request.session)
+
+
+async def logout(request: Request):
+    request.session.clear()
+    return JSONResponse({})
+
+
+@pytest.fixture
+async def session_client(settings):
+    if not settings.cache_url and not settings.celery_broker:
+        pytest.skip("redis is not configured")
+
+    app = Starlette(
+        routes=[Route("/login", login), Route("/read", read), Route("/logout", logout)]
+    )
+    app.add_middleware(
+        RedisSessionMiddleware,
+        session_cookie=settings.session_cookie,
+        max_age=settings.max_age,
+    )
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+async def test_session_stored_server_side(session_client, settings):
+    await session_client.get("/login", params={"id": 1})
+    session_id = session_client.cookies[settings.session_cookie]
+
+    assert await load_session(session_id) == {"user": {"id": 1}}
+    assert (await session_client.get("/read")).json() == {"user": {"id": 1}}
+
+
+async def test_login_renews_session_id(session_client, settings):
+    await session_client.get("/login", params={"id": 1})
+    first_id = session_client.cookies[settings.session_cookie]
+
+    await session_client.get("/login", params={"id": 2})
+    assert session_client.cookies[settings.session_cookie] != first_id
+    assert await load_session(first_id) is None
+
+
+async def test_logout(session_client, settings):
+    await session_client.get("/login", params={"id": 1})
+    session_id = session_client.cookies[settings.session_cookie]
+
+    await session_client.get("/logout")
+    assert await load_session(session_id) is None
+
+
+async def test_revoke_user_sessions(session_client, settings):
+    await session_client.get("/login", params={"id": 42})
+    session_id = session_client.cookies[settings.session_cookie]
+
+    await revoke_user_sessions(42)
+    assert await load_session(session_id) is None
+    assert (await session_client.get("/read")).json() == {}
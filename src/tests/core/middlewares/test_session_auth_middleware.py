@@ -1,5 +1,7 @@
 from fastapi import status
 
+from core.middlewares.auth import compile_exempt_paths
+
 
 async def test_skip_session_auth_middleware_test_environment(client, settings, app):
     settings.TEST_BASE_URL = "https://example.dev"
@@ -11,3 +13,20 @@ async def test_skip_session_auth_middleware_if_xhr(client, settings, app):
     settings.TEST_BASE_URL = "https://example.dev"
     response = await client.get(app.url_path_for("session-login"))
     assert response.status_code == status.HTTP_200_OK
+
+
+def test_exempt_paths(settings):
+    exempt_paths = compile_exempt_paths(settings.EXEMPT_AUTH_URLS)
+
+    assert exempt_paths.match("/static/css/style.css")
+    assert exempt_paths.match(settings.SESSION_AUTH_URL)
+    assert exempt_paths.match("/docs")
+    assert not exempt_paths.match("/web/chat/")
+    assert not exempt_paths.match("/api/users/")
+
+
+async def test_anonymous_template_view_redirected(client, settings):
+    path = f"{settings.WEB_ROUTER_PREFIX}/chat/"
+    response = await client.get(path)
+    assert response.status_code == status.HTTP_307_TEMPORARY_REDIRECT
+    assert response.headers["location"] == f"{settings.SESSION_AUTH_URL}?referer={path}"
@@ -78,6 +78,35 @@ class TestDBService(AsyncTestCase):
         )
         assert len(user_list()) == await self.db_service.count(User)
 
+    async def test_bulk_upsert(self):
+        await self.db_service.truncate(User)
+        await self.db_service.bulk_upsert(User, user_list())
+        assert len(user_list()) == await self.db_service.count(User)
+
+        # conflicting rows are updated instead of raising
+        users = user_list()
+        for user in users:
+            user.age = 20
+        upserted = await self.db_service.bulk_upsert(
+            User, users, update_fields=["age"], returning=True
+        )
+        assert len(user_list()) == await self.db_service.count(User)
+        assert {user.age for user in upserted} == {20}
+        assert {user.age for user in await User.all()} == {20}
+
+    async def test_bulk_upsert_chunks(self):
+        await self.db_service.truncate(User)
+        await self.db_service.bulk_upsert(User, user_list(), chunk_size=4)
+        assert len(user_list()) == await self.db_service.count(User)
+
+    async def test_bulk_copy(self):
+        await self.db_service.truncate(User)
+        copied = await self.db_service.bulk_copy(User, user_list())
+        assert copied == len(user_list())
+        user = await User.get(username="u_rusty")
+        assert user.age == 48
+        assert user.created_at is not None
+
     async def test_bulk_delete(self):
         await self.db_service.truncate(User)
         assert await self.db_service.count(User) == 0
@@ -121,3 +150,30 @@ class TestDBService(AsyncTestCase):
         with pytest.raises(ObjectNotFoundError) as e:
             await self.db_service.get_or_404(User, id=-1)
         assert f"Object {User.__name__} not found." in str(e.value)
+
+    async def test_stream(self):
+        await self.db_service.truncate(User)
+        await self.db_service.bulk_create_or_update(user_list())
+
+        users = [user async for user in User.stream(order_by="-id", batch_size=2)]
+        assert [user.id for user in users] == sorted(
+            (user.id for user in await User.all()), reverse=True
+        )
+        assert [
+            user.username async for user in User.stream(username__istartswith="u_r")
+        ] == ["u_rusty"]
+
+    async def test_values_stream(self):
+        await self.db_service.truncate(User)
+        await self.db_service.bulk_create_or_update(user_list())
+
+        rows = [
+            tuple(row)
+            async for row in User.values_stream(
+                "username", "age", filters={"username": "u_rusty"}, batch_size=2
+            )
+        ]
+        assert rows == [("u_rusty", 48)]
+        assert len([row async for row in User.values_stream("id", batch_size=2)]) == (
+            len(user_list())
+        )
@@ -148,3 +148,58 @@ class TestMapperSignal(AsyncTestCase):
         expected_called_count = len(users)
         await User.bulk_delete(users)
         assert expected_called_count == called_count
+
+    async def test_signal_after_filter_update(self):
+        updated = []
+
+        def collect_updated(_: Mapper[User], __: Connection, user: User):
+            updated.append((user.id, user.age))
+
+        signal_manager.after_update(User)(collect_updated)
+        with pytest.raises(ValueError):
+            await User.filter_update({"age": 77})
+
+        ids = await User.filter_update({"age": 77}, id__in=[self.user.id])
+        assert ids == [self.user.id]
+        assert updated == [(self.user.id, 77)]
+        assert (await User.get(id=self.user.id)).age == 77
+        # Unregister to avoid distorting next tests
+        signal_manager.unregister(
+            "after_update",
+            collect_updated,
+            target=User,
+            category=EventCategory.MAPPER,
+        )
+
+    async def test_signal_after_filter_delete(self):
+        deleted = []
+
+        def collect_deleted(_: Mapper[User], __: Connection, user: User):
+            deleted.append(user.username)
+
+        users = [
+            User(
+                username=f"filter_delete_{i}",
+                first_name="bar",
+                last_name="DOE",
+                password=(lambda: "pytest")(),
+            )
+            for i in range(3)
+        ]
+        await User.bulk_create_or_update(users)
+
+        signal_manager.after_delete(User)(collect_deleted)
+        ids = await User.filter_delete(username__startswith="filter_delete_")
+        assert len(ids) == 3
+        assert sorted(deleted) == [user.username for user in users]
+        assert await User.count(username__startswith="filter_delete_") == 0
+        # Unregister to avoid distorting next tests
+        signal_manager.unregister(
+            "after_delete",
+            collect_deleted,
+            target=User,
+            category=EventCategory.MAPPER,
+        )
+
+        with pytest.raises(ValueError):
+            await User.filter_delete()